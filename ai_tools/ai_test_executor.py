@@ -1,13 +1,31 @@
 import argparse
+import asyncio
 import os
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-import requests
+import httpx
 import yaml
+from sqlalchemy.orm import Session
 
+from backend.crud.test_result import bulk_insert_test_results
+from backend.crud.test_run import create_test_run, finish_test_run
+from backend.db.session import Base, SessionLocal, engine
+
+from ai_tools.duration_history import record_executor_run_durations
+from ai_tools.flaky_tests import record_executor_run_outcomes
+from ai_tools.gemini_client import CallScope, current_call_scope
+from ai_tools.latency import LatencyHistogram, summarize_latencies
+from ai_tools.test_corpus import get_corpus_test_cases
 from ai_tools.test_generator import generate_test_cases_from_openapi
 
+DEFAULT_CONCURRENCY = 20
+DEFAULT_REQUEST_TIMEOUT = 15.0
+DEFAULT_LOAD_WORKERS = 64
+DEFAULT_MAX_ERROR_RATE = 0.01
+
 
 def load_api_config(config_path: str = "tests/api/config/config.yaml") -> Dict[str, Any]:
     """
@@ -20,24 +38,27 @@ def load_api_config(config_path: str = "tests/api/config/config.yaml") -> Dict[s
         return yaml.safe_load(f)
 
 
-def get_auth_token(base_url: str, email: str, password: str) -> Optional[str]:
+async def get_auth_token(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+) -> Optional[str]:
     """
     Perform login via /auth/login and return access token.
     """
-    url = f"{base_url.rstrip('/')}/auth/login"
     data = {
         "username": email,
         "password": password,
     }
 
-    resp = requests.post(
-        url,
+    resp = await client.post(
+        "/auth/login",
         data=data,
         headers={"Content-Type": "application/x-www-form-urlencoded"},
         timeout=10,
     )
 
-    if not resp.ok:
+    if not resp.is_success:
         print(f"[AUTH] Login failed: {resp.status_code} {resp.text}")
         return None
 
@@ -63,78 +84,299 @@ def infer_expected_result(category: str, status_code: int) -> bool:
     return 200 <= status_code < 300
 
 
-def execute_ai_tests(
-    base_url: str,
-    max_endpoints: int = 10,
-    use_auth: bool = True,
-    config_path: str = "tests/api/config/config.yaml",
-) -> Dict[str, Any]:
-    """
-    Core executor used by both CLI and API.
-    Returns structured data instead of exiting.
-    """
-    token = None
-    config = load_api_config(config_path) if use_auth else {}
-    default_user = config.get("default_user") if config else None
-
-    if use_auth and default_user:
-        email = default_user.get("email")
-        pwd = default_user.get("password")
-        if email and pwd:
-            token = get_auth_token(base_url, email, pwd)
-
-    # Generate AI test cases
-    test_cases = generate_test_cases_from_openapi(
-        base_url=base_url,
-        max_endpoints=max_endpoints,
-    )
-
-    session = requests.Session()
-    if token:
-        session.headers.update({"Authorization": f"Bearer {token}"})
-
-    results: List[Dict[str, Any]] = []
+def _new_result_entry(idx: int, tc: Dict[str, Any]) -> Dict[str, Any]:
+    request_spec = tc.get("request", {}) or {}
+    method = (request_spec.get("method") or "GET").upper()
+    path = request_spec.get("path") or "/"
 
-    for idx, tc in enumerate(test_cases, start=1):
-        name = tc.get("name", f"test_{idx}")
-        category = tc.get("category", "positive")
-        request_spec = tc.get("request", {}) or {}
+    return {
+        "index": idx,
+        "name": tc.get("name", f"test_{idx}"),
+        "category": tc.get("category", "positive"),
+        # OpenAPI-style "METHOD /template/{id}" used to group latencies
+        "endpoint": tc.get("endpoint") or f"{method} {path}",
+        "method": method,
+        "path": path,
+        "request_body": request_spec.get("body", None),
+        "status_code": None,
+        "passed": False,
+        "error": None,
+        "elapsed_ms": None,
+        "ttfb_ms": None,
+        "response_bytes": None,
+    }
 
-        method = (request_spec.get("method") or "GET").upper()
-        path = request_spec.get("path") or "/"
-        body = request_spec.get("body", None)
 
-        url = f"{base_url.rstrip('/')}{path}"
+async def _run_single_test(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    entry: Dict[str, Any],
+) -> None:
+    """
+    Execute one generated test case and fill in its result entry in place.
 
-        entry: Dict[str, Any] = {
-            "index": idx,
-            "name": name,
-            "category": category,
-            "method": method,
-            "path": path,
-            "request_body": body,
-            "status_code": None,
-            "passed": False,
-            "error": None,
-        }
+    Timings start once a concurrency slot is acquired: ttfb_ms is measured
+    when the response headers arrive, elapsed_ms once the body is read.
+    """
+    method = entry["method"]
 
+    async with semaphore:
+        start = time.perf_counter()
         try:
-            kwargs: Dict[str, Any] = {"timeout": 15}
+            kwargs: Dict[str, Any] = {}
             if method in ("POST", "PUT", "PATCH"):
-                kwargs["json"] = body
+                kwargs["json"] = entry["request_body"]
+
+            request = client.build_request(method, entry["path"], **kwargs)
+            resp = await client.send(request, stream=True)
+            try:
+                entry["ttfb_ms"] = _elapsed_ms(start)
+                body = await resp.aread()
+            finally:
+                await resp.aclose()
+            entry["elapsed_ms"] = _elapsed_ms(start)
+            entry["response_bytes"] = len(body)
 
-            resp = session.request(method, url, **kwargs)
             status_code = resp.status_code
             entry["status_code"] = status_code
-            entry["passed"] = infer_expected_result(category, status_code)
+            entry["passed"] = infer_expected_result(entry["category"], status_code)
         except Exception as e:
-            entry["error"] = str(e)
+            entry["elapsed_ms"] = _elapsed_ms(start)
+            entry["error"] = str(e) or type(e).__name__
             entry["passed"] = False
 
-        results.append(entry)
 
-    total = len(results)
-    passed_count = sum(1 for r in results if r["passed"])
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+async def ensure_user_registered(client: httpx.AsyncClient, user: Dict[str, Any]) -> None:
+    """
+    Register the config's default user; an "already registered" 400 is fine.
+    Needed for in-process runs, which start from an empty database.
+    """
+    payload = {
+        "email": user.get("email"),
+        "full_name": user.get("full_name"),
+        "password": user.get("password"),
+    }
+    resp = await client.post("/auth/register", json=payload, timeout=10)
+    if resp.status_code not in (200, 400):
+        print(f"[AUTH] Register failed: {resp.status_code} {resp.text}")
+
+
+def make_inprocess_transport() -> Tuple[httpx.ASGITransport, str]:
+    """
+    ASGI transport onto a fresh app instance backed by a throwaway SQLite DB,
+    plus the base URL to use with it.
+    """
+    # Imported lazily: backend.main imports the dashboard routes, which import this module.
+    from backend.inprocess import INPROCESS_BASE_URL, create_inprocess_app
+
+    return httpx.ASGITransport(app=create_inprocess_app()), INPROCESS_BASE_URL
+
+
+def local_session_factory() -> Callable[[], Session]:
+    """
+    Sessions on the local database (the one a live server on this machine
+    uses), with every table created.
+    """
+    Base.metadata.create_all(bind=engine)
+    return SessionLocal
+
+
+def _default_user(config_path: str) -> Optional[Dict[str, Any]]:
+    config = load_api_config(config_path)
+    user = (config or {}).get("default_user")
+    if user and user.get("email") and user.get("password"):
+        return user
+    return None
+
+
+async def _prepare_target(
+    base_url: str,
+    max_endpoints: int,
+    inprocess: bool,
+    use_corpus: bool = True,
+    refresh_corpus: bool = False,
+    corpus_session_factory: Optional[Callable[[], Session]] = None,
+) -> Tuple[str, Optional[httpx.AsyncBaseTransport], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Resolve where requests go (live URL or in-process app) and get the test
+    cases to send there, from the stored corpus (regenerating only changed
+    endpoints) or straight from Gemini.
+    The corpus is read from corpus_session_factory; by default that of the
+    in-process app, or the local database (SessionLocal) for a live server.
+    Returns (base_url, transport, test_cases, generation_info).
+    """
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    schema: Optional[Dict[str, Any]] = None
+    if inprocess:
+        transport, base_url = make_inprocess_transport()
+        schema = transport.app.openapi()
+
+    # Schema fetch, DB and Gemini calls are blocking; keep them off the event loop.
+    if use_corpus:
+        if corpus_session_factory is None:
+            corpus_session_factory = transport.app.state.session_factory if inprocess else local_session_factory()
+        corpus = await asyncio.to_thread(
+            get_corpus_test_cases,
+            corpus_session_factory,
+            base_url=base_url,
+            max_endpoints=max_endpoints,
+            schema=schema,
+            refresh=refresh_corpus,
+        )
+        test_cases = corpus.pop("cases")
+        generation_info = {"source": "corpus", **corpus}
+    else:
+        test_cases = await asyncio.to_thread(
+            generate_test_cases_from_openapi,
+            base_url=base_url,
+            max_endpoints=max_endpoints,
+            schema=schema,
+        )
+        generation_info = {"source": "llm", "llm_calls": 1}
+
+    print(
+        f"[EXECUTOR] {len(test_cases)} test cases ({generation_info['source']}, "
+        f"{generation_info['llm_calls']} LLM call(s))"
+    )
+    return base_url, transport, test_cases, generation_info
+
+
+async def _prepare_within_deadline(
+    deadline: Optional[float],
+    *args: Any,
+) -> Tuple[str, Optional[httpx.AsyncBaseTransport], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    _prepare_target(*args) bounded by `deadline` seconds (None = no limit).
+    Generation runs in worker threads, which cannot be interrupted; unless
+    the caller already set one (API routes do), a CallScope with the same
+    deadline makes Gemini calls there give up too.
+    """
+    if deadline is None:
+        return await _prepare_target(*args)
+
+    token = None
+    if current_call_scope.get() is None:
+        token = current_call_scope.set(CallScope(deadline=time.monotonic() + deadline))
+    try:
+        return await asyncio.wait_for(_prepare_target(*args), timeout=deadline)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Run deadline of {deadline}s exceeded while generating test cases") from None
+    finally:
+        if token is not None:
+            current_call_scope.reset(token)
+
+
+@asynccontextmanager
+async def _open_client(
+    base_url: str,
+    transport: Optional[httpx.AsyncBaseTransport],
+    max_connections: int,
+    request_timeout: float,
+    default_user: Optional[Dict[str, Any]],
+    register_user: bool = False,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Pooled AsyncClient for the target, logged in as `default_user` if given.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+
+    async with httpx.AsyncClient(
+        base_url=base_url.rstrip("/"),
+        limits=limits,
+        timeout=request_timeout,
+        transport=transport,
+    ) as client:
+        if default_user:
+            if register_user:
+                await ensure_user_registered(client, default_user)
+            token = await get_auth_token(client, default_user["email"], default_user["password"])
+            if token:
+                client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+
+async def execute_ai_tests_async(
+    base_url: str,
+    max_endpoints: int = 10,
+    use_auth: bool = True,
+    config_path: str = "tests/api/config/config.yaml",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    deadline: Optional[float] = None,
+    inprocess: bool = False,
+    use_corpus: bool = True,
+    refresh_corpus: bool = False,
+    corpus_session_factory: Optional[Callable[[], Session]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the generated test cases concurrently on a pooled httpx.AsyncClient.
+
+    - at most `concurrency` requests are in flight at once
+    - each request is bounded by `request_timeout` seconds
+    - the whole run, test case generation included, is bounded by `deadline`
+      seconds (None = no limit); if it expires during generation TimeoutError
+      is raised, cases still pending when it expires are cancelled and
+      reported as errors
+    - inprocess=True drives backend.main's app through an ASGI transport with
+      a throwaway database instead of calling a live server at `base_url`
+    - use_corpus=True reuses stored test cases for endpoints whose schema
+      has not changed (see ai_tools.test_corpus); refresh_corpus forces regeneration
+    - corpus_session_factory: database holding that corpus (API routes pass
+      their app's); see _prepare_target for the default
+    """
+    run_start = time.perf_counter()
+    base_url, transport, test_cases, generation_info = await _prepare_within_deadline(
+        deadline, base_url, max_endpoints, inprocess, use_corpus, refresh_corpus, corpus_session_factory
+    )
+    generation_info["generation_ms"] = _elapsed_ms(run_start)
+    default_user = _default_user(config_path) if use_auth else None
+
+    entries = [_new_result_entry(idx, tc) for idx, tc in enumerate(test_cases, start=1)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with _open_client(
+        base_url,
+        transport=transport,
+        max_connections=concurrency,
+        request_timeout=request_timeout,
+        default_user=default_user,
+        register_user=inprocess,
+    ) as client:
+        execution_start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(_run_single_test(client, semaphore, entry))
+            for entry in entries
+        ]
+
+        remaining = None if deadline is None else max(0.0, deadline - (execution_start - run_start))
+        try:
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=remaining)
+            else:
+                pending = set()
+        finally:
+            # Covers both the deadline and the caller cancelling the whole run.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        wall_time_ms = _elapsed_ms(execution_start)
+
+    if pending:
+        for entry, task in zip(entries, tasks):
+            if task in pending:
+                entry["error"] = f"Cancelled: run deadline of {deadline}s exceeded"
+                entry["passed"] = False
+
+    total = len(entries)
+    passed_count = sum(1 for r in entries if r["passed"])
     failed_count = total - passed_count
 
     summary = {
@@ -143,36 +385,402 @@ def execute_ai_tests(
         "failed": failed_count,
         "base_url": base_url,
         "max_endpoints": max_endpoints,
-        "used_auth": use_auth and bool(default_user),
+        "used_auth": bool(default_user),
+        "concurrency": concurrency,
+        "inprocess": inprocess,
+        "wall_time_ms": wall_time_ms,
+        "latency": summarize_latencies(entries),
+        "generation": generation_info,
+    }
+
+    return {
+        "summary": summary,
+        "results": entries,
+    }
+
+
+def execute_ai_tests(
+    base_url: str,
+    max_endpoints: int = 10,
+    use_auth: bool = True,
+    config_path: str = "tests/api/config/config.yaml",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    deadline: Optional[float] = None,
+    inprocess: bool = False,
+    use_corpus: bool = True,
+    refresh_corpus: bool = False,
+    corpus_session_factory: Optional[Callable[[], Session]] = None,
+) -> Dict[str, Any]:
+    """
+    Core executor used by both CLI and API.
+    Returns structured data instead of exiting.
+    """
+    return asyncio.run(
+        execute_ai_tests_async(
+            base_url=base_url,
+            max_endpoints=max_endpoints,
+            use_auth=use_auth,
+            config_path=config_path,
+            concurrency=concurrency,
+            request_timeout=request_timeout,
+            deadline=deadline,
+            inprocess=inprocess,
+            use_corpus=use_corpus,
+            refresh_corpus=refresh_corpus,
+            corpus_session_factory=corpus_session_factory,
+        )
+    )
+
+
+async def _replay_case(client: httpx.AsyncClient, spec: Dict[str, Any]) -> int:
+    kwargs: Dict[str, Any] = {}
+    if spec["method"] in ("POST", "PUT", "PATCH"):
+        kwargs["json"] = spec["request_body"]
+    resp = await client.request(spec["method"], spec["path"], **kwargs)
+    return resp.status_code
+
+
+async def execute_load_test_async(
+    base_url: str,
+    rps: float,
+    duration: float,
+    max_endpoints: int = 10,
+    use_auth: bool = True,
+    config_path: str = "tests/api/config/config.yaml",
+    workers: int = DEFAULT_LOAD_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    inprocess: bool = False,
+    corpus_session_factory: Optional[Callable[[], Session]] = None,
+) -> Dict[str, Any]:
+    """
+    Open-loop load test: replay the generated test cases round-robin at a
+    fixed arrival rate of `rps` for `duration` seconds.
+
+    Arrivals are scheduled on a fixed timetable and queued for `workers`
+    async workers, independent of how fast responses come back. Latency is
+    measured from each request's *scheduled* send time, so time spent queued
+    behind a slow server is counted (no coordinated omission).
+
+    A request counts as an error if it raises (timeout, connection error) or
+    returns 5xx. Requests still queued or in flight `request_timeout` seconds
+    after the last arrival are abandoned and counted as errors too.
+
+    Test cases come from the corpus in corpus_session_factory (see
+    _prepare_target).
+    """
+    if rps <= 0 or duration <= 0:
+        raise ValueError("rps and duration must be positive")
+
+    base_url, transport, test_cases, generation_info = await _prepare_target(
+        base_url, max_endpoints, inprocess, corpus_session_factory=corpus_session_factory
+    )
+    if not test_cases:
+        raise ValueError("No test cases were generated to replay")
+    default_user = _default_user(config_path) if use_auth else None
+
+    specs = [_new_result_entry(idx, tc) for idx, tc in enumerate(test_cases, start=1)]
+    scheduled = int(rps * duration)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    histogram = LatencyHistogram()
+    per_endpoint: Dict[str, Dict[str, Any]] = {}
+    status_codes: Dict[str, int] = {}
+    counters = {"completed": 0, "errors": 0}
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            intended, spec = item
+            try:
+                status_code = await _replay_case(client, spec)
+                is_error = status_code >= 500
+                status_key = str(status_code)
+            except Exception as e:
+                is_error = True
+                status_key = type(e).__name__
+            latency_ms = (time.perf_counter() - intended) * 1000
+
+            stats = per_endpoint.setdefault(
+                spec["endpoint"],
+                {"requests": 0, "errors": 0, "histogram": LatencyHistogram()},
+            )
+            stats["requests"] += 1
+            stats["histogram"].record(latency_ms)
+            histogram.record(latency_ms)
+            status_codes[status_key] = status_codes.get(status_key, 0) + 1
+            counters["completed"] += 1
+            if is_error:
+                stats["errors"] += 1
+                counters["errors"] += 1
+
+    async with _open_client(
+        base_url,
+        transport=transport,
+        max_connections=workers,
+        request_timeout=request_timeout,
+        default_user=default_user,
+        register_user=inprocess,
+    ) as client:
+        worker_tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        start = time.perf_counter()
+        try:
+            for i in range(scheduled):
+                intended = start + i / rps
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                queue.put_nowait((intended, specs[i % len(specs)]))
+
+            for _ in worker_tasks:
+                queue.put_nowait(None)
+            await asyncio.wait(worker_tasks, timeout=request_timeout)
+        finally:
+            for task in worker_tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+    abandoned = scheduled - counters["completed"]
+    errors = counters["errors"] + abandoned
+    error_rate = errors / scheduled if scheduled else 0.0
+
+    summary = {
+        "mode": "load",
+        "base_url": base_url,
+        "inprocess": inprocess,
+        "used_auth": bool(default_user),
+        "target_rps": rps,
+        "duration_seconds": duration,
+        "workers": workers,
+        "test_cases": len(specs),
+        "generation": generation_info,
+        "requests_scheduled": scheduled,
+        "requests_completed": counters["completed"],
+        "requests_abandoned": abandoned,
+        "errors": errors,
+        "error_rate": round(error_rate, 5),
+        "max_error_rate": max_error_rate,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(counters["completed"] / elapsed, 3) if elapsed else 0.0,
+        "status_codes": dict(sorted(status_codes.items())),
+        "latency_histogram": histogram.to_dict(),
     }
 
+    results = []
+    for endpoint, stats in sorted(per_endpoint.items()):
+        endpoint_hist = stats["histogram"].to_dict()
+        endpoint_hist.pop("buckets")
+        results.append(
+            {
+                "endpoint": endpoint,
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "error_rate": round(stats["errors"] / stats["requests"], 5),
+                "latency": endpoint_hist,
+            }
+        )
+
     return {
+        "status": "passed" if error_rate <= max_error_rate else "failed",
         "summary": summary,
         "results": results,
     }
 
 
-def run_ai_tests(
+def execute_load_test(
     base_url: str,
+    rps: float,
+    duration: float,
     max_endpoints: int = 10,
     use_auth: bool = True,
     config_path: str = "tests/api/config/config.yaml",
+    workers: int = DEFAULT_LOAD_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    inprocess: bool = False,
+) -> Dict[str, Any]:
+    """
+    Sync wrapper around execute_load_test_async (CLI and API).
+    """
+    return asyncio.run(
+        execute_load_test_async(
+            base_url=base_url,
+            rps=rps,
+            duration=duration,
+            max_endpoints=max_endpoints,
+            use_auth=use_auth,
+            config_path=config_path,
+            workers=workers,
+            request_timeout=request_timeout,
+            max_error_rate=max_error_rate,
+            inprocess=inprocess,
+        )
+    )
+
+
+def executor_result_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    test_results rows for an executor run's result entries, with the same
+    "<endpoint>::<name>" test ids as the duration and flakiness history.
+    """
+    rows = []
+    for r in results:
+        if r.get("passed"):
+            outcome = "passed"
+        else:
+            outcome = "error" if r.get("error") and r.get("status_code") is None else "failed"
+        rows.append(
+            {
+                "test": f"{r['endpoint']}::{r['name']}",
+                "classname": r["endpoint"],
+                "name": r["name"],
+                "outcome": outcome,
+                "duration": (r.get("elapsed_ms") or 0.0) / 1000.0,
+                "message": None if outcome == "passed" else r.get("error") or f"HTTP {r.get('status_code')}",
+            }
+        )
+    return rows
+
+
+def record_executor_run_results(db, test_run_id: int, results: List[Dict[str, Any]]) -> int:
+    """
+    Store an executor run's per-test rows in test_results (so it can be
+    listed, diffed and analyzed like an ingested run), committed.
+    """
+    recorded = bulk_insert_test_results(db, test_run_id, executor_result_rows(results))
+    db.commit()
+    return recorded
+
+
+def save_test_run(run_type: str, status: str, summary: dict, results: list, per_test: bool = False) -> int:
+    """
+    Persist a finished run as a TestRun row (for CLI runs; the API routes
+    use their request-scoped session). With per_test=True (functional
+    executor runs) the entries go into test_results instead of
+    TestRun.results, and into the duration and flakiness history, as the
+    execute-tests route does. Returns the new TestRun id.
+    """
+    db = local_session_factory()()
+    try:
+        test_run = create_test_run(db, run_type=run_type, status="running")
+        if per_test:
+            record_executor_run_results(db, test_run.id, results)
+            finish_test_run(db, test_run, status=status, summary=summary)
+            record_executor_run_durations(db, test_run.id, results)
+            record_executor_run_outcomes(db, test_run.id, results)
+        else:
+            finish_test_run(db, test_run, status=status, summary=summary, results=results)
+        return test_run.id
+    finally:
+        db.close()
+
+
+def run_load_test(
+    base_url: str,
+    rps: float,
+    duration: float,
+    max_endpoints: int = 10,
+    use_auth: bool = True,
+    config_path: str = "tests/api/config/config.yaml",
+    workers: int = DEFAULT_LOAD_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    inprocess: bool = False,
+    save: bool = True,
 ) -> int:
     """
-    CLI wrapper around execute_ai_tests.
-    Prints to console and returns exit code.
+    CLI wrapper around execute_load_test.
+    Prints the report, stores it as a TestRun(run_type="load") and returns exit code.
     """
-    print(f"[EXECUTOR] Base URL: {base_url}")
-    print(f"[EXECUTOR] Max endpoints: {max_endpoints}")
-    print(f"[EXECUTOR] Use auth: {use_auth}")
+    print(f"[LOAD] Base URL: {'in-process app' if inprocess else base_url}")
+    print(f"[LOAD] Target: {rps} req/s for {duration}s with {workers} workers")
 
-    data = execute_ai_tests(
+    data = execute_load_test(
         base_url=base_url,
+        rps=rps,
+        duration=duration,
         max_endpoints=max_endpoints,
         use_auth=use_auth,
         config_path=config_path,
+        workers=workers,
+        request_timeout=request_timeout,
+        max_error_rate=max_error_rate,
+        inprocess=inprocess,
     )
 
+    summary = data["summary"]
+    hist = summary["latency_histogram"]
+    pct = hist["percentiles"]
+
+    print("=== Load Test Summary ===")
+    print(f"Requests:    {summary['requests_completed']}/{summary['requests_scheduled']} completed")
+    print(f"Throughput:  {summary['throughput_rps']} req/s (target {summary['target_rps']})")
+    print(f"Errors:      {summary['errors']} ({summary['error_rate'] * 100:.2f}%)")
+    print(
+        f"Latency (ms): p50={pct['p50']} p90={pct['p90']} p99={pct['p99']} "
+        f"p99.9={pct['p99.9']} max={hist['max']}"
+    )
+    for r in data["results"]:
+        ep = r["latency"]["percentiles"]
+        print(
+            f"  {r['endpoint']}: n={r['requests']} errors={r['errors']} "
+            f"p50={ep['p50']} p99={ep['p99']}"
+        )
+    print(f"Status:      {data['status'].upper()}")
+
+    if save:
+        run_id = save_test_run("load", data["status"], summary, data["results"])
+        print(f"Stored as TestRun #{run_id}")
+    print("==========")
+
+    return 0 if data["status"] == "passed" else 1
+
+
+def run_ai_tests(
+    base_url: str,
+    max_endpoints: int = 10,
+    use_auth: bool = True,
+    config_path: str = "tests/api/config/config.yaml",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    deadline: Optional[float] = None,
+    inprocess: bool = False,
+    use_corpus: bool = True,
+    refresh_corpus: bool = False,
+    save: bool = True,
+) -> int:
+    """
+    CLI wrapper around execute_ai_tests.
+    Prints to console, stores the run as a TestRun(run_type="ai_executor")
+    and returns exit code.
+    """
+    print(f"[EXECUTOR] Base URL: {'in-process app' if inprocess else base_url}")
+    print(f"[EXECUTOR] Max endpoints: {max_endpoints}")
+    print(f"[EXECUTOR] Use auth: {use_auth}")
+    print(f"[EXECUTOR] Concurrency: {concurrency}")
+
+    try:
+        data = execute_ai_tests(
+            base_url=base_url,
+            max_endpoints=max_endpoints,
+            use_auth=use_auth,
+            config_path=config_path,
+            concurrency=concurrency,
+            request_timeout=request_timeout,
+            deadline=deadline,
+            inprocess=inprocess,
+            use_corpus=use_corpus,
+            refresh_corpus=refresh_corpus,
+        )
+    except TimeoutError as e:
+        print(f"[EXECUTOR] {e}")
+        return 1
+
     summary = data["summary"]
     results = data["results"]
 
@@ -192,22 +800,48 @@ def run_ai_tests(
         if error:
             print(f"     ERROR: {error}")
         else:
-            print(f"     HTTP {status_code} → {'PASS' if passed else 'FAIL'}")
+            print(
+                f"     HTTP {status_code} → {'PASS' if passed else 'FAIL'} "
+                f"({r['elapsed_ms']} ms, TTFB {r['ttfb_ms']} ms, {r['response_bytes']} bytes)"
+            )
         print()
 
     print("=== AI Test Execution Summary ===")
     print(f"Total tests:  {summary['total']}")
     print(f"Passed tests: {summary['passed']}")
     print(f"Failed tests: {summary['failed']}")
+    print(f"Wall time:    {summary['wall_time_ms']} ms")
+
+    latency = summary["latency"]
+    overall = latency["overall"]
+    print(
+        f"Latency (ms): p50={overall['p50']} p90={overall['p90']} "
+        f"p99={overall['p99']} max={overall['max']}"
+    )
+    for endpoint, stats in latency["per_endpoint"].items():
+        print(
+            f"  {endpoint}: n={stats['count']} p50={stats['p50']} p90={stats['p90']} "
+            f"p99={stats['p99']} max={stats['max']}"
+        )
+    status = "passed" if summary["failed"] == 0 else "failed"
+    if save:
+        run_id = save_test_run("ai_executor", status, summary, results, per_test=True)
+        print(f"Stored as TestRun #{run_id}")
     print("==========")
 
-    return 0 if summary["failed"] == 0 else 1
+    return 0 if status == "passed" else 1
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="AI Test Executor - Run Gemini-generated API tests against FastAPI backend."
     )
+    parser.add_argument(
+        "--mode",
+        choices=["functional", "load"],
+        default="functional",
+        help="functional: run each case once; load: replay cases at --rps for --duration",
+    )
     parser.add_argument(
         "--base-url",
         type=str,
@@ -231,14 +865,103 @@ def main():
         default="tests/api/config/config.yaml",
         help="Path to API test config YAML (for default_user credentials)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of test requests in flight at once",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=DEFAULT_REQUEST_TIMEOUT,
+        help="Timeout in seconds for each individual request",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Overall run deadline in seconds, test case generation included; unfinished tests are cancelled",
+    )
+    parser.add_argument(
+        "--inprocess",
+        action="store_true",
+        help="Drive backend.main:app in-process (ASGI, throwaway DB) instead of --base-url",
+    )
+    parser.add_argument(
+        "--no-corpus",
+        action="store_true",
+        help="Generate all test cases with Gemini instead of reusing the stored corpus",
+    )
+    parser.add_argument(
+        "--refresh-corpus",
+        action="store_true",
+        help="Regenerate and store test cases for every selected endpoint",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=50.0,
+        help="[load] Target arrival rate in requests per second",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="[load] Test duration in seconds",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_LOAD_WORKERS,
+        help="[load] Number of async workers sending requests",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=DEFAULT_MAX_ERROR_RATE,
+        help="[load] Error rate above which the run is marked failed",
+    )
+    parser.add_argument(
+        "--no-save",
+        action="store_true",
+        help="Do not store the result as a TestRun",
+    )
 
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+
+    if args.mode == "load":
+        exit_code = run_load_test(
+            base_url=args.base_url,
+            rps=args.rps,
+            duration=args.duration,
+            max_endpoints=args.max_endpoints,
+            use_auth=not args.no_auth,
+            config_path=args.config_path,
+            workers=args.workers,
+            request_timeout=args.request_timeout,
+            max_error_rate=args.max_error_rate,
+            inprocess=args.inprocess,
+            save=not args.no_save,
+        )
+        sys.exit(exit_code)
 
     exit_code = run_ai_tests(
         base_url=args.base_url,
         max_endpoints=args.max_endpoints,
         use_auth=not args.no_auth,
         config_path=args.config_path,
+        concurrency=args.concurrency,
+        request_timeout=args.request_timeout,
+        deadline=args.deadline,
+        inprocess=args.inprocess,
+        use_corpus=not args.no_corpus,
+        refresh_corpus=args.refresh_corpus,
+        save=not args.no_save,
     )
     sys.exit(exit_code)
 
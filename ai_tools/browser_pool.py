@@ -0,0 +1,155 @@
+"""
+Long-lived async Playwright browser shared by UI inspection requests.
+
+Each request borrows an isolated BrowserContext (own cookies/storage), at
+most `max_contexts` at a time. The browser is relaunched when it is found
+disconnected and recycled after `recycle_after` contexts, so a leaking or
+crashed Chromium does not outlive a bounded number of requests. Contexts
+still open on a retiring browser finish normally; it is closed once the
+last one is released.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+
+class _BrowserSlot:
+    def __init__(self, browser: Browser, generation: int):
+        self.browser = browser
+        self.generation = generation
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        max_contexts: int = 4,
+        recycle_after: int = 50,
+        headless: bool = True,
+        launch_timeout: float = 30.0,
+    ):
+        self.max_contexts = max_contexts
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.launch_timeout = launch_timeout
+
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._slot: Optional[_BrowserSlot] = None
+        self._generation = 0
+        self._served = 0
+        self._active = 0
+        self._relaunches = 0
+        self._closed = False
+
+    async def start(self) -> None:
+        """
+        Start Playwright and launch the first browser (otherwise done lazily
+        on the first request).
+        """
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._closed = True
+            if self._slot is not None:
+                await self._close_slot(self._slot)
+                self._slot = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _launch(self) -> _BrowserSlot:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            timeout=self.launch_timeout * 1000,
+        )
+        self._generation += 1
+        return _BrowserSlot(browser, self._generation)
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception as e:  # already dead: nothing left to clean up
+            print(f"[BROWSER_POOL] Error closing browser #{slot.generation}: {e}")
+
+    async def _ensure_browser(self) -> _BrowserSlot:
+        """
+        Return a healthy browser, relaunching it if it crashed or has served
+        `recycle_after` contexts. Caller holds self._lock.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        slot = self._slot
+        if slot is not None and not slot.browser.is_connected():
+            print(f"[BROWSER_POOL] Browser #{slot.generation} disconnected, relaunching")
+            slot.retired = True
+            self._slot = slot = None
+        elif slot is not None and self.recycle_after and slot.uses >= self.recycle_after:
+            print(f"[BROWSER_POOL] Recycling browser #{slot.generation} after {slot.uses} contexts")
+            slot.retired = True
+            if slot.active == 0:
+                await self._close_slot(slot)
+            self._slot = slot = None
+
+        if slot is None:
+            slot = self._slot = await self._launch()
+            if slot.generation > 1:
+                self._relaunches += 1
+        return slot
+
+    @asynccontextmanager
+    async def context(self, **context_options: Any) -> AsyncIterator[BrowserContext]:
+        """
+        Borrow a fresh, isolated browser context; waits while `max_contexts`
+        are in use. The context is always closed on exit.
+        """
+        async with self._semaphore:
+            async with self._lock:
+                slot = await self._ensure_browser()
+                slot.uses += 1
+                slot.active += 1
+                self._active += 1
+                self._served += 1
+
+            context: Optional[BrowserContext] = None
+            try:
+                context = await slot.browser.new_context(**context_options)
+                yield context
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        print(f"[BROWSER_POOL] Error closing context: {e}")
+                async with self._lock:
+                    slot.active -= 1
+                    self._active -= 1
+                    if slot.retired and slot.active == 0:
+                        await self._close_slot(slot)
+
+    async def health(self) -> Dict[str, Any]:
+        """
+        Snapshot for the health endpoint; does not launch a browser.
+        """
+        slot = self._slot
+        return {
+            "started": slot is not None,
+            "connected": bool(slot and slot.browser.is_connected()),
+            "browser_generation": slot.generation if slot else None,
+            "browser_uses": slot.uses if slot else 0,
+            "active_contexts": self._active,
+            "max_contexts": self.max_contexts,
+            "recycle_after": self.recycle_after,
+            "contexts_served": self._served,
+            "relaunches": self._relaunches,
+        }
@@ -0,0 +1,161 @@
+"""
+Per-test duration history and slow-test regression detection.
+
+Every recorded run appends one row per passing test to test_durations and
+folds the duration into that test's rolling baseline: the median and MAD
+(median absolute deviation) of its last WINDOW_SIZE durations. Updating a
+baseline only touches that small window, so recording stays cheap no
+matter how many runs are stored.
+
+A duration is a regression when its robust z-score
+(duration - median) / (1.4826 * MAD) exceeds the threshold, the slowdown
+is at least min_delta seconds, and the baseline has MIN_SAMPLES or more
+samples. The row keeps the baseline from just before its run, so any past
+run can be checked, with any threshold, without recomputation.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.crud.test_duration import (
+    bulk_insert_durations,
+    bulk_upsert_baselines,
+    get_baselines_for_tests,
+    list_run_durations,
+)
+
+WINDOW_SIZE = 30
+MIN_SAMPLES = 5
+DEFAULT_THRESHOLD = 3.5
+DEFAULT_MIN_DELTA = 0.05  # seconds
+MAD_SCALE = 1.4826  # makes MAD comparable to a standard deviation
+MIN_SCALE = 0.001  # seconds; avoids dividing by a zero MAD
+
+
+def _median(sorted_values: List[float]) -> float:
+    n = len(sorted_values)
+    mid = n // 2
+    if n % 2:
+        return sorted_values[mid]
+    return (sorted_values[mid - 1] + sorted_values[mid]) / 2
+
+
+def robust_baseline(window: List[float]) -> Tuple[float, float]:
+    """
+    (median, MAD) of a non-empty list of durations.
+    """
+    median = _median(sorted(window))
+    mad = _median(sorted(abs(d - median) for d in window))
+    return median, mad
+
+
+def regression_score(duration: float, median: float, mad: float) -> float:
+    return (duration - median) / max(MAD_SCALE * mad, MIN_SCALE)
+
+
+def is_regression(
+    duration: float,
+    median: Optional[float],
+    mad: Optional[float],
+    samples: int,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> bool:
+    if median is None or mad is None or samples < MIN_SAMPLES:
+        return False
+    return duration - median >= min_delta and regression_score(duration, median, mad) > threshold
+
+
+def record_run_durations(db: Session, test_run_id: int, durations: Dict[str, float]) -> int:
+    """
+    Append the run's durations ({test: seconds}, passing tests only) to the
+    history and update the rolling baselines. Returns the number of rows
+    recorded; the caller commits.
+    """
+    if not durations:
+        return 0
+
+    now = datetime.utcnow()
+    baselines = get_baselines_for_tests(db, durations.keys())
+    history: List[Dict[str, Any]] = []
+    new_baselines: List[Dict[str, Any]] = []
+    changed_baselines: List[Dict[str, Any]] = []
+
+    for test, duration in durations.items():
+        baseline = baselines.get(test)
+        history.append(
+            {
+                "test_run_id": test_run_id,
+                "test": test,
+                "duration": duration,
+                "baseline_median": baseline.median if baseline else None,
+                "baseline_mad": baseline.mad if baseline else None,
+                "baseline_samples": baseline.samples if baseline else 0,
+                "recorded_at": now,
+            }
+        )
+
+        window = (list(baseline.window) if baseline else []) + [duration]
+        window = window[-WINDOW_SIZE:]
+        median, mad = robust_baseline(window)
+        values = {
+            "window": window,
+            "median": median,
+            "mad": mad,
+            "samples": (baseline.samples if baseline else 0) + 1,
+            "last_test_run_id": test_run_id,
+            "updated_at": now,
+        }
+        if baseline:
+            changed_baselines.append({"id": baseline.id, **values})
+        else:
+            new_baselines.append({"test": test, **values})
+
+    bulk_insert_durations(db, history)
+    bulk_upsert_baselines(db, new_baselines, changed_baselines)
+    return len(history)
+
+
+def duration_regressions(
+    db: Session,
+    test_run_id: int,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> List[Dict[str, Any]]:
+    """
+    Tests of the run that were slower than their baseline at the time,
+    worst first.
+    """
+    flagged = []
+    for row in list_run_durations(db, test_run_id):
+        if not is_regression(row.duration, row.baseline_median, row.baseline_mad, row.baseline_samples, threshold, min_delta):
+            continue
+        flagged.append(
+            {
+                "test": row.test,
+                "duration": row.duration,
+                "baseline_median": row.baseline_median,
+                "baseline_mad": row.baseline_mad,
+                "baseline_samples": row.baseline_samples,
+                "slowdown": round(row.duration - row.baseline_median, 6),
+                "score": round(regression_score(row.duration, row.baseline_median, row.baseline_mad), 3),
+            }
+        )
+    flagged.sort(key=lambda r: r["score"], reverse=True)
+    return flagged
+
+
+def record_executor_run_durations(db: Session, test_run_id: int, results: List[Dict[str, Any]]) -> int:
+    """
+    record_run_durations for the passing entries of an AI executor run
+    ("<endpoint>::<name>" as test id), committed.
+    """
+    durations = {
+        f"{r['endpoint']}::{r['name']}": r["elapsed_ms"] / 1000.0
+        for r in results
+        if r.get("passed") and r.get("elapsed_ms") is not None
+    }
+    recorded = record_run_durations(db, test_run_id, durations)
+    db.commit()
+    return recorded
@@ -1,11 +1,168 @@
+import heapq
+import json
 import sys
 import os
 import xml.etree.ElementTree as ET
-from typing import List, Dict
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
+from sqlalchemy.orm import Session
+
+from backend.crud.failure_analysis import (
+    get_analyses_by_signatures,
+    record_analysis_hits,
+    save_analyses,
+)
+from backend.crud.test_result import list_test_results
+
+from .failure_clustering import cluster_failures, failure_signature
+from .flaky_tests import flaky_tests_among
 from .gemini_client import get_gemini_model
 
 
+def iter_junit_testcases(source: Union[str, BinaryIO]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream testcases out of a JUnit XML report (path or binary file object).
+
+    Uses iterparse and drops every element once it has been read, so memory
+    stays flat no matter how large the report is. Yields one dict per
+    testcase:
+    - test: "classname::name"
+    - name, classname
+    - time: duration in seconds (0.0 if missing)
+    - outcome: "passed" | "failed" | "error" | "skipped"
+    - message, details: from the failure/error/skipped node ("" if passed)
+    - worker: pytest-xdist worker from the "xdist_worker" property, or None
+    """
+    stack: List[ET.Element] = []
+    testcase_depth = 0
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "testcase":
+                testcase_depth += 1
+            continue
+
+        stack.pop()
+        if elem.tag == "testcase":
+            testcase_depth -= 1
+            yield _testcase_record(elem)
+        elif testcase_depth:
+            # failure/error/system-out children: still needed by their testcase
+            continue
+
+        # Free the element and detach it from its parent; it is always the
+        # parent's last child at this point, so this is O(1).
+        elem.clear()
+        if stack and len(stack[-1]) and stack[-1][-1] is elem:
+            del stack[-1][-1]
+
+
+def _testcase_record(testcase: ET.Element) -> Dict[str, Any]:
+    name = testcase.attrib.get("name", "unknown")
+    classname = testcase.attrib.get("classname", "")
+    full_name = f"{classname}::{name}" if classname else name
+
+    try:
+        duration = float(testcase.attrib.get("time") or 0.0)
+    except ValueError:
+        duration = 0.0
+
+    outcome = "passed"
+    message = ""
+    details = ""
+    for tag, tag_outcome in (("failure", "failed"), ("error", "error"), ("skipped", "skipped")):
+        node = testcase.find(tag)
+        if node is not None:
+            outcome = tag_outcome
+            message = node.attrib.get("message", "")
+            details = node.text or ""
+            break
+
+    worker = testcase.find("properties/property[@name='xdist_worker']")
+
+    return {
+        "test": full_name,
+        "name": name,
+        "classname": classname,
+        "time": duration,
+        "outcome": outcome,
+        "message": message,
+        "details": details,
+        "worker": worker.attrib.get("value") if worker is not None else None,
+    }
+
+
+def _failure_entry(record: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "test": record["test"],
+        "type": "failure" if record["outcome"] == "failed" else "error",
+        "message": record["message"],
+        "details": record["details"],
+    }
+
+
+class ReportStats:
+    """
+    Running pass/fail/error/skip counts, total duration and the N slowest
+    tests, fed one testcase record at a time.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.slowest = slowest
+        self.counts = {"passed": 0, "failed": 0, "error": 0, "skipped": 0}
+        self.total_duration = 0.0
+        self._slowest_heap: List[Tuple[float, str]] = []
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.counts[record["outcome"]] += 1
+        self.total_duration += record["time"]
+
+        if len(self._slowest_heap) < self.slowest:
+            heapq.heappush(self._slowest_heap, (record["time"], record["test"]))
+        elif self.slowest and record["time"] > self._slowest_heap[0][0]:
+            heapq.heapreplace(self._slowest_heap, (record["time"], record["test"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": sum(self.counts.values()),
+            "passed": self.counts["passed"],
+            "failed": self.counts["failed"],
+            "errors": self.counts["error"],
+            "skipped": self.counts["skipped"],
+            "duration": round(self.total_duration, 3),
+            "slowest": [
+                {"test": test, "time": duration}
+                for duration, test in sorted(self._slowest_heap, reverse=True)
+            ],
+        }
+
+
+def parse_junit_report(source: Union[str, BinaryIO], slowest: int = 10) -> Dict[str, Any]:
+    """
+    Single streaming pass over a JUnit report collecting failures plus
+    pass/fail/error/skip counts and durations.
+
+    Returns:
+        dict with fields:
+        - failures: list of {"test", "type", "message", "details"}
+        - stats: {"total", "passed", "failed", "errors", "skipped",
+                  "duration", "slowest": [{"test", "time"}, ...]}
+    """
+    if isinstance(source, str) and not os.path.exists(source):
+        raise FileNotFoundError(f"JUnit XML file not found: {source}")
+
+    failures: List[Dict[str, str]] = []
+    stats = ReportStats(slowest=slowest)
+
+    for record in iter_junit_testcases(source):
+        stats.add(record)
+        if record["outcome"] in ("failed", "error"):
+            failures.append(_failure_entry(record))
+
+    return {"failures": failures, "stats": stats.to_dict()}
+
+
 def parse_junit_failures(xml_path: str) -> List[Dict[str, str]]:
     """
     Parse JUnit XML and extract failed testcases with message & stack trace.
@@ -13,43 +170,33 @@ def parse_junit_failures(xml_path: str) -> List[Dict[str, str]]:
     if not os.path.exists(xml_path):
         raise FileNotFoundError(f"JUnit XML file not found: {xml_path}")
 
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+    return [
+        _failure_entry(record)
+        for record in iter_junit_testcases(xml_path)
+        if record["outcome"] in ("failed", "error")
+    ]
 
-    failures: List[Dict[str, str]] = []
 
-    for testcase in root.iter("testcase"):
-        name = testcase.attrib.get("name", "unknown")
-        classname = testcase.attrib.get("classname", "")
-        full_name = f"{classname}::{name}" if classname else name
-
-        failure_node = testcase.find("failure")
-        error_node = testcase.find("error")
-
-        if failure_node is not None:
-            msg = failure_node.attrib.get("message", "")
-            text = failure_node.text or ""
-            failures.append(
-                {
-                    "test": full_name,
-                    "type": "failure",
-                    "message": msg,
-                    "details": text,
-                }
-            )
-        elif error_node is not None:
-            msg = error_node.attrib.get("message", "")
-            text = error_node.text or ""
-            failures.append(
-                {
-                    "test": full_name,
-                    "type": "error",
-                    "message": msg,
-                    "details": text,
-                }
-            )
+MAX_DETAILS_CHARS = 4000
+SAMPLE_TESTS_PER_CLUSTER = 5
+
 
-    return failures
+def _format_clusters(clusters: List[Dict[str, Any]]) -> str:
+    summarized = []
+    for c in clusters:
+        rep = c["representative"]
+        details = rep["details"]
+        if len(details) > MAX_DETAILS_CHARS:
+            details = details[:MAX_DETAILS_CHARS] + "\n... (truncated)"
+        samples = ", ".join(c["tests"][:SAMPLE_TESTS_PER_CLUSTER])
+        more = c["count"] - min(len(c["tests"]), SAMPLE_TESTS_PER_CLUSTER)
+        if more > 0:
+            samples += f" (+{more} more)"
+        summarized.append(
+            f"Cluster {c['signature']} — {c['count']} failing test(s): {samples}\n"
+            f"Type: {rep['type']}\nMessage: {rep['message']}\nDetails (representative):\n{details}\n"
+        )
+    return "\n---\n".join(summarized)
 
 
 def analyze_failures_with_gemini(failures: List[Dict[str, str]]) -> str:
@@ -58,45 +205,217 @@ def analyze_failures_with_gemini(failures: List[Dict[str, str]]) -> str:
     and next debugging steps.
     Returns a plain-text report.
     """
-    if not failures:
+    return analyze_clusters_with_gemini(cluster_failures(failures))
+
+
+def analyze_clusters_with_gemini(clusters: List[Dict[str, Any]]) -> str:
+    """
+    Same as analyze_failures_with_gemini, but for failures already grouped
+    by cluster_failures: one representative per distinct failure mode is
+    sent, with its count, so prompt size tracks the number of failure modes
+    rather than the number of failing tests.
+    """
+    if not clusters:
         return "No failed tests found. All tests passed."
 
     model = get_gemini_model()
 
-    summarized = []
-    for f in failures:
-        summarized.append(
-            f"Test: {f['test']}\nType: {f['type']}\nMessage: {f['message']}\nDetails:\n{f['details']}\n"
-        )
-
-    joined = "\n---\n".join(summarized)
+    joined = _format_clusters(clusters)
+    total = sum(c["count"] for c in clusters)
 
     prompt = (
         "You are an expert SDET and software engineer.\n"
-        "Given the following pytest JUnit test failures, do the following:\n"
-        "1. Group failures by likely root cause.\n"
+        f"{total} pytest tests failed. They were grouped locally by normalized stack-trace signature "
+        f"into {len(clusters)} distinct failure cluster(s); one representative is shown per cluster.\n"
+        "Do the following:\n"
+        "1. Merge clusters that likely share a root cause.\n"
         "2. For each group, suggest probable root cause (app bug vs test bug vs env issue).\n"
-        "3. Suggest specific next debugging steps (which logs to check, which module to inspect, etc.).\n"
-        "4. If it looks like a flaky test, call that out.\n\n"
-        "Be concise but actionable.\n\n"
-        f"Here are the failures:\n\n{joined}"
+        "3. Suggest specific next debugging steps (which logs to check, which module to inspect, etc.).\n\n"
+        "Refer to clusters by their id. Be concise but actionable.\n\n"
+        f"Here are the failure clusters:\n\n{joined}"
     )
 
     response = model.generate_content(prompt)
     return response.text
 
-def analyze_failures_api(xml_path: str = "reports/api-results.xml") -> dict:
+
+def analyze_clusters_individually(clusters: List[Dict[str, Any]]) -> Dict[str, str]:
     """
-    Helper for FastAPI: return failures + AI analysis as structured data.
+    One Gemini call returning a separate analysis per cluster, so each can
+    be cached under its signature. Returns {signature: analysis}.
     """
-    failures = parse_junit_failures(xml_path)
-    analysis = analyze_failures_with_gemini(failures)
+    if not clusters:
+        return {}
+
+    model = get_gemini_model()
+
+    prompt = (
+        "You are an expert SDET and software engineer.\n"
+        "Below are pytest failure clusters, grouped locally by normalized stack-trace signature; "
+        "one representative is shown per cluster.\n"
+        "For EACH cluster independently, write a short analysis covering: probable root cause "
+        "(app bug vs test bug vs env issue) and specific next debugging steps.\n\n"
+        "Return ONLY valid JSON, no markdown: an object mapping each cluster id to its analysis text, e.g.\n"
+        '{"<cluster id>": "analysis...", ...}\n\n'
+        f"Here are the failure clusters:\n\n{_format_clusters(clusters)}"
+    )
+
+    response = model.generate_content(prompt)
+    raw_text = response.text.strip()
+
+    try:
+        parsed = json.loads(raw_text)
+    except json.JSONDecodeError:
+        start = raw_text.find("{")
+        end = raw_text.rfind("}")
+        try:
+            parsed = json.loads(raw_text[start : end + 1]) if start != -1 and end != -1 else None
+        except json.JSONDecodeError:
+            parsed = None
+
+    if not isinstance(parsed, dict):
+        # Nothing is cached, so these clusters are retried on the next call.
+        print("[ANALYZER] Could not parse per-cluster JSON from Gemini response", file=sys.stderr)
+        return {}
+
+    return {c["signature"]: str(parsed[c["signature"]]) for c in clusters if parsed.get(c["signature"])}
+
+
+def analyze_clusters_cached(
+    db: Session,
+    clusters: List[Dict[str, Any]],
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Attach an analysis to every cluster, reusing stored analyses for known
+    signatures and calling Gemini only for never-seen ones (or all, with
+    refresh=True). Mutates clusters in place, adding "analysis" and "cached".
+
+    Returns:
+        dict with fields:
+        - analysis: merged plain-text report, largest cluster first
+        - cache: {"hits": n, "misses": m}
+    """
+    if not clusters:
+        return {"analysis": "No failed tests found. All tests passed.", "cache": {"hits": 0, "misses": 0}}
+
+    cached = {} if refresh else get_analyses_by_signatures(db, [c["signature"] for c in clusters])
+    misses = [c for c in clusters if c["signature"] not in cached]
+
+    fresh = analyze_clusters_individually(misses) if misses else {}
+    if fresh:
+        save_analyses(db, fresh, misses)
+    if cached:
+        record_analysis_hits(db, cached.values())
+
+    sections = []
+    for c in clusters:
+        if c["signature"] in cached:
+            c["analysis"] = cached[c["signature"]].analysis
+            c["cached"] = True
+        else:
+            c["analysis"] = fresh.get(c["signature"], "No analysis returned for this cluster.")
+            c["cached"] = False
+        flaky_note = ""
+        if c.get("flaky_tests"):
+            shown = c["flaky_tests"][:SAMPLE_TESTS_PER_CLUSTER]
+            flaky_note = (
+                f"\nKnown flaky from run history ({len(c['flaky_tests'])} of {c['count']} test(s)): "
+                + ", ".join(f"{t['test']} (flip rate {t['recent_flip_rate']:.0%})" for t in shown)
+            )
+        sections.append(
+            f"[{c['signature']}] {c['count']} test(s) — {c['message'] or c['type']}"
+            f"{' (cached)' if c['cached'] else ''}{flaky_note}\n{c['analysis']}"
+        )
 
     return {
+        "analysis": "\n\n".join(sections),
+        "cache": {"hits": len(clusters) - len(misses), "misses": len(misses)},
+    }
+
+
+def annotate_flaky_failures(
+    db: Session,
+    failures: List[Dict[str, Any]],
+    clusters: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Mark failures of tests the run history knows as flaky (see
+    ai_tools.flaky_tests), locally and without an LLM call. Sets
+    cluster["flaky_tests"] and cluster["all_flaky"] and returns the flaky
+    tests with their stats.
+    """
+    flaky = flaky_tests_among(db, {f["test"] for f in failures})
+    by_signature = {c["signature"]: c for c in clusters}
+    for c in clusters:
+        c["flaky_tests"] = []
+
+    for f in failures:
+        stats = flaky.get(f["test"])
+        if stats is not None:
+            by_signature[failure_signature(f)]["flaky_tests"].append({"test": f["test"], **stats})
+
+    for c in clusters:
+        c["all_flaky"] = len(c["flaky_tests"]) == c["count"]
+    return [{"test": test, **stats} for test, stats in flaky.items()]
+
+
+def analyze_failures_api(
+    xml_path: str = "reports/api-results.xml",
+    db: Optional[Session] = None,
+    refresh: bool = False,
+) -> dict:
+    """
+    Helper for FastAPI: return failures + AI analysis as structured data.
+    With a DB session, per-cluster analyses are cached by signature and
+    known-flaky tests are marked from the run history.
+    """
+    report = parse_junit_report(xml_path)
+    failures = report["failures"]
+    clusters = cluster_failures(failures)
+
+    result = {
         "xml_path": xml_path,
+        "stats": report["stats"],
+        "failures": failures,
+        "clusters": clusters,
+    }
+    if db is None:
+        result["analysis"] = analyze_clusters_with_gemini(clusters)
+    else:
+        result["flaky_tests"] = annotate_flaky_failures(db, failures, clusters)
+        result.update(analyze_clusters_cached(db, clusters, refresh=refresh))
+    return result
+
+
+def analyze_test_run_failures(
+    db: Session,
+    test_run_id: int,
+    refresh: bool = False,
+) -> dict:
+    """
+    Same as analyze_failures_api, but over the per-test rows of an ingested
+    (possibly multi-shard) run instead of an XML file on disk.
+    """
+    failures = [
+        {
+            "test": row.test,
+            "type": "failure" if row.outcome == "failed" else "error",
+            "message": row.message or "",
+            "details": row.details or "",
+        }
+        for row in list_test_results(db, test_run_id, outcome=("failed", "error"))
+    ]
+    clusters = cluster_failures(failures)
+
+    result = {
+        "test_run_id": test_run_id,
         "failures": failures,
-        "analysis": analysis,
+        "clusters": clusters,
+        "flaky_tests": annotate_flaky_failures(db, failures, clusters),
     }
+    result.update(analyze_clusters_cached(db, clusters, refresh=refresh))
+    return result
 
 
 def main():
@@ -0,0 +1,87 @@
+import hashlib
+import re
+from typing import Any, Dict, List
+
+# Order matters: more specific patterns first.
+_NORMALIZERS = [
+    (re.compile(r"0x[0-9a-fA-F]+"), "0xADDR"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<TS>"),
+    (re.compile(r"(/tmp|/var/folders)/\S+"), "<TMP>"),
+    (re.compile(r"\+[0-9a-f]{6,}@"), "+<HEX>@"),  # unique_email style suffixes
+    (re.compile(r"\b[0-9a-f]{12,}\b"), "<HEX>"),
+    (re.compile(r"(\.py):\d+"), r"\1:<L>"),
+    (re.compile(r"\bline \d+"), "line <L>"),
+    (re.compile(r"(/[A-Za-z_-]+/)\d+\b"), r"\1<ID>"),  # /projects/42 -> /projects/<ID>
+    (re.compile(r"\b(\w*[iI]d)(['\"]?\s*[:=]\s*)\d+"), r"\1\2<ID>"),  # project_id=42
+    (re.compile(r"\b\d+\.\d+s\b"), "<DUR>"),
+    (re.compile(r"\b\d{4,}\b"), "<N>"),  # long numbers; small ones (HTTP codes) are kept
+]
+
+_LOCATION_RE = re.compile(r"^(\S+\.py):(?:\d+|<L>): (\w+(?:\.\w+)*)", re.MULTILINE)
+_ERROR_LINE_RE = re.compile(r"^E\s+(.*)$", re.MULTILINE)
+
+MAX_TESTS_PER_CLUSTER = 50
+
+
+def normalize_failure_text(text: str) -> str:
+    """
+    Strip run-specific noise (addresses, UUIDs, ids, timestamps, line
+    numbers, temp paths) so identical failure modes compare equal.
+    """
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def failure_signature(failure: Dict[str, str]) -> str:
+    """
+    Short stable signature of a failure: exception type + normalized
+    assertion/error lines + raising locations from the traceback, falling
+    back to the normalized message when there is no pytest traceback.
+    """
+    details = normalize_failure_text(failure.get("details") or "")
+
+    error_lines = [line.strip() for line in _ERROR_LINE_RE.findall(details)][:3]
+    locations = [f"{path}:{exc}" for path, exc in _LOCATION_RE.findall(details)][-3:]
+
+    parts = [failure.get("type", "")]
+    if error_lines or locations:
+        parts.extend(error_lines)
+        parts.extend(locations)
+    else:
+        parts.append(normalize_failure_text(failure.get("message") or ""))
+        parts.append(details.strip().splitlines()[-1] if details.strip() else "")
+
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def cluster_failures(failures: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Group failures by signature, largest cluster first.
+
+    Each cluster:
+    - signature
+    - count
+    - type, message: from the first (representative) failure
+    - representative: the first failure dict, unmodified
+    - tests: up to MAX_TESTS_PER_CLUSTER affected test names
+    """
+    clusters: Dict[str, Dict[str, Any]] = {}
+    for failure in failures:
+        sig = failure_signature(failure)
+        cluster = clusters.get(sig)
+        if cluster is None:
+            cluster = clusters[sig] = {
+                "signature": sig,
+                "count": 0,
+                "type": failure.get("type", ""),
+                "message": failure.get("message", ""),
+                "representative": failure,
+                "tests": [],
+            }
+        cluster["count"] += 1
+        if len(cluster["tests"]) < MAX_TESTS_PER_CLUSTER:
+            cluster["tests"].append(failure.get("test", ""))
+
+    return sorted(clusters.values(), key=lambda c: c["count"], reverse=True)
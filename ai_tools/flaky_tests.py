@@ -0,0 +1,112 @@
+"""
+Flaky-test index built from stored run history.
+
+Each recorded run folds every test's outcome (pass or fail; skips are
+ignored) into its TestFlakiness row. The row tracks total runs, failures,
+flips (outcome changed since the previous run) and the last
+RECENT_WINDOW outcomes. Recording costs O(1) per test, whatever the size
+of the history.
+
+A test counts as flaky when it has at least FLAKY_MIN_RUNS runs and its
+recent window holds at least FLAKY_MIN_FLIPS flips at a rate of
+FLAKY_FLIP_RATE or more. A test that broke once and stayed broken flips
+only once, so it reads as a regression rather than flakiness; one that
+alternates keeps flipping. The failure analyzer uses this to mark flaky tests locally
+instead of asking Gemini to guess from a single run.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from backend.crud.test_flakiness import bulk_upsert_flakiness, get_flakiness_for_tests
+
+RECENT_WINDOW = 20
+FLAKY_MIN_RUNS = 5
+FLAKY_FLIP_RATE = 0.1
+FLAKY_MIN_FLIPS = 2
+
+PASS = "P"
+FAIL = "F"
+_OUTCOME_CODES = {"passed": PASS, "failed": FAIL, "error": FAIL}
+
+
+def _count_flips(outcomes: str) -> int:
+    return sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+
+
+def _flip_rate(outcomes: str) -> float:
+    if len(outcomes) < 2:
+        return 0.0
+    return _count_flips(outcomes) / (len(outcomes) - 1)
+
+
+def record_run_outcomes(db: Session, test_run_id: int, outcomes: Dict[str, str]) -> int:
+    """
+    Fold one run's outcomes ({test: "passed" | "failed" | "error" |
+    "skipped"}) into the flakiness index. Returns the number of tests
+    updated; the caller commits.
+    """
+    codes = {test: _OUTCOME_CODES[o] for test, o in outcomes.items() if o in _OUTCOME_CODES}
+    if not codes:
+        return 0
+
+    now = datetime.utcnow()
+    existing = get_flakiness_for_tests(db, codes.keys())
+    new_rows: List[Dict[str, Any]] = []
+    changed_rows: List[Dict[str, Any]] = []
+
+    for test, code in codes.items():
+        row = existing.get(test)
+        runs = (row.runs if row else 0) + 1
+        flips = (row.flips if row else 0) + (1 if row and row.last_outcome and row.last_outcome != code else 0)
+        recent = ((row.recent if row else "") + code)[-RECENT_WINDOW:]
+        values = {
+            "runs": runs,
+            "failures": (row.failures if row else 0) + (1 if code == FAIL else 0),
+            "flips": flips,
+            "flip_rate": flips / (runs - 1) if runs > 1 else 0.0,
+            "recent": recent,
+            "recent_flip_rate": _flip_rate(recent),
+            "last_outcome": code,
+            "last_test_run_id": test_run_id,
+            "updated_at": now,
+        }
+        if row:
+            changed_rows.append({"id": row.id, **values})
+        else:
+            new_rows.append({"test": test, **values})
+
+    bulk_upsert_flakiness(db, new_rows, changed_rows)
+    return len(codes)
+
+
+def record_executor_run_outcomes(db: Session, test_run_id: int, results: List[Dict[str, Any]]) -> int:
+    """
+    record_run_outcomes for an AI executor run ("<endpoint>::<name>" as
+    test id), committed.
+    """
+    outcomes = {f"{r['endpoint']}::{r['name']}": "passed" if r.get("passed") else "failed" for r in results}
+    recorded = record_run_outcomes(db, test_run_id, outcomes)
+    db.commit()
+    return recorded
+
+
+def is_flaky(runs: int, recent: str) -> bool:
+    return runs >= FLAKY_MIN_RUNS and _count_flips(recent) >= FLAKY_MIN_FLIPS and _flip_rate(recent) >= FLAKY_FLIP_RATE
+
+
+def flaky_tests_among(db: Session, tests: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    {test: stats} for those of `tests` the history marks as flaky.
+    """
+    return {
+        test: {
+            "runs": row.runs,
+            "flips": row.flips,
+            "recent": row.recent,
+            "recent_flip_rate": round(row.recent_flip_rate, 3),
+        }
+        for test, row in get_flakiness_for_tests(db, tests).items()
+        if is_flaky(row.runs, row.recent)
+    }
@@ -1,14 +1,311 @@
-import google.generativeai as genai
+"""
+Shared Gemini client: one per model, with single-flight prompts, rate
+limiting, 429 retries and CallScope deadlines (see README, AI / Gemini usage).
+"""
+import contextvars
+import hashlib
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from backend.core.config import get_settings
 
+DEFAULT_MODEL = "gemini-2.5-flash"
+# How often a coalesced caller re-checks its own CallScope while waiting.
+FOLLOWER_POLL_INTERVAL = 0.2
+
+
+class GeminiRateLimitError(RuntimeError):
+    """
+    Gemini kept answering 429 after all retries.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AICallCancelled(RuntimeError):
+    """
+    The caller's deadline passed or it went away (see CallScope).
+    """
+
+
+class CallScope:
+    """
+    Deadline and cancellation flag of the request an AI call is made for.
+    Set through current_call_scope by the API layer; checked by GeminiClient
+    between attempts, since a blocking SDK call cannot be interrupted.
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline  # time.monotonic() value
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def check(self) -> None:
+        remaining = self.remaining()
+        if self.cancelled or (remaining is not None and remaining <= 0):
+            raise AICallCancelled("AI call cancelled (deadline passed or client disconnected)")
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleep that wakes up early on cancellation.
+        """
+        self._cancelled.wait(seconds)
+        self.check()
+
+
+current_call_scope: contextvars.ContextVar[Optional[CallScope]] = contextvars.ContextVar(
+    "gemini_call_scope", default=None
+)
+
+
+def estimate_prompt_tokens(prompt: Any) -> int:
+    # Same ~4 chars/token heuristic as openapi_compact.estimate_tokens.
+    return max(1, math.ceil(len(str(prompt)) / 4))
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    text = str(error).lower()
+    return "429" in text and ("quota" in text or "rate" in text or "exhausted" in text)
+
+
+class RateLimiter:
+    """
+    Two token buckets (requests/minute and tokens/minute), both refilled
+    continuously. acquire() blocks until a request of the given size fits.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens: int, sleep: Optional[Callable[[float], None]] = None) -> float:
+        """
+        Take one request and `tokens` tokens; returns seconds spent waiting.
+        Requests larger than the whole TPM budget wait for a full bucket.
+        """
+        sleep = sleep or self._sleep
+        tokens = min(tokens, self.tpm)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return waited
+                wait = max(
+                    (1 - self._requests) * 60.0 / self.rpm if self._requests < 1 else 0.0,
+                    (tokens - self._tokens) * 60.0 / self.tpm if self._tokens < tokens else 0.0,
+                )
+            sleep(wait)
+            waited += wait
 
-def get_gemini_model(model_name: str = "gemini-2.5-flash"):
+    def adjust(self, token_delta: int) -> None:
+        """
+        Correct the token bucket once the real usage is known (may go negative).
+        """
+        with self._lock:
+            self._tokens -= token_delta
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        model: Any,
+        limiter: RateLimiter,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.model = model
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "limiter_wait_s": 0.0}
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> Any:
+        key = hashlib.sha256(repr((prompt, sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+        scope = current_call_scope.get()
+
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+                else:
+                    self.stats["coalesced"] += 1
+            if leader:
+                break
+            try:
+                return self._wait_for_leader(future, scope)
+            except AICallCancelled:
+                # Ours expired: give up. The leader's expired: try again,
+                # possibly as the new leader.
+                if scope is not None:
+                    scope.check()
+
+        error: Optional[BaseException] = None
+        try:
+            response = self._generate_with_retry(prompt, **kwargs)
+        except BaseException as e:
+            error = e
+        finally:
+            # Unregister before publishing, so a follower that retries does
+            # not find the finished future again.
+            with self._lock:
+                del self._inflight[key]
+        if error is not None:
+            future.set_exception(error)
+            raise error
+        future.set_result(response)
+        return response
+
+    def _wait_for_leader(self, future: Future, scope: Optional[CallScope]) -> Any:
+        """
+        The leader's result, waiting no longer than this caller's own scope allows.
+        """
+        if scope is None:
+            return future.result()
+        while True:
+            scope.check()
+            remaining = scope.remaining()
+            timeout = FOLLOWER_POLL_INTERVAL if remaining is None else max(0.0, min(FOLLOWER_POLL_INTERVAL, remaining))
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                continue
+
+    def _count(self, stat: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries of concurrent callers apart.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _generate_with_retry(self, prompt: Any, **kwargs: Any) -> Any:
+        scope = current_call_scope.get()
+        sleep = scope.sleep if scope is not None else self._sleep
+        estimated = estimate_prompt_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            if scope is not None:
+                scope.check()
+            self._count("limiter_wait_s", self.limiter.acquire(estimated, sleep=sleep))
+            self._count("calls")
+
+            call_kwargs = dict(kwargs)
+            remaining = scope.remaining() if scope is not None else None
+            if remaining is not None:
+                call_kwargs["request_options"] = {**call_kwargs.get("request_options", {}), "timeout": max(1.0, remaining)}
+            try:
+                response = self.model.generate_content(prompt, **call_kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self._count("rate_limited")
+                if attempt == self.max_retries:
+                    raise GeminiRateLimitError(
+                        f"Gemini rate limit persisted after {self.max_retries} retries: {e}",
+                        retry_after=min(self.backoff_max, self.backoff_base * 2 ** attempt),
+                    ) from e
+                delay = self._backoff(attempt)
+                self._count("retries")
+                print(f"[GEMINI] Rate limited, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                sleep(delay)
+                continue
+
+            usage = getattr(response, "usage_metadata", None)
+            actual = getattr(usage, "total_token_count", None) if usage is not None else None
+            if actual:
+                self.limiter.adjust(actual - estimated)
+            return response
+
+
+_clients: Dict[Tuple[str, str], GeminiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _build_model(model_name: str) -> Any:
     settings = get_settings()
-    api_key = settings.GEMINI_API_KEY
+    if settings.GEMINI_BACKEND == "fake":
+        from ai_tools.gemini_fake import FakeGeminiModel
+
+        return FakeGeminiModel()
+
+    import google.generativeai as genai
 
+    api_key = settings.GEMINI_API_KEY
     if not api_key:
         # This message will show if .env is really missing
         raise RuntimeError("GEMINI_API_KEY not set in .env or environment")
 
     genai.configure(api_key=api_key)
     return genai.GenerativeModel(model_name)
+
+
+def get_gemini_model(model_name: str = DEFAULT_MODEL, model: Optional[Any] = None) -> GeminiClient:
+    """
+    Process-wide client for model_name (created on first use). Passing
+    `model` installs a custom backend, e.g. a FakeGeminiModel in tests.
+    """
+    settings = get_settings()
+    key = (settings.GEMINI_BACKEND, model_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or model is not None:
+            client = _clients[key] = GeminiClient(
+                model if model is not None else _build_model(model_name),
+                RateLimiter(settings.GEMINI_RPM, settings.GEMINI_TPM),
+                max_retries=settings.GEMINI_MAX_RETRIES,
+                backoff_base=settings.GEMINI_BACKOFF_BASE,
+                backoff_max=settings.GEMINI_BACKOFF_MAX,
+            )
+        return client
+
+
+def reset_gemini_clients() -> None:
+    with _clients_lock:
+        _clients.clear()
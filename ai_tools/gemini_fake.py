@@ -0,0 +1,75 @@
+"""
+Offline stand-in for google.generativeai.GenerativeModel.
+
+Selected with GEMINI_BACKEND=fake (see gemini_client), or passed directly
+to get_gemini_model(model=FakeGeminiModel(...)) in tests. It can simulate
+latency and a number of initial 429 responses, and records every prompt.
+"""
+import re
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+class FakeRateLimitError(Exception):
+    code = 429
+
+    def __init__(self, message: str = "429 Resource has been exhausted (e.g. check quota)."):
+        super().__init__(message)
+
+
+class FakeUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.usage_metadata = FakeUsage(len(prompt) // 4, len(text) // 4)
+
+
+_CLUSTER_ID_RE = re.compile(r"^Cluster ([0-9a-f]{12}) ", re.MULTILINE)
+
+
+def default_responder(prompt: str) -> str:
+    """
+    Minimal well-formed answers for each kind of prompt this repo sends.
+    """
+    if "mapping each cluster id to its analysis" in prompt:
+        ids = _CLUSTER_ID_RE.findall(prompt)
+        return "{" + ",".join(f'"{sig}": "Fake analysis for cluster {sig}."' for sig in ids) + "}"
+    if "Return ONLY valid JSON" in prompt:
+        return "[]"
+    if "pytest" in prompt and "Python" in prompt and "Playwright" in prompt:
+        return "def test_page_loads(page):\n    pass\n"
+    return "Fake Gemini analysis."
+
+
+class FakeGeminiModel:
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        latency: float = 0.0,
+        rate_limit_first: int = 0,
+    ):
+        self.responder = responder or default_responder
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> FakeResponse:
+        prompt = str(prompt)
+        with self._lock:
+            self.prompts.append(prompt)
+            rate_limited = self.rate_limit_first > 0
+            if rate_limited:
+                self.rate_limit_first -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if rate_limited:
+            raise FakeRateLimitError()
+        return FakeResponse(self.responder(prompt), prompt)
@@ -0,0 +1,106 @@
+import gzip
+import io
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ai_tools.duration_history import record_run_durations
+from ai_tools.failure_analyzer import ReportStats, iter_junit_testcases
+from ai_tools.flaky_tests import record_run_outcomes
+from backend.crud.test_result import bulk_insert_test_results
+from backend.crud.test_run import create_test_run, finish_test_run
+from backend.models.test_run import TestRun
+
+GZIP_MAGIC = b"\x1f\x8b"
+INSERT_BATCH_SIZE = 1000
+RUN_TYPES = ("api", "ui")
+
+
+def open_report_stream(fileobj: BinaryIO) -> BinaryIO:
+    """
+    Return a binary stream of the XML, transparently decompressing gzip
+    (detected by magic bytes, not file name). Nothing is read into memory.
+    """
+    if not fileobj.seekable():
+        fileobj = io.BufferedReader(fileobj)  # type: ignore[arg-type]
+        head = fileobj.peek(2)[:2]
+    else:
+        head = fileobj.read(2)
+        fileobj.seek(0)
+
+    if head == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")  # type: ignore[return-value]
+    return fileobj
+
+
+def _result_row(record: Dict[str, Any], shard: str) -> Dict[str, Any]:
+    if record.get("worker"):
+        # One xdist report covers several workers; keep which one ran the test.
+        shard = f"{shard}/{record['worker']}"
+    return {
+        "test": record["test"],
+        "classname": record["classname"],
+        "name": record["name"],
+        "outcome": record["outcome"],
+        "duration": record["time"],
+        "message": record["message"] or None,
+        "details": record["details"] or None,
+        "shard": shard,
+    }
+
+
+def ingest_junit_reports(
+    db: Session,
+    reports: Iterable[Tuple[str, BinaryIO]],
+    run_type: str = "api",
+    batch_size: int = INSERT_BATCH_SIZE,
+    summary_extra: Optional[Dict[str, Any]] = None,
+) -> TestRun:
+    """
+    Stream one or more JUnit reports (plain or gzipped, e.g. one per CI
+    shard) into a single TestRun, bulk-inserting per-test rows in batches.
+
+    The run summary holds the merged stats plus per-shard counts; per-test
+    data lives in test_results, not in the run's JSON results column.
+    Passing tests' durations also go into the duration history, and every
+    outcome into the flaky-test index.
+    `summary_extra` is merged into the summary (e.g. runner settings).
+    Any parse error marks the run "error" and re-raises.
+    """
+    if run_type not in RUN_TYPES:
+        raise ValueError(f"run_type must be one of {RUN_TYPES}, got {run_type!r}")
+
+    test_run = create_test_run(db, run_type=run_type, status="running")
+    stats = ReportStats()
+    shards: List[Dict[str, Any]] = []
+    durations: Dict[str, float] = {}
+    outcomes: Dict[str, str] = {}
+
+    try:
+        for shard_name, fileobj in reports:
+            batch: List[Dict[str, Any]] = []
+            shard_total = 0
+            for record in iter_junit_testcases(open_report_stream(fileobj)):
+                stats.add(record)
+                batch.append(_result_row(record, shard_name))
+                outcomes[record["test"]] = record["outcome"]
+                if record["outcome"] == "passed":
+                    durations[record["test"]] = record["time"]
+                if len(batch) >= batch_size:
+                    shard_total += bulk_insert_test_results(db, test_run.id, batch)
+                    batch = []
+            shard_total += bulk_insert_test_results(db, test_run.id, batch)
+            shards.append({"name": shard_name, "total": shard_total})
+        record_run_durations(db, test_run.id, durations)
+        record_run_outcomes(db, test_run.id, outcomes)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        finish_test_run(db, test_run, status="error", summary={"error": str(e), "shards": shards})
+        raise
+
+    summary = stats.to_dict()
+    summary["shards"] = shards
+    summary.update(summary_extra or {})
+    status = "passed" if summary["failed"] == 0 and summary["errors"] == 0 else "failed"
+    return finish_test_run(db, test_run, status=status, summary=summary)
@@ -0,0 +1,124 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list (None when empty).
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_stats(values: Iterable[float]) -> Dict[str, Any]:
+    """
+    Summarize latencies (ms) as count / p50 / p90 / p99 / max / mean.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "max": None, "mean": None}
+
+    return {
+        "count": len(ordered),
+        "p50": round(percentile(ordered, 50), 3),
+        "p90": round(percentile(ordered, 90), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+def summarize_latencies(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build overall and per-endpoint latency stats from executor result entries.
+    Entries without a response (connection errors, cancellations) are skipped.
+    """
+    overall: List[float] = []
+    ttfb: List[float] = []
+    per_endpoint: Dict[str, List[float]] = {}
+
+    for r in results:
+        if r.get("status_code") is None or r.get("elapsed_ms") is None:
+            continue
+        overall.append(r["elapsed_ms"])
+        if r.get("ttfb_ms") is not None:
+            ttfb.append(r["ttfb_ms"])
+        key = r.get("endpoint") or f"{r.get('method')} {r.get('path')}"
+        per_endpoint.setdefault(key, []).append(r["elapsed_ms"])
+
+    return {
+        "unit": "ms",
+        "overall": latency_stats(overall),
+        "ttfb": latency_stats(ttfb),
+        "per_endpoint": {key: latency_stats(vals) for key, vals in sorted(per_endpoint.items())},
+    }
+
+
+class LatencyHistogram:
+    """
+    Minimal HDR-style histogram: values are recorded in microseconds into
+    log-linear buckets, each power-of-two range split into 2**sub_bucket_bits
+    linear sub-buckets. Relative error is bounded by 2**-sub_bucket_bits
+    (~0.8% with the default 7 bits) regardless of magnitude, and memory
+    depends only on the value range, not the sample count.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+        self._sum_us = 0
+
+    def _bucket_floor(self, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits - 1)
+        return (value_us >> shift) << shift
+
+    def record(self, value_ms: float) -> None:
+        value_us = max(0, int(round(value_ms * 1000)))
+        bucket = self._bucket_floor(value_us)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total_count += 1
+        self._sum_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = value_us if self.max_us is None else max(self.max_us, value_us)
+
+    def value_at_percentile(self, pct: float) -> Optional[float]:
+        """
+        Upper bound (ms) of the bucket holding the given percentile.
+        """
+        if not self.total_count:
+            return None
+        target = max(1, math.ceil(pct / 100.0 * self.total_count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                shift = max(0, bucket.bit_length() - self.sub_bucket_bits - 1)
+                upper_us = min(bucket + (1 << shift) - 1, self.max_us)
+                return round(upper_us / 1000.0, 3)
+        return round(self.max_us / 1000.0, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-friendly snapshot: summary percentiles plus the non-empty buckets
+        (lower bound in ms, count) so the distribution can be re-plotted later.
+        """
+        percentiles = {
+            f"p{p:g}": self.value_at_percentile(p)
+            for p in (50, 75, 90, 95, 99, 99.9, 100)
+        }
+        return {
+            "unit": "ms",
+            "count": self.total_count,
+            "min": None if self.min_us is None else round(self.min_us / 1000.0, 3),
+            "max": None if self.max_us is None else round(self.max_us / 1000.0, 3),
+            "mean": round(self._sum_us / self.total_count / 1000.0, 3) if self.total_count else None,
+            "percentiles": percentiles,
+            "buckets": [
+                [round(bucket / 1000.0, 3), self.counts[bucket]] for bucket in sorted(self.counts)
+            ],
+        }
@@ -0,0 +1,232 @@
+"""
+Dense, token-efficient rendering of OpenAPI operations for LLM prompts.
+
+Example output:
+
+    POST /projects/{project_id}/bugs [auth] path(project_id!:int) body!:BugCreate -> 201:BugOut  # Create Bug For Project
+    ...
+    BugCreate {title!:str,description:str?,severity:enum(low|medium|high|critical)="medium",...}
+
+Only components actually referenced by the selected operations are emitted,
+and FastAPI's per-operation 422 HTTPValidationError response is replaced by
+a single note in the header.
+"""
+import json
+import math
+from typing import Any, Dict, List
+
+from ai_tools.openapi_utils import collect_refs, iter_operations
+
+VALIDATION_ERROR_SCHEMAS = ("HTTPValidationError", "ValidationError")
+
+TYPE_ABBREV = {
+    "string": "str",
+    "integer": "int",
+    "number": "num",
+    "boolean": "bool",
+    "null": "null",
+}
+
+FORMAT_LEGEND = (
+    "Format: one operation per line: METHOD PATH [auth] path(..) query(..) body/form:Type -> status:Type  # summary\n"
+    "Fields: name!:type = required, type? = nullable, =value = default, [T] = list of T.\n"
+    "Endpoints with parameters or a body return 422 on validation errors."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough LLM token count (~4 characters per token for English/JSON).
+    Good enough to compare prompt variants without an API round trip.
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _ref_name(ref: str) -> str:
+    return ref.rsplit("/", 1)[-1]
+
+
+def render_type(node: Any) -> str:
+    if not isinstance(node, dict) or not node:
+        return "any"
+
+    if "$ref" in node:
+        return _ref_name(node["$ref"])
+
+    for key in ("anyOf", "oneOf"):
+        if key in node:
+            variants = node[key]
+            non_null = [v for v in variants if not (isinstance(v, dict) and v.get("type") == "null")]
+            rendered = "|".join(render_type(v) for v in non_null) or "null"
+            return rendered + "?" if len(non_null) < len(variants) else rendered
+
+    if "allOf" in node:
+        return "&".join(render_type(v) for v in node["allOf"])
+
+    if "enum" in node:
+        return "enum(" + "|".join(str(v) for v in node["enum"]) + ")"
+
+    if "const" in node:
+        return json.dumps(node["const"])
+
+    t = node.get("type")
+    if isinstance(t, list):
+        non_null = [x for x in t if x != "null"]
+        rendered = "|".join(TYPE_ABBREV.get(x, x) for x in non_null)
+        return rendered + "?" if len(non_null) < len(t) else rendered
+
+    if t == "array":
+        return "[" + render_type(node.get("items", {})) + "]"
+
+    if t == "object" or "properties" in node:
+        if "properties" in node:
+            return render_object(node)
+        extra = node.get("additionalProperties")
+        if isinstance(extra, dict) and extra:
+            return "{str:" + render_type(extra) + "}"
+        return "obj"
+
+    rendered = TYPE_ABBREV.get(t, t or "any")
+    constraints = []
+    if "format" in node:
+        constraints.append(node["format"])
+    if "minLength" in node or "maxLength" in node:
+        constraints.append(f"len{node.get('minLength', 0)}..{node.get('maxLength', '')}")
+    for key, symbol in (
+        ("minimum", ">="),
+        ("exclusiveMinimum", ">"),
+        ("maximum", "<="),
+        ("exclusiveMaximum", "<"),
+    ):
+        if key in node and not isinstance(node[key], bool):
+            constraints.append(f"{symbol}{node[key]}")
+    if "pattern" in node:
+        constraints.append(f"/{node['pattern']}/")
+    if constraints:
+        rendered += "(" + ",".join(str(c) for c in constraints) + ")"
+    return rendered
+
+
+def _render_field(name: str, node: Any, required: bool) -> str:
+    field = f"{name}{'!' if required else ''}:{render_type(node)}"
+    if isinstance(node, dict) and node.get("default") is not None:
+        field += "=" + json.dumps(node["default"], separators=(",", ":"))
+    return field
+
+
+def render_object(node: Dict[str, Any]) -> str:
+    required = set(node.get("required", []))
+    fields = [
+        _render_field(name, prop, name in required)
+        for name, prop in node.get("properties", {}).items()
+    ]
+    return "{" + ",".join(fields) + "}"
+
+
+def _is_validation_error_response(code: str, response: Dict[str, Any]) -> bool:
+    if code != "422":
+        return False
+    # Resolving against an empty schema just lists the direct $refs.
+    names = {_ref_name(ref) for ref in collect_refs(response, {})}
+    return bool(names) and names <= set(VALIDATION_ERROR_SCHEMAS)
+
+
+def strip_validation_errors(operation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of the operation without the boilerplate 422 validation response.
+    """
+    responses = {
+        code: resp
+        for code, resp in (operation.get("responses") or {}).items()
+        if not _is_validation_error_response(code, resp)
+    }
+    return {**operation, "responses": responses}
+
+
+def render_operation(method: str, path: str, operation: Dict[str, Any]) -> str:
+    parts = [f"{method} {path}"]
+
+    if operation.get("security"):
+        parts.append("[auth]")
+
+    grouped: Dict[str, List[str]] = {}
+    for param in operation.get("parameters") or []:
+        if "$ref" in param:
+            grouped.setdefault("ref", []).append(_ref_name(param["$ref"]))
+            continue
+        grouped.setdefault(param.get("in", "query"), []).append(
+            _render_field(param.get("name", "?"), param.get("schema", {}), bool(param.get("required")))
+        )
+    for location in ("path", "query", "header", "cookie", "ref"):
+        if grouped.get(location):
+            parts.append(f"{location}(" + ",".join(grouped[location]) + ")")
+
+    body = operation.get("requestBody") or {}
+    for content_type, content in (body.get("content") or {}).items():
+        label = {
+            "application/json": "body",
+            "application/x-www-form-urlencoded": "form",
+            "multipart/form-data": "multipart",
+        }.get(content_type, content_type)
+        required = "!" if body.get("required") else ""
+        parts.append(f"{label}{required}:{render_type(content.get('schema', {}))}")
+        break
+
+    results = []
+    for code, resp in (operation.get("responses") or {}).items():
+        content = resp.get("content") or {}
+        schema = next(iter(content.values()), {}).get("schema") if content else None
+        rendered = render_type(schema) if schema else "-"
+        results.append(f"{code}:{rendered}" if rendered not in ("-", "any") else code)
+    if results:
+        parts.append("-> " + ",".join(results))
+
+    line = " ".join(parts)
+    if operation.get("summary"):
+        line += f"  # {operation['summary']}"
+    return line
+
+
+def compact_openapi(selected_paths: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render the selected path items (plus only the components they reference)
+    in the dense line format, and measure the saving against the previous
+    pretty-printed JSON payload.
+
+    Returns:
+        dict with fields:
+        - text: the compact prompt section
+        - stats: {"tokens_before", "tokens_after", "chars_before", "chars_after", "components"}
+    """
+    lines: List[str] = []
+    pruned_ops: List[Dict[str, Any]] = []
+    for op in iter_operations(selected_paths):
+        operation = strip_validation_errors(op["operation"])
+        pruned_ops.append(operation)
+        lines.append(render_operation(op["method"], op["path"], operation))
+
+    referenced = collect_refs(pruned_ops, schema)
+    component_lines = []
+    for ref in sorted(referenced, key=_ref_name):
+        name = _ref_name(ref)
+        if name in VALIDATION_ERROR_SCHEMAS:
+            continue
+        node = referenced[ref]
+        rendered = render_object(node) if isinstance(node, dict) and "properties" in node else render_type(node)
+        component_lines.append(f"{name} {rendered}")
+
+    text = FORMAT_LEGEND + "\n\nOperations:\n" + "\n".join(lines)
+    if component_lines:
+        text += "\n\nSchemas:\n" + "\n".join(component_lines)
+
+    before = json.dumps(selected_paths, indent=2)
+    return {
+        "text": text,
+        "stats": {
+            "tokens_before": estimate_tokens(before),
+            "tokens_after": estimate_tokens(text),
+            "chars_before": len(before),
+            "chars_after": len(text),
+            "components": len(component_lines),
+        },
+    }
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """
+    Canonical "METHOD /path/{param}" key for one OpenAPI operation.
+    """
+    return f"{method.upper()} {path}"
+
+
+def select_paths(schema: Dict[str, Any], max_endpoints: int) -> Dict[str, Any]:
+    """
+    First `max_endpoints` path items of the schema (keeps prompts bounded).
+    """
+    selected: Dict[str, Any] = {}
+    for i, (path, methods) in enumerate(schema.get("paths", {}).items()):
+        if i >= max_endpoints:
+            break
+        selected[path] = methods
+    return selected
+
+
+def iter_operations(paths: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {"key", "method", "path", "operation"} for every HTTP operation.
+    """
+    for path, path_item in paths.items():
+        for method, operation in path_item.items():
+            if method.lower() not in HTTP_METHODS:
+                continue
+            yield {
+                "key": endpoint_key(method, path),
+                "method": method.upper(),
+                "path": path,
+                "operation": operation,
+            }
+
+
+def collect_refs(node: Any, schema: Dict[str, Any], found: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Transitively collect every local "$ref" target reachable from `node`.
+    Returns {ref_string: resolved_node}.
+    """
+    if found is None:
+        found = {}
+
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/") and ref not in found:
+            target = resolve_ref(ref, schema)
+            found[ref] = target
+            collect_refs(target, schema, found)
+        for value in node.values():
+            collect_refs(value, schema, found)
+    elif isinstance(node, list):
+        for item in node:
+            collect_refs(item, schema, found)
+
+    return found
+
+
+def resolve_ref(ref: str, schema: Dict[str, Any]) -> Any:
+    node: Any = schema
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        node = node.get(part, {}) if isinstance(node, dict) else {}
+    return node
+
+
+def operation_schema_hash(schema: Dict[str, Any], path: str, method: str, operation: Dict[str, Any]) -> str:
+    """
+    Stable hash of one operation plus every component it references, so a
+    change to e.g. a request model also invalidates the endpoint.
+    """
+    payload = {
+        "endpoint": endpoint_key(method, path),
+        "operation": operation,
+        "refs": collect_refs(operation, schema),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _path_template_regex(path: str) -> "re.Pattern[str]":
+    parts = re.split(r"(\{[^}]+\})", path)
+    pattern = "".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts)
+    return re.compile(f"^{pattern}/?$")
+
+
+def match_endpoint(test_case: Dict[str, Any], operations: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Map a generated test case to the endpoint key it exercises: first by its
+    declared "endpoint", then by matching request method + concrete path
+    against the operation path templates.
+    """
+    keys: Set[str] = {op["key"] for op in operations}
+
+    declared = (test_case.get("endpoint") or "").strip()
+    if declared:
+        method, _, path = declared.partition(" ")
+        candidate = endpoint_key(method, path.strip())
+        if candidate in keys:
+            return candidate
+
+    request_spec = test_case.get("request", {}) or {}
+    method = (request_spec.get("method") or "").upper()
+    path = (request_spec.get("path") or "").split("?", 1)[0]
+    for op in operations:
+        if op["method"] == method and _path_template_regex(op["path"]).match(path):
+            return op["key"]
+    return None
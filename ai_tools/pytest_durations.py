@@ -0,0 +1,138 @@
+"""
+pytest plugin: flag tests that ran slower than their recorded baseline.
+
+    pytest -p ai_tools.pytest_durations --duration-regressions tests/api
+
+Each passing test's total duration (setup + call + teardown, as in JUnit
+reports) is compared against the rolling baselines in the TestHub DB (see
+ai_tools.duration_history). Tests are matched by their JUnit id
+("classname::name"), so history comes from uploaded or ingested reports.
+Flagged tests are listed in the terminal summary. With
+--duration-regressions-fail they also fail the session.
+"""
+from typing import Dict, List, Optional
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ai_tools.duration_history import DEFAULT_MIN_DELTA, DEFAULT_THRESHOLD, is_regression, regression_score
+from backend.core.config import get_settings
+from backend.crud.test_duration import get_baselines_for_tests
+
+
+def junit_test_id(nodeid: str) -> str:
+    """
+    "tests/api/test_x.py::TestA::test_b[1]" -> "tests.api.test_x.TestA::test_b[1]",
+    the classname::name id pytest's junitxml produces for the same test.
+    """
+    names = nodeid.split("::")
+    names[0] = names[0].replace("/", ".")
+    if names[0].endswith(".py"):
+        names[0] = names[0][:-3]
+    return ".".join(names[:-1]) + "::" + names[-1] if len(names) > 1 else names[0]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration-regressions", "slow-test regression detection (TestHub)")
+    group.addoption(
+        "--duration-regressions",
+        action="store_true",
+        help="Flag tests slower than their recorded duration baseline",
+    )
+    group.addoption(
+        "--duration-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Robust z-score above which a test is flagged (default {DEFAULT_THRESHOLD})",
+    )
+    group.addoption(
+        "--duration-min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help=f"Minimum slowdown in seconds to flag (default {DEFAULT_MIN_DELTA})",
+    )
+    group.addoption(
+        "--duration-db",
+        default=None,
+        help="SQLAlchemy URL of the TestHub DB (default: SQLALCHEMY_DATABASE_URL)",
+    )
+    group.addoption(
+        "--duration-regressions-fail",
+        action="store_true",
+        help="Exit non-zero when regressions are flagged",
+    )
+
+
+def pytest_configure(config):
+    # Under xdist only the controller sees every report; workers skip this.
+    if config.getoption("duration_regressions") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRegressionReporter(config), "testhub-duration-regressions")
+
+
+class DurationRegressionReporter:
+    def __init__(self, config):
+        self.threshold = config.getoption("duration_threshold")
+        self.min_delta = config.getoption("duration_min_delta")
+        self.database_url = config.getoption("duration_db") or get_settings().SQLALCHEMY_DATABASE_URL
+        self.fail = config.getoption("duration_regressions_fail")
+        self.durations: Dict[str, float] = {}
+        self.failed: set = set()
+        self.flagged: List[Dict] = []
+        self.error: Optional[str] = None
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if not report.passed:
+            self.failed.add(report.nodeid)
+
+    def _load_baselines(self, tests: List[str]):
+        engine = create_engine(self.database_url)
+        try:
+            with sessionmaker(bind=engine)() as db:
+                return {
+                    test: (row.median, row.mad, row.samples)
+                    for test, row in get_baselines_for_tests(db, tests).items()
+                }
+        finally:
+            engine.dispose()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        passed = {junit_test_id(nodeid): d for nodeid, d in self.durations.items() if nodeid not in self.failed}
+        try:
+            baselines = self._load_baselines(list(passed))
+        except Exception as e:  # a missing/unreachable DB must not break the test run
+            self.error = str(e)
+            return
+
+        for test, duration in passed.items():
+            if test not in baselines:
+                continue
+            median, mad, samples = baselines[test]
+            if is_regression(duration, median, mad, samples, self.threshold, self.min_delta):
+                self.flagged.append(
+                    {
+                        "test": test,
+                        "duration": duration,
+                        "median": median,
+                        "score": regression_score(duration, median, mad),
+                    }
+                )
+        self.flagged.sort(key=lambda r: r["score"], reverse=True)
+
+        if self.fail and self.flagged and session.exitstatus == 0:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.section("duration regressions")
+        if self.error:
+            terminalreporter.write_line(f"Could not load duration baselines: {self.error}")
+            return
+        if not self.flagged:
+            terminalreporter.write_line(f"No test slower than its baseline (threshold {self.threshold:g}).")
+            return
+        for r in self.flagged:
+            terminalreporter.write_line(
+                f"{r['test']}: {r['duration']:.3f}s vs median {r['median']:.3f}s (score {r['score']:.1f})"
+            )
@@ -0,0 +1,161 @@
+"""
+Compare the per-test results of two stored test runs.
+
+Both runs are streamed ordered by test id (straight off the
+ix_test_results_run_test index) and merge-joined, so a diff is one
+sequential pass over each run with memory bounded by the report limit,
+not by the run size. Only the top `limit` entries of each list are kept
+(heaps for the latency deltas); the counts always cover every test.
+"""
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.crud.test_result import iter_results_by_test
+
+FAILING = {"failed", "error"}
+DEFAULT_DIFF_LIMIT = 100
+DEFAULT_MIN_LATENCY_DELTA = 0.05  # seconds
+
+_Row = Tuple[str, str, float]
+
+
+def _dedupe(rows: Iterator[_Row]) -> Iterator[_Row]:
+    """
+    Collapse repeated test ids (same test in several shards) to one row,
+    keeping a failing outcome over a passing one.
+    """
+    current: Optional[_Row] = None
+    for row in rows:
+        if current is not None and row[0] == current[0]:
+            if row[1] in FAILING and current[1] not in FAILING:
+                current = row
+            continue
+        if current is not None:
+            yield current
+        current = row
+    if current is not None:
+        yield current
+
+
+def merge_join(left: Iterator[_Row], right: Iterator[_Row]) -> Iterator[Tuple[str, Optional[_Row], Optional[_Row]]]:
+    """
+    Full outer join of two test-ordered row streams: yields (test, a, b)
+    with a or b None when the test is missing from that side.
+    """
+    left, right = _dedupe(left), _dedupe(right)
+    a = next(left, None)
+    b = next(right, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] < b[0]):
+            yield a[0], a, None
+            a = next(left, None)
+        elif a is None or b[0] < a[0]:
+            yield b[0], None, b
+            b = next(right, None)
+        else:
+            yield a[0], a, b
+            a = next(left, None)
+            b = next(right, None)
+
+
+class _Capped:
+    """
+    Count everything, keep the first `limit` items.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        self.items: List[Any] = []
+
+    def add(self, item: Any) -> None:
+        self.count += 1
+        if len(self.items) < self.limit:
+            self.items.append(item)
+
+
+def diff_test_runs(
+    db: Session,
+    base_run_id: int,
+    head_run_id: int,
+    limit: int = DEFAULT_DIFF_LIMIT,
+    min_latency_delta: float = DEFAULT_MIN_LATENCY_DELTA,
+) -> Dict[str, Any]:
+    """
+    What changed from run `base_run_id` to run `head_run_id`.
+
+    Returns:
+        dict with fields:
+        - base_run_id, head_run_id
+        - counts: {common, newly_failing, newly_passing, added, removed, slower, faster}
+        - newly_failing / newly_passing: [{test, base_outcome, head_outcome}]
+        - added / removed: [{test, outcome}]
+        - slower / faster: [{test, base_duration, head_duration, delta}], largest
+          change first; tests that passed in both runs and moved by at
+          least min_latency_delta seconds
+        - total_duration_delta: head minus base over tests passing in both
+        Lists are in test order and capped at `limit`; counts are exact.
+    """
+    newly_failing, newly_passing = _Capped(limit), _Capped(limit)
+    added, removed = _Capped(limit), _Capped(limit)
+    slower: List[Tuple[float, str, float, float]] = []
+    faster: List[Tuple[float, str, float, float]] = []
+    counts = {"common": 0, "slower": 0, "faster": 0}
+    total_delta = 0.0
+
+    rows = merge_join(iter_results_by_test(db, base_run_id), iter_results_by_test(db, head_run_id))
+    for test, a, b in rows:
+        if b is None:
+            removed.add({"test": test, "outcome": a[1]})
+            continue
+        if a is None:
+            added.add({"test": test, "outcome": b[1]})
+            continue
+
+        counts["common"] += 1
+        base_failing, head_failing = a[1] in FAILING, b[1] in FAILING
+        if head_failing and not base_failing:
+            newly_failing.add({"test": test, "base_outcome": a[1], "head_outcome": b[1]})
+        elif base_failing and b[1] == "passed":
+            newly_passing.add({"test": test, "base_outcome": a[1], "head_outcome": b[1]})
+
+        if a[1] == "passed" and b[1] == "passed":
+            delta = b[2] - a[2]
+            total_delta += delta
+            if abs(delta) < min_latency_delta:
+                continue
+            # Min-heaps of size `limit` keep the largest |delta| seen so far.
+            heap = slower if delta > 0 else faster
+            counts["slower" if delta > 0 else "faster"] += 1
+            entry = (abs(delta), test, a[2], b[2])
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def latency_list(heap):
+        return [
+            {"test": test, "base_duration": base, "head_duration": head, "delta": round(head - base, 6)}
+            for _, test, base, head in sorted(heap, reverse=True)
+        ]
+
+    return {
+        "base_run_id": base_run_id,
+        "head_run_id": head_run_id,
+        "counts": {
+            **counts,
+            "newly_failing": newly_failing.count,
+            "newly_passing": newly_passing.count,
+            "added": added.count,
+            "removed": removed.count,
+        },
+        "newly_failing": newly_failing.items,
+        "newly_passing": newly_passing.items,
+        "added": added.items,
+        "removed": removed.items,
+        "slower": latency_list(slower),
+        "faster": latency_list(faster),
+        "total_duration_delta": round(total_delta, 6),
+    }
@@ -0,0 +1,241 @@
+"""
+Retention for stored test runs.
+
+Raw data of a run (TestRun.results, its test_results rows and its
+test_durations history) is kept for RETENTION_RAW_DAYS. After that,
+compaction packs it into one zlib-compressed JSON blob in
+test_run_archives and deletes the raw rows.
+After RETENTION_ARCHIVE_DAYS (0 = never) the blob itself is dropped. The
+TestRun row with its summary, and the archive row with the outcome counts,
+are kept forever as the run's rollup. Rolling duration baselines and
+flakiness stats are per test, not per run, so compaction leaves them
+alone; only the per-run duration history is archived.
+
+An archived run can be rehydrated on demand: its rows are restored, and it
+is compacted again once it has stayed raw for another RETENTION_RAW_DAYS.
+The archive keeps its payload meanwhile, so re-archiving only deletes.
+
+The app runs compact_test_runs every RETENTION_COMPACTION_INTERVAL seconds
+(see backend/main.py); POST /ai/dashboard/retention/compact runs it now.
+"""
+import asyncio
+import json
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.crud.test_duration import bulk_insert_durations, delete_run_durations
+from backend.crud.test_result import bulk_insert_test_results, delete_test_results
+from backend.crud.test_run_archive import list_archives, list_runs_to_archive
+from backend.models.test_duration import TestDuration
+from backend.models.test_result import TestResult
+from backend.models.test_run import TestRun
+from backend.models.test_run_archive import TestRunArchive
+
+ARCHIVE_FORMAT = 1
+# Stored column-wise ({"columns": [...], "rows": [[...], ...]}), which
+# compresses better than one dict per row.
+RESULT_COLUMNS = ["test", "classname", "name", "outcome", "duration", "message", "details", "shard"]
+DURATION_COLUMNS = ["test", "duration", "baseline_median", "baseline_mad", "baseline_samples", "recorded_at"]
+
+
+def pack_run(run: TestRun, rows: List[Tuple], durations: List[Tuple] = ()) -> Tuple[bytes, int]:
+    """
+    Compressed archive payload of a run, its result rows (tuples in
+    RESULT_COLUMNS order) and its duration history (DURATION_COLUMNS
+    order). Returns (payload, uncompressed size).
+    """
+    raw = json.dumps(
+        {
+            "format": ARCHIVE_FORMAT,
+            "results": run.results,
+            "test_results": {"columns": RESULT_COLUMNS, "rows": [list(r) for r in rows]},
+            "test_durations": {
+                "columns": DURATION_COLUMNS,
+                "rows": [[*d[:-1], d[-1].isoformat() if d[-1] else None] for d in durations],
+            },
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return zlib.compress(raw, 6), len(raw)
+
+
+def unpack_run(payload: bytes) -> Dict[str, Any]:
+    """
+    Inverse of pack_run: {"results": [...] | None, "test_results": [row dicts],
+    "test_durations": [row dicts]}.
+    """
+    data = json.loads(zlib.decompress(payload))
+    unpacked: Dict[str, Any] = {"results": data["results"]}
+    for table in ("test_results", "test_durations"):
+        packed = data.get(table) or {"columns": [], "rows": []}
+        unpacked[table] = [dict(zip(packed["columns"], row)) for row in packed["rows"]]
+    for row in unpacked["test_durations"]:
+        if row["recorded_at"]:
+            row["recorded_at"] = datetime.fromisoformat(row["recorded_at"])
+    return unpacked
+
+
+def _delete_raw(db: Session, test_run_id: int) -> None:
+    delete_test_results(db, test_run_id)
+    delete_run_durations(db, test_run_id)
+
+
+def archive_test_run(db: Session, run: TestRun) -> TestRunArchive:
+    """
+    Compress the run's raw data into a new archive and delete it from
+    test_results, test_durations and TestRun.results. The caller commits.
+    """
+    columns = [getattr(TestResult, c) for c in RESULT_COLUMNS]
+    rows = db.execute(select(*columns).where(TestResult.test_run_id == run.id).order_by(TestResult.id)).all()
+    duration_columns = [getattr(TestDuration, c) for c in DURATION_COLUMNS]
+    durations = db.execute(
+        select(*duration_columns).where(TestDuration.test_run_id == run.id).order_by(TestDuration.id)
+    ).all()
+    payload, raw_bytes = pack_run(run, rows, durations)
+
+    archive = TestRunArchive(
+        test_run_id=run.id,
+        status="archived",
+        payload=payload,
+        result_count=len(rows),
+        outcome_counts=dict(Counter(r.outcome for r in rows)),
+        raw_bytes=raw_bytes,
+        compressed_bytes=len(payload),
+        archived_at=datetime.utcnow(),
+    )
+    db.add(archive)
+    _delete_raw(db, run.id)
+    run.results = None
+    return archive
+
+
+def rehydrate_test_run(db: Session, run: TestRun, archive: TestRunArchive) -> TestRunArchive:
+    """
+    Restore an archived run's raw data (no-op if already rehydrated) and
+    commit. The archive must still have its payload.
+    """
+    if archive.status == "rehydrated":
+        return archive
+    if archive.payload is None:
+        raise ValueError(f"Archive of test run #{run.id} has expired")
+
+    data = unpack_run(archive.payload)
+    bulk_insert_test_results(db, run.id, data["test_results"])
+    bulk_insert_durations(db, [{**row, "test_run_id": run.id} for row in data["test_durations"]])
+    run.results = data["results"]
+    archive.status = "rehydrated"
+    archive.rehydrated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(archive)
+    print(f"[RETENTION] Rehydrated test run #{run.id} ({archive.result_count} results)")
+    return archive
+
+
+def _vacuum(db: Session) -> bool:
+    """
+    Give freed pages back to the filesystem (SQLite only; VACUUM must run
+    outside a transaction).
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+    return True
+
+
+def compact_test_runs(
+    db: Session,
+    raw_days: int,
+    archive_days: int = 0,
+    batch_size: int = 50,
+    vacuum: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    One compaction pass, committed every batch_size runs:
+    - archive finished runs started more than raw_days ago
+    - re-archive rehydrated runs that have been raw for raw_days again
+    - with archive_days > 0, drop the payload of archives of runs started
+      more than archive_days ago
+    - with vacuum=True, VACUUM SQLite if anything was removed
+
+    Returns the counts and byte totals (see CompactionResult).
+    """
+    now = now or datetime.utcnow()
+    raw_cutoff = now - timedelta(days=raw_days)
+    stats = {"archived": 0, "rearchived": 0, "expired": 0, "raw_bytes": 0, "compressed_bytes": 0, "vacuumed": False}
+
+    while True:
+        runs = list_runs_to_archive(db, started_before=raw_cutoff, limit=batch_size)
+        if not runs:
+            break
+        for run in runs:
+            archive = archive_test_run(db, run)
+            stats["raw_bytes"] += archive.raw_bytes
+            stats["compressed_bytes"] += archive.compressed_bytes
+        db.commit()
+        stats["archived"] += len(runs)
+
+    while True:
+        archives = list_archives(db, "rehydrated", rehydrated_before=raw_cutoff, limit=batch_size)
+        if not archives:
+            break
+        for archive in archives:
+            _delete_raw(db, archive.test_run_id)
+            db.query(TestRun).filter(TestRun.id == archive.test_run_id).update({TestRun.results: None})
+            archive.status = "archived"
+        db.commit()
+        stats["rearchived"] += len(archives)
+
+    if archive_days > 0:
+        archive_cutoff = now - timedelta(days=archive_days)
+        while True:
+            archives = list_archives(db, "archived", started_before=archive_cutoff, limit=batch_size)
+            if not archives:
+                break
+            for archive in archives:
+                archive.payload = None
+                archive.status = "expired"
+                archive.expired_at = now
+            db.commit()
+            stats["expired"] += len(archives)
+
+    if vacuum and (stats["archived"] or stats["rearchived"] or stats["expired"]):
+        stats["vacuumed"] = _vacuum(db)
+
+    if stats["archived"] or stats["rearchived"] or stats["expired"]:
+        print(
+            f"[RETENTION] Archived {stats['archived']} run(s) "
+            f"({stats['raw_bytes']} -> {stats['compressed_bytes']} bytes), "
+            f"re-archived {stats['rearchived']}, expired {stats['expired']}"
+        )
+    return stats
+
+
+async def run_compaction_periodically(
+    session_factory: Callable[[], Session],
+    interval_s: float,
+    **compact_kwargs: Any,
+) -> None:
+    """
+    Run compact_test_runs now and then every interval_s seconds, in a
+    worker thread so the event loop stays free. Errors are logged and the
+    loop carries on; cancel the task to stop it.
+    """
+
+    def compact_once() -> Dict[str, Any]:
+        with session_factory() as db:
+            return compact_test_runs(db, **compact_kwargs)
+
+    while True:
+        try:
+            await asyncio.to_thread(compact_once)
+        except Exception as e:  # keep the schedule alive across transient DB errors
+            print(f"[RETENTION] Compaction failed: {e}")
+        await asyncio.sleep(interval_s)
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ai_tools.openapi_utils import (
+    iter_operations,
+    match_endpoint,
+    operation_schema_hash,
+    select_paths,
+)
+from ai_tools.test_generator import fetch_openapi_schema, generate_test_cases_for_paths
+from backend.crud.test_corpus import (
+    get_corpus_by_endpoints,
+    mark_corpus_used,
+    upsert_corpus_entry,
+)
+
+
+def load_or_generate_test_cases(
+    db: Session,
+    schema: Dict[str, Any],
+    max_endpoints: int = 10,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Return test cases for the selected endpoints, calling Gemini only for
+    operations whose schema hash is new or changed (or all, if refresh=True).
+
+    Returns:
+        dict with fields:
+        - cases: list of test cases, in OpenAPI operation order
+        - reused: endpoint keys served from the corpus
+        - regenerated: endpoint keys sent to Gemini
+        - llm_calls: 0 or 1
+        - unmatched: generated cases that could not be mapped to an endpoint
+    """
+    operations = list(iter_operations(select_paths(schema, max_endpoints)))
+    hashes = {
+        op["key"]: operation_schema_hash(schema, op["path"], op["method"], op["operation"])
+        for op in operations
+    }
+
+    existing = get_corpus_by_endpoints(db, hashes.keys())
+    stale = [
+        op
+        for op in operations
+        if refresh
+        or op["key"] not in existing
+        or existing[op["key"]].schema_hash != hashes[op["key"]]
+        or not existing[op["key"]].cases  # stored empty by older versions
+    ]
+
+    generated: Dict[str, List[Dict[str, Any]]] = {}
+    unmatched = 0
+    if stale:
+        stale_paths: Dict[str, Dict[str, Any]] = {}
+        for op in stale:
+            stale_paths.setdefault(op["path"], {})[op["method"].lower()] = op["operation"]
+
+        for tc in generate_test_cases_for_paths(stale_paths, schema=schema):
+            key = match_endpoint(tc, stale)
+            if key is None:
+                unmatched += 1
+                continue
+            tc["endpoint"] = key
+            generated.setdefault(key, []).append(tc)
+
+        # Endpoints that got no cases are not stored, so the next run asks for them again.
+        for op in stale:
+            if generated.get(op["key"]):
+                upsert_corpus_entry(db, op["key"], hashes[op["key"]], generated[op["key"]], commit=False)
+        db.commit()
+
+    stale_keys = {op["key"] for op in stale}
+    cases: List[Dict[str, Any]] = []
+    for op in operations:
+        if op["key"] in stale_keys:
+            cases.extend(generated.get(op["key"], []))
+        else:
+            cases.extend(existing[op["key"]].cases or [])
+
+    mark_corpus_used(db, [existing[k] for k in hashes if k in existing and k not in stale_keys])
+
+    return {
+        "cases": cases,
+        "reused": [op["key"] for op in operations if op["key"] not in stale_keys],
+        "regenerated": [op["key"] for op in stale],
+        "llm_calls": 1 if stale else 0,
+        "unmatched": unmatched,
+    }
+
+
+def get_corpus_test_cases(
+    session_factory: Callable[[], Session],
+    base_url: str = "http://127.0.0.1:8000",
+    max_endpoints: int = 10,
+    schema: Optional[Dict[str, Any]] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Standalone variant of load_or_generate_test_cases for the executor:
+    fetches the schema if needed and opens its own session from
+    session_factory, i.e. the database of the app whose corpus is used.
+    """
+    if schema is None:
+        schema = fetch_openapi_schema(base_url)
+
+    with session_factory() as db:
+        return load_or_generate_test_cases(db, schema, max_endpoints=max_endpoints, refresh=refresh)
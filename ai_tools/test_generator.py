@@ -1,8 +1,10 @@
 import json
 import requests
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from ai_tools.gemini_client import get_gemini_model
+from ai_tools.openapi_compact import compact_openapi
+from ai_tools.openapi_utils import select_paths
 
 
 def fetch_openapi_schema(base_url: str = "http://127.0.0.1:8000") -> Dict[str, Any]:
@@ -18,19 +20,38 @@ def fetch_openapi_schema(base_url: str = "http://127.0.0.1:8000") -> Dict[str, A
 def generate_test_cases_from_openapi(
     base_url: str = "http://127.0.0.1:8000",
     max_endpoints: int = 10,
+    schema: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
-    schema = fetch_openapi_schema(base_url)
-    paths = schema.get("paths", {})
+    """
+    Generate test cases for the first `max_endpoints` paths of the OpenAPI
+    schema. Pass `schema` to skip fetching it from `base_url` (e.g. when the
+    app is driven in-process).
+    """
+    if schema is None:
+        schema = fetch_openapi_schema(base_url)
 
     # Pre-select a subset of endpoints to avoid huge prompts
-    selected_paths = {}
-    for i, (path, methods) in enumerate(paths.items()):
-        if i >= max_endpoints:
-            break
-        selected_paths[path] = methods
+    selected_paths = select_paths(schema, max_endpoints)
+    return generate_test_cases_for_paths(selected_paths, schema=schema)
 
+
+def generate_test_cases_for_paths(
+    selected_paths: Dict[str, Any],
+    schema: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    One Gemini call generating test cases for the given OpenAPI path items.
+    `schema` is the full document, used to resolve `$ref`s into components.
+    """
     model = get_gemini_model()
 
+    compact = compact_openapi(selected_paths, schema or {"paths": selected_paths})
+    stats = compact["stats"]
+    print(
+        f"[GENERATOR] OpenAPI prompt: ~{stats['tokens_before']} -> ~{stats['tokens_after']} tokens "
+        f"({stats['components']} components)"
+    )
+
     prompt = (
         "You are an expert SDET. Given this OpenAPI snippet, generate a list of high-quality API test cases.\n\n"
         "Return ONLY valid JSON, no markdown, in this format:\n"
@@ -49,8 +70,8 @@ def generate_test_cases_from_openapi(
         '    "expected": ["list of expected outcomes, status codes, body checks"]\n'
         "  }\n"
         "]\n\n"
-        "OpenAPI snippet:\n"
-        f"{json.dumps(selected_paths, indent=2)}"
+        "OpenAPI summary:\n"
+        f"{compact['text']}"
     )
 
     response = model.generate_content(prompt)
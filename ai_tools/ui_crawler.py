@@ -0,0 +1,264 @@
+"""
+Breadth-first, same-origin crawl of a web app for UI test generation.
+
+Pages of one depth level are inspected concurrently through the shared
+BrowserPool. Pages whose control structure matches an already-seen page
+(e.g. /projects/1 and /projects/2; see structure_hash) are recorded as
+duplicates and not expanded, and the remaining pages are grouped by "area"
+(first path segment) so Gemini is called once per area rather than once
+per page.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from ai_tools.ui_fingerprint import compare_fingerprints, save_fingerprint
+from ai_tools.ui_test_generator import (
+    generate_ui_tests_code_for_pages,
+    inspect_page_structure_async,
+    load_unchanged_module,
+    save_ui_tests,
+    ui_test_path,
+)
+
+if TYPE_CHECKING:
+    from ai_tools.browser_pool import BrowserPool
+
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_PAGES = 20
+ROOT_AREA = "home"
+
+_ID_SEGMENT_RE = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+_SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "data:")
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def normalize_link(page_url: str, href: str) -> Optional[str]:
+    """
+    Absolute URL for a same-origin link (fragment dropped), or None for
+    external, non-HTTP or empty links.
+    """
+    href = (href or "").strip()
+    if not href or href.startswith("#") or href.lower().startswith(_SKIPPED_SCHEMES):
+        return None
+    absolute, _ = urldefrag(urljoin(page_url, href))
+    if _origin(absolute) != _origin(page_url):
+        return None
+    return absolute
+
+
+def _path_template(url: str) -> str:
+    parts = urlsplit(url)
+    segments = ["<ID>" if _ID_SEGMENT_RE.match(seg) else seg for seg in parts.path.split("/")]
+    return "/".join(segments)
+
+
+def structure_hash(summary: Dict[str, Any]) -> str:
+    """
+    Hash of the page's control structure only: the distinct input
+    tags/types/names/test ids, button tags/test ids and link path
+    templates. Texts, titles, numeric ids, order and counts are ignored, so
+    item pages of the same kind hash equal, also when they list a different
+    number of rows with the same controls.
+    """
+    skeleton = {
+        "inputs": sorted(
+            {(i.get("tag"), i.get("type"), i.get("name"), i.get("data_testid")) for i in summary.get("inputs", [])},
+            key=str,
+        ),
+        "buttons": sorted({(b.get("tag"), b.get("data_testid")) for b in summary.get("buttons", [])}, key=str),
+        "links": sorted({_path_template(l.get("href", "")) for l in summary.get("links", [])}),
+    }
+    canonical = json.dumps(skeleton, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def page_area(url: str) -> str:
+    """
+    First path segment of the URL ("home" for the root page).
+    """
+    segments = [seg for seg in urlsplit(url).path.split("/") if seg]
+    if not segments:
+        return ROOT_AREA
+    return re.sub(r"[^A-Za-z0-9_]+", "_", segments[0]).strip("_") or ROOT_AREA
+
+
+async def crawl_site(
+    start_url: str,
+    pool: "BrowserPool",
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> Dict[str, Any]:
+    """
+    Inspect start_url and same-origin pages reachable within max_depth link
+    hops, at most max_pages inspections in total.
+
+    Returns:
+        dict with fields:
+        - pages: unique page summaries (each with "depth" and "structure_hash")
+        - duplicates: {url: url of the structurally identical page kept}
+        - errors: {url: error message}
+    """
+    seen_urls = {start_url}
+    seen_hashes: Dict[str, str] = {}
+    pages: List[Dict[str, Any]] = []
+    duplicates: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    inspected = 0
+
+    frontier = [start_url]
+    for depth in range(max_depth + 1):
+        frontier = frontier[: max(0, max_pages - inspected)]
+        if not frontier:
+            break
+        inspected += len(frontier)
+
+        results = await asyncio.gather(
+            *(inspect_page_structure_async(url, pool) for url in frontier),
+            return_exceptions=True,
+        )
+
+        next_frontier: List[str] = []
+        for url, result in zip(frontier, results):
+            if isinstance(result, BaseException):
+                errors[url] = str(result)
+                continue
+
+            digest = structure_hash(result)
+            if digest in seen_hashes:
+                duplicates[url] = seen_hashes[digest]
+                continue
+            seen_hashes[digest] = url
+
+            result["depth"] = depth
+            result["structure_hash"] = digest
+            pages.append(result)
+
+            for link in result.get("links", []):
+                target = normalize_link(url, link.get("href", ""))
+                if target and target not in seen_urls:
+                    seen_urls.add(target)
+                    next_frontier.append(target)
+
+        frontier = next_frontier
+
+    print(
+        f"[CRAWLER] {start_url}: inspected {inspected} page(s), {len(pages)} unique, "
+        f"{len(duplicates)} duplicate(s), {len(errors)} error(s)"
+    )
+    return {"pages": pages, "duplicates": duplicates, "errors": errors}
+
+
+def group_pages_by_area(pages: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for summary in pages:
+        groups.setdefault(page_area(summary["url"]), []).append(summary)
+    return groups
+
+
+async def crawl_and_generate_ui_tests(
+    start_url: str,
+    pool: "BrowserPool",
+    output_dir: str = "tests/ui/generated",
+    save: bool = True,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    filename_prefix: str = "test_ai_ui_area_",
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Crawl the site, then generate one test module per area with one Gemini
+    call each (run concurrently in worker threads). Areas whose saved
+    module fingerprint still matches are reused without calling Gemini.
+    Area modules are named with their own filename_prefix so they never
+    overwrite the single-page module generated for the same URL.
+
+    Returns:
+        dict with fields:
+        - url
+        - pages: inspected unique page URLs
+        - duplicates, errors: as returned by crawl_site
+        - changed_pages: URLs new or changed since their module was generated
+        - modules: [{"area", "pages", "code", "saved_path", "regenerated",
+                     "changed_pages", "removed_pages"}]
+        - failed_areas: {area: error} for areas whose generation failed; they
+          have no module and are retried on the next crawl
+        - crawl_ms, generation_ms
+    """
+    start = time.perf_counter()
+    crawl = await crawl_site(start_url, pool, max_depth=max_depth, max_pages=max_pages)
+    crawl_ms = (time.perf_counter() - start) * 1000
+
+    groups = group_pages_by_area(crawl["pages"])
+    origin = _origin(start_url)
+
+    modules = []
+    for area, summaries in groups.items():
+        module_url = f"{origin}/{area}"
+        module_path = ui_test_path(module_url, output_dir, filename_prefix)
+        comparison = compare_fingerprints(module_path, summaries)
+        modules.append(
+            {
+                "area": area,
+                "url": module_url,
+                "summaries": summaries,
+                "comparison": comparison,
+                "code": load_unchanged_module(module_path, comparison, force) if save else None,
+                "regenerated": False,
+            }
+        )
+
+    stale = [m for m in modules if m["code"] is None]
+    start = time.perf_counter()
+    codes = await asyncio.gather(
+        *(asyncio.to_thread(generate_ui_tests_code_for_pages, m["area"], m["summaries"]) for m in stale),
+        return_exceptions=True,
+    )
+    generation_ms = (time.perf_counter() - start) * 1000
+    # One area failing (rate limit, timeout) must not discard the others.
+    failed_areas: Dict[str, str] = {}
+    for m, code in zip(stale, codes):
+        if isinstance(code, BaseException):
+            failed_areas[m["area"]] = str(code) or type(code).__name__
+            continue
+        m["code"] = code
+        m["regenerated"] = True
+        if save:
+            save_fingerprint(save_ui_tests(m["url"], code, output_dir, filename_prefix), m["comparison"])
+
+    print(
+        f"[CRAWLER] {len(stale) - len(failed_areas)} of {len(modules)} area module(s) regenerated, "
+        f"{len(failed_areas)} failed"
+    )
+
+    return {
+        "url": start_url,
+        "pages": [summary["url"] for summary in crawl["pages"]],
+        "duplicates": crawl["duplicates"],
+        "errors": crawl["errors"],
+        "changed_pages": [url for m in modules for url in m["comparison"]["changed_pages"]],
+        "modules": [
+            {
+                "area": m["area"],
+                "pages": [summary["url"] for summary in m["summaries"]],
+                "code": m["code"],
+                "saved_path": ui_test_path(m["url"], output_dir, filename_prefix) if save else None,
+                "regenerated": m["regenerated"],
+                "changed_pages": m["comparison"]["changed_pages"],
+                "removed_pages": m["comparison"]["removed_pages"],
+            }
+            for m in modules
+            if m["area"] not in failed_areas
+        ],
+        "failed_areas": failed_areas,
+        "crawl_ms": round(crawl_ms, 1),
+        "generation_ms": round(generation_ms, 1),
+    }
@@ -0,0 +1,112 @@
+"""
+Stable fingerprints of inspected pages, stored in a JSON sidecar next to
+each generated UI test module so unchanged pages skip regeneration.
+
+Unlike ui_crawler.structure_hash (which only groups pages of the same
+kind), the fingerprint covers labels, placeholders and button/link texts,
+because those end up in generated selectors. Volatile parts of those
+texts (numbers, dates, UUIDs, whitespace) are normalized away.
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+FINGERPRINT_SUFFIX = ".fingerprint.json"
+
+_VOLATILE_TEXT = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2})?(\.\d+)?(Z|[+-]\d{2}:?\d{2})?)?"), "<DATE>"),
+    (re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\s*([AaPp][Mm])?\b"), "<TIME>"),
+    (re.compile(r"\d+(\.\d+)?"), "<N>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_ui_text(text: str) -> str:
+    text = text or ""
+    for pattern, replacement in _VOLATILE_TEXT:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def page_fingerprint(summary: Dict[str, Any]) -> str:
+    """
+    sha256 over the normalized summary (URL excluded; it is the cache key).
+    """
+    n = normalize_ui_text
+    canonical = {
+        "title": n(summary.get("title", "")),
+        "inputs": [
+            [i.get("tag"), i.get("type"), i.get("name"), n(i.get("placeholder", "")), i.get("data_testid"), n(i.get("label", ""))]
+            for i in summary.get("inputs", [])
+        ],
+        "buttons": [[b.get("tag"), n(b.get("text", "")), b.get("data_testid")] for b in summary.get("buttons", [])],
+        "links": [[n(l.get("text", "")), n(l.get("href", "")), l.get("data_testid")] for l in summary.get("links", [])],
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_path(module_path: str) -> str:
+    base, _ = os.path.splitext(module_path)
+    return base + FINGERPRINT_SUFFIX
+
+
+def load_fingerprint(module_path: str) -> Optional[Dict[str, Any]]:
+    path = fingerprint_path(module_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def compare_fingerprints(module_path: str, summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fingerprint the given pages and compare with what the module at
+    module_path was generated from.
+
+    Returns:
+        dict with fields:
+        - fingerprint: combined fingerprint of all pages
+        - pages: {url: page fingerprint}
+        - changed_pages: URLs that are new or differ from the stored ones
+        - removed_pages: URLs stored previously but not given now
+        - unchanged: True if the module exists and was built from these pages
+    """
+    pages = {summary["url"]: page_fingerprint(summary) for summary in summaries}
+    combined = hashlib.sha256(
+        json.dumps(pages, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+    stored = load_fingerprint(module_path) or {}
+    stored_pages = stored.get("pages", {})
+
+    return {
+        "fingerprint": combined,
+        "pages": pages,
+        "changed_pages": [url for url, fp in pages.items() if stored_pages.get(url) != fp],
+        "removed_pages": [url for url in stored_pages if url not in pages],
+        "unchanged": os.path.exists(module_path) and stored.get("fingerprint") == combined,
+    }
+
+
+def save_fingerprint(module_path: str, comparison: Dict[str, Any]) -> str:
+    path = fingerprint_path(module_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "fingerprint": comparison["fingerprint"],
+                "pages": comparison["pages"],
+                "generated_at": datetime.utcnow().isoformat(),
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+    return path
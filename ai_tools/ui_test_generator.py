@@ -1,93 +1,128 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import textwrap
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from playwright.sync_api import sync_playwright
 
 from ai_tools.gemini_client import get_gemini_model
+from ai_tools.ui_fingerprint import compare_fingerprints, save_fingerprint
+
+if TYPE_CHECKING:
+    from ai_tools.browser_pool import BrowserPool
+
+
+MAX_LINKS = 30
+
+# Runs in the page; returns the whole summary in a single round trip instead
+# of several Playwright calls per element.
+EXTRACT_SUMMARY_JS = """
+(maxLinks) => {
+    const attr = (e, name) => e.getAttribute(name) || "";
+    const text = (e) => (e.innerText || "").trim();
+    const labelFor = (e) => {
+        if (e.id) {
+            const lab = document.querySelector(`label[for="${CSS.escape(e.id)}"]`);
+            if (lab) return text(lab);
+        }
+        const parentLabel = e.closest("label");
+        return parentLabel ? text(parentLabel) : "";
+    };
+
+    const inputs = Array.from(document.querySelectorAll("input, textarea, select"), (e) => ({
+        tag: e.tagName.toLowerCase(),
+        type: attr(e, "type"),
+        name: attr(e, "name"),
+        placeholder: attr(e, "placeholder"),
+        data_testid: attr(e, "data-testid"),
+        label: labelFor(e),
+    }));
+
+    const buttons = Array.from(
+        document.querySelectorAll("button, [role=button], input[type=submit]"),
+        (e) => ({
+            tag: e.tagName.toLowerCase(),
+            text: text(e),
+            data_testid: attr(e, "data-testid"),
+        })
+    );
+
+    const links = Array.from(document.querySelectorAll("a[href]"))
+        .slice(0, maxLinks)
+        .map((e) => ({
+            text: text(e),
+            href: attr(e, "href"),
+            data_testid: attr(e, "data-testid"),
+        }));
+
+    return { title: document.title, inputs, buttons, links };
+}
+"""
+
+
+def extract_page_summary(page: Any, max_links: int = MAX_LINKS) -> Dict[str, Any]:
+    """
+    Summarize an already-loaded Playwright page with one page.evaluate call.
+    """
+    extracted = page.evaluate(EXTRACT_SUMMARY_JS, max_links)
+    return {
+        "url": page.url,
+        "title": extracted["title"],
+        "inputs": extracted["inputs"],
+        "buttons": extracted["buttons"],
+        "links": extracted["links"],
+    }
+
+
+async def extract_page_summary_async(page: Any, max_links: int = MAX_LINKS) -> Dict[str, Any]:
+    """
+    extract_page_summary for an async Playwright page.
+    """
+    extracted = await page.evaluate(EXTRACT_SUMMARY_JS, max_links)
+    return {
+        "url": page.url,
+        "title": extracted["title"],
+        "inputs": extracted["inputs"],
+        "buttons": extracted["buttons"],
+        "links": extracted["links"],
+    }
+
+
+async def inspect_page_structure_async(url: str, pool: "BrowserPool") -> Dict[str, Any]:
+    """
+    Same summary as inspect_page_structure, using a context borrowed from a
+    long-lived BrowserPool instead of launching a browser per call.
+    """
+    async with pool.context() as context:
+        page = await context.new_page()
+        await page.goto(url, wait_until="networkidle")
+        summary = await extract_page_summary_async(page)
+
+    summary["url"] = url
+    return summary
 
 
 def inspect_page_structure(url: str) -> Dict[str, Any]:
     """
     Use Playwright to open the given URL and extract a compact summary of the UI:
     - title
-    - forms
     - inputs (with data-testid/name/placeholder/label)
     - buttons (with text + testid)
+    - links (first MAX_LINKS, with text + href + testid)
     """
-    summary: Dict[str, Any] = {
-        "url": url,
-        "title": "",
-        "inputs": [],
-        "buttons": [],
-        "links": [],
-    }
-
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(url, wait_until="networkidle")
-
-        summary["title"] = page.title()
-
-        # Inputs
-        input_locators = page.locator("input, textarea, select")
-        for i in range(input_locators.count()):
-            el = input_locators.nth(i)
-            input_info = {
-                "tag": el.evaluate("e => e.tagName.toLowerCase()"),
-                "type": el.get_attribute("type") or "",
-                "name": el.get_attribute("name") or "",
-                "placeholder": el.get_attribute("placeholder") or "",
-                "data_testid": el.get_attribute("data-testid") or "",
-                "label": "",
-            }
-
-            # Try to find label text
-            label = el.evaluate(
-                """(e) => {
-                    const id = e.id;
-                    if (id) {
-                        const lab = document.querySelector(`label[for="${id}"]`);
-                        if (lab) return lab.innerText.trim();
-                    }
-                    const parentLabel = e.closest('label');
-                    if (parentLabel) return parentLabel.innerText.trim();
-                    return "";
-                }"""
-            )
-            input_info["label"] = label or ""
-            summary["inputs"].append(input_info)
-
-        # Buttons
-        button_locators = page.locator("button, [role=button], input[type=submit]")
-        for i in range(button_locators.count()):
-            el = button_locators.nth(i)
-            btn_text = el.inner_text().strip()
-            summary["buttons"].append(
-                {
-                    "tag": el.evaluate("e => e.tagName.toLowerCase()"),
-                    "text": btn_text,
-                    "data_testid": el.get_attribute("data-testid") or "",
-                }
-            )
-
-        # Links
-        link_locators = page.locator("a[href]")
-        for i in range(min(link_locators.count(), 30)):  # cap
-            el = link_locators.nth(i)
-            summary["links"].append(
-                {
-                    "text": el.inner_text().strip(),
-                    "href": el.get_attribute("href") or "",
-                    "data_testid": el.get_attribute("data-testid") or "",
-                }
-            )
-
-        browser.close()
+        try:
+            page = browser.new_page()
+            page.goto(url, wait_until="networkidle")
+            summary = extract_page_summary(page)
+        finally:
+            browser.close()
 
+    # Keep the URL that was asked for, not a post-redirect one.
+    summary["url"] = url
     return summary
 
 
@@ -108,6 +143,8 @@ def generate_ui_tests_code(page_summary: Dict[str, Any]) -> str:
         Requirements:
         - Use Python Playwright sync API with pytest.
         - Assume there is a `page` fixture (from Playwright pytest plugin).
+        - Flows that need a logged-in user (other than testing login/registration itself) should
+          use the `authenticated_page` fixture instead: a page that is already logged in.
         - Write multiple tests, focusing on realistic user flows.
         - Use selectors that are robust: prefer `data-testid` if available, otherwise text-based selectors.
         - Include at least:
@@ -123,30 +160,119 @@ def generate_ui_tests_code(page_summary: Dict[str, Any]) -> str:
     )
 
     response = model.generate_content(prompt)
-    raw = response.text.strip()
+    return strip_code_fences(response.text)
+
 
-    # If the model accidentally adds ```python fences, strip them.
-    if "```" in raw:
-        # try to extract between first ``` and last ```
-        parts = raw.split("```")
-        if len(parts) >= 3:
-            # something like: ['', 'python', 'code...', '']
-            raw = parts[2].strip()
+def generate_ui_tests_code_for_pages(area: str, page_summaries: List[Dict[str, Any]]) -> str:
+    """
+    One Gemini call producing a single test module for a group of related
+    pages (e.g. everything under /projects), instead of one call per page.
+    """
+    model = get_gemini_model()
 
+    pages = "\n\n".join(
+        f"Page {i + 1}: {summary.get('url', '')}\n{summary}" for i, summary in enumerate(page_summaries)
+    )
+    prompt = textwrap.dedent(
+        f"""
+        You are an expert SDET and Playwright test engineer.
+        I will give you JSON descriptions of {len(page_summaries)} related pages of one web app
+        (the "{area}" area: inputs, buttons, links, etc.) and you will generate ONE
+        **Python Playwright + pytest** test module covering all of them.
+
+        Requirements:
+        - Use Python Playwright sync API with pytest.
+        - Assume there is a `page` fixture (from Playwright pytest plugin).
+        - Flows that need a logged-in user (other than testing login/registration itself) should
+          use the `authenticated_page` fixture instead: a page that is already logged in.
+        - Navigate with the full page URLs given below.
+        - Use selectors that are robust: prefer `data-testid` if available, otherwise text-based selectors.
+        - For each page include a basic "page loads" smoke test, and add happy-path and
+          negative tests for its forms; add cross-page navigation tests where links connect them.
+        - Use clear, unique test names like `test_projects_create_valid` etc.
+        - Only output pure Python code that can be saved to a `.py` file. No markdown or explanations.
+        """
+    ) + f"\nHere are the page summaries:\n\n{pages}\n"
+
+    response = model.generate_content(prompt)
+    return strip_code_fences(response.text)
+
+
+def strip_code_fences(raw: str) -> str:
+    """
+    Return the code inside the first ``` fenced block, if the model added one.
+    """
+    raw = raw.strip()
+    parts = raw.split("```")
+    if len(parts) >= 3:
+        # ['', 'python\ncode...', ''] -> drop the language tag line
+        block = parts[1]
+        first_line, _, rest = block.partition("\n")
+        if first_line.strip() and " " not in first_line.strip():
+            block = rest
+        raw = block.strip()
     return raw
 
 
+def ui_test_path(
+    url: str,
+    output_dir: str = "tests/ui/generated",
+    filename_prefix: str = "test_ai_ui_",
+) -> str:
+    """
+    Path of the generated test module for a URL.
+    """
+    safe_slug = (
+        url.replace("http://", "")
+        .replace("https://", "")
+        .replace("/", "_")
+        .replace(":", "_")
+    )
+    return os.path.join(output_dir, f"{filename_prefix}{safe_slug}.py")
+
+
+def save_ui_tests(
+    url: str,
+    code: str,
+    output_dir: str = "tests/ui/generated",
+    filename_prefix: str = "test_ai_ui_",
+) -> str:
+    """
+    Write generated test code to output_dir under a file name derived from
+    the URL, and return the path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    saved_path = ui_test_path(url, output_dir, filename_prefix)
+    with open(saved_path, "w", encoding="utf-8") as f:
+        f.write(code)
+    return saved_path
+
+
+def load_unchanged_module(module_path: str, comparison: Dict[str, Any], force: bool = False) -> Optional[str]:
+    """
+    Code of the existing module if its stored fingerprint still matches
+    (and force is not set), else None, meaning it must be regenerated.
+    """
+    if force or not comparison["unchanged"]:
+        return None
+    with open(module_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 def generate_and_optionally_save_ui_tests(
     url: str,
     output_dir: str = "tests/ui/generated",
     save: bool = True,
     filename_prefix: str = "test_ai_ui_",
+    force: bool = False,
 ) -> Dict[str, Any]:
     """
-    High-level function used by API and CLI:
+    High-level function used by the CLI (the API uses the async variant):
     - Inspect the page with Playwright
-    - Ask Gemini to generate pytest+Playwright tests
-    - Optionally save a .py file under tests/ui/generated
+    - Ask Gemini to generate pytest+Playwright tests, unless the saved
+      module's fingerprint shows the page has not changed (force=True
+      regenerates anyway)
+    - Optionally save a .py file (plus fingerprint sidecar) under tests/ui/generated
 
     Returns:
         dict with fields:
@@ -155,23 +281,38 @@ def generate_and_optionally_save_ui_tests(
         - code
         - saved (bool)
         - saved_path (str or None)
+        - regenerated (bool): False if the existing module was reused
+        - changed_pages: URLs whose fingerprint changed (or are new)
     """
     page_summary = inspect_page_structure(url)
-    code = generate_ui_tests_code(page_summary)
+    module_path = ui_test_path(url, output_dir, filename_prefix)
+    comparison = compare_fingerprints(module_path, [page_summary])
+
+    code = load_unchanged_module(module_path, comparison, force) if save else None
+    regenerated = code is None
+    if regenerated:
+        code = generate_ui_tests_code(page_summary)
 
+    return _finish_ui_generation(url, page_summary, code, save, regenerated, comparison, output_dir, filename_prefix)
+
+
+def _finish_ui_generation(
+    url: str,
+    page_summary: Dict[str, Any],
+    code: str,
+    save: bool,
+    regenerated: bool,
+    comparison: Dict[str, Any],
+    output_dir: str,
+    filename_prefix: str,
+) -> Dict[str, Any]:
     saved_path = None
     if save:
-        os.makedirs(output_dir, exist_ok=True)
-        safe_slug = (
-            url.replace("http://", "")
-            .replace("https://", "")
-            .replace("/", "_")
-            .replace(":", "_")
-        )
-        filename = f"{filename_prefix}{safe_slug}.py"
-        saved_path = os.path.join(output_dir, filename)
-        with open(saved_path, "w", encoding="utf-8") as f:
-            f.write(code)
+        saved_path = ui_test_path(url, output_dir, filename_prefix)
+        if regenerated:
+            save_ui_tests(url, code, output_dir, filename_prefix)
+            save_fingerprint(saved_path, comparison)
+        print(f"[UI_GENERATOR] {url}: {'regenerated' if regenerated else 'unchanged, reused'} {saved_path}")
 
     return {
         "url": url,
@@ -179,9 +320,36 @@ def generate_and_optionally_save_ui_tests(
         "code": code,
         "saved": bool(save),
         "saved_path": saved_path,
+        "regenerated": regenerated,
+        "changed_pages": comparison["changed_pages"],
     }
 
 
+async def generate_and_optionally_save_ui_tests_async(
+    url: str,
+    pool: "BrowserPool",
+    output_dir: str = "tests/ui/generated",
+    save: bool = True,
+    filename_prefix: str = "test_ai_ui_",
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_and_optionally_save_ui_tests for the API:
+    inspects through the shared browser pool and runs the blocking Gemini
+    call in a worker thread. Returns the same fields.
+    """
+    page_summary = await inspect_page_structure_async(url, pool)
+    module_path = ui_test_path(url, output_dir, filename_prefix)
+    comparison = compare_fingerprints(module_path, [page_summary])
+
+    code = load_unchanged_module(module_path, comparison, force) if save else None
+    regenerated = code is None
+    if regenerated:
+        code = await asyncio.to_thread(generate_ui_tests_code, page_summary)
+
+    return _finish_ui_generation(url, page_summary, code, save, regenerated, comparison, output_dir, filename_prefix)
+
+
 if __name__ == "__main__":
     # CLI usage example:
     result = generate_and_optionally_save_ui_tests("http://127.0.0.1:5173", save=False)
@@ -0,0 +1,232 @@
+"""
+Parallel runner for the generated UI test modules (tests/ui/generated/).
+
+Every module is one shard, run by its own `pytest` process, so a hung
+selector or a crashed browser only takes down that shard. At most
+`max_workers` shards run at once. Each one has a hard timeout, after which
+its whole process group (pytest plus the browser it launched) is killed.
+pytest-playwright already gives every test a fresh browser context.
+
+Per-test outcomes and durations come from each shard's JUnit report. They
+are stored through ingest_junit_reports as one TestRun(run_type="ui"). A
+shard that timed out or produced no report is recorded as a single
+"error" test.
+"""
+import argparse
+import asyncio
+import glob
+import os
+import signal
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy.orm import Session
+
+from ai_tools.junit_ingest import ingest_junit_reports
+from backend.db.session import Base, SessionLocal, engine
+from backend.models.test_run import TestRun
+
+DEFAULT_GENERATED_DIR = "tests/ui/generated"
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_SHARD_TIMEOUT = 300.0
+OUTPUT_TAIL_CHARS = 4000
+
+
+def discover_generated_modules(generated_dir: str = DEFAULT_GENERATED_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(generated_dir, "test_*.py")))
+
+
+def _kill_process_tree(proc: asyncio.subprocess.Process) -> None:
+    try:
+        if os.name == "posix":
+            # start_new_session=True made the shard its own process group.
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _error_report(module: str, message: str, output: str, duration: float) -> bytes:
+    """
+    Minimal JUnit report for a shard that did not produce one.
+    """
+    classname = os.path.splitext(module.replace(os.sep, "."))[0]
+    return (
+        f'<testsuite name="pytest" errors="1" tests="1">'
+        f'<testcase classname={quoteattr(classname)} name="shard" time="{duration:.3f}">'
+        f"<error message={quoteattr(message)}>{escape(output)}</error>"
+        f"</testcase></testsuite>"
+    ).encode("utf-8")
+
+
+async def run_shard(
+    module: str,
+    report_dir: str,
+    timeout: float,
+    pytest_args: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run one module under pytest with a hard timeout.
+
+    Returns:
+        dict with fields:
+        - module, report_path
+        - status: "passed" | "failed" | "timeout" | "error"
+        - returncode (None on timeout), duration_s
+    """
+    report_path = os.path.join(report_dir, os.path.basename(module) + ".xml")
+    cmd = [
+        sys.executable, "-m", "pytest", module,
+        "-q", "-p", "no:cacheprovider",
+        f"--junitxml={report_path}",
+        *(pytest_args or []),
+    ]
+
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        returncode: Optional[int] = proc.returncode
+    except asyncio.TimeoutError:
+        _kill_process_tree(proc)
+        stdout, _ = await proc.communicate()
+        returncode = None
+    except asyncio.CancelledError:
+        _kill_process_tree(proc)
+        raise
+    duration = time.perf_counter() - start
+    output = (stdout or b"").decode("utf-8", "replace")[-OUTPUT_TAIL_CHARS:]
+
+    if returncode is None:
+        status = "timeout"
+        with open(report_path, "wb") as f:
+            f.write(_error_report(module, f"Shard timed out after {timeout:g}s", output, duration))
+    elif not os.path.exists(report_path):
+        status = "error"
+        with open(report_path, "wb") as f:
+            f.write(_error_report(module, f"pytest exited with {returncode} and wrote no report", output, duration))
+    else:
+        # 0 = all passed, 5 = nothing collected; anything else means failures or errors.
+        status = "passed" if returncode in (0, 5) else "failed"
+
+    print(f"[UI RUNNER] {module}: {status} in {duration:.1f}s")
+    return {
+        "module": module,
+        "report_path": report_path,
+        "status": status,
+        "returncode": returncode,
+        "duration_s": round(duration, 3),
+    }
+
+
+async def run_ui_shards(
+    modules: List[str],
+    report_dir: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    shard_timeout: float = DEFAULT_SHARD_TIMEOUT,
+    pytest_args: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Run all modules, at most max_workers at a time. Returns the shard
+    results (in module order) and the wall time in seconds.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def bounded(module: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_shard(module, report_dir, shard_timeout, pytest_args)
+
+    start = time.perf_counter()
+    shards = await asyncio.gather(*(bounded(m) for m in modules))
+    return list(shards), time.perf_counter() - start
+
+
+async def run_generated_ui_tests_async(
+    db: Session,
+    modules: Optional[List[str]] = None,
+    generated_dir: str = DEFAULT_GENERATED_DIR,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    shard_timeout: float = DEFAULT_SHARD_TIMEOUT,
+    pytest_args: Optional[List[str]] = None,
+) -> TestRun:
+    """
+    Run the generated UI modules (all of generated_dir by default) as
+    parallel shards and store the outcome as a TestRun(run_type="ui") with
+    per-test rows in test_results. The run summary adds per-shard status
+    and duration, wall_time_s and the settings used.
+    """
+    modules = modules if modules is not None else discover_generated_modules(generated_dir)
+    if not modules:
+        raise ValueError(f"No generated UI test modules found in {generated_dir}")
+
+    with tempfile.TemporaryDirectory(prefix="testhub-ui-run-") as report_dir:
+        shards, wall_time = await run_ui_shards(modules, report_dir, max_workers, shard_timeout, pytest_args)
+        print(f"[UI RUNNER] {len(shards)} shard(s) finished in {wall_time:.1f}s")
+
+        summary_extra = {
+            "wall_time_s": round(wall_time, 3),
+            "max_workers": max_workers,
+            "shard_timeout_s": shard_timeout,
+            "shard_runs": [
+                {k: shard[k] for k in ("module", "status", "returncode", "duration_s")} for shard in shards
+            ],
+        }
+        reports = [(os.path.basename(shard["module"]), open(shard["report_path"], "rb")) for shard in shards]
+        try:
+            return await asyncio.to_thread(
+                ingest_junit_reports, db, reports, run_type="ui", summary_extra=summary_extra
+            )
+        finally:
+            for _, fileobj in reports:
+                fileobj.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run generated UI test modules in parallel shards and store the results as a TestRun."
+    )
+    parser.add_argument("modules", nargs="*", help="Modules to run (default: all in --generated-dir)")
+    parser.add_argument("--generated-dir", default=DEFAULT_GENERATED_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Shards running at once")
+    parser.add_argument(
+        "--shard-timeout",
+        type=float,
+        default=DEFAULT_SHARD_TIMEOUT,
+        help="Seconds before a shard (and its browser) is killed",
+    )
+    args, pytest_args = parser.parse_known_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        test_run = asyncio.run(
+            run_generated_ui_tests_async(
+                db,
+                modules=args.modules or None,
+                generated_dir=args.generated_dir,
+                max_workers=args.workers,
+                shard_timeout=args.shard_timeout,
+                pytest_args=pytest_args,
+            )
+        )
+        summary = test_run.summary
+        print(
+            f"[UI RUNNER] TestRun #{test_run.id}: {summary['passed']}/{summary['total']} passed, "
+            f"{summary['failed']} failed, {summary['errors']} error(s), wall {summary['wall_time_s']}s"
+        )
+        sys.exit(0 if test_run.status == "passed" else 1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
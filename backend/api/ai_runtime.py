@@ -0,0 +1,171 @@
+"""
+Execution policy for AI routes (/ai/*, /ai/ui/*, /ai/dashboard/*).
+
+- AI work runs under its own concurrency limit (AI_MAX_CONCURRENCY) and,
+  when blocking, on a dedicated thread pool, so slow LLM calls can never
+  use up the threadpool that serves /projects, /bugs and other CRUD routes.
+- Every call has a deadline (AI_CALL_TIMEOUT / AI_RUN_TIMEOUT, or the
+  route's `timeout` parameter); when it passes the route answers 504.
+- If the client disconnects, the work is cancelled.
+
+Async work is cancelled outright. Blocking work gets a CallScope (see
+ai_tools.gemini_client) that stops Gemini retries/waits and bounds the SDK
+request timeout, since a running thread cannot be interrupted. Such a
+thread may outlive its request: it keeps its concurrency slot until it
+finishes, and blocking DB work gets its own session (run_ai_db_sync) rather
+than the request's, which get_db closes.
+"""
+import asyncio
+import contextvars
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+
+from ai_tools.gemini_client import CallScope, current_call_scope
+from backend.core.config import get_settings
+from backend.db.session import SessionLocal
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+DISCONNECT_POLL_INTERVAL = 0.5
+CLIENT_CLOSED_REQUEST = 499  # nginx convention; the client never sees it
+
+_executor = ThreadPoolExecutor(max_workers=settings.AI_MAX_CONCURRENCY, thread_name_prefix="ai-worker")
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _ai_semaphore() -> asyncio.Semaphore:
+    # One per event loop: asyncio primitives are bound to the loop they wait on.
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+async def _run_scoped(
+    request: Request,
+    make_coro: Callable[[], Awaitable[T]],
+    timeout: float,
+) -> T:
+    """
+    Await make_coro() with a CallScope, bounded by `timeout` seconds and
+    cancelled if the client disconnects first.
+    """
+    scope = CallScope(deadline=time.monotonic() + timeout)
+
+    # The task copies the current context, so the scope reaches every
+    # Gemini call made by the work, including from asyncio.to_thread.
+    token = current_call_scope.set(scope)
+    try:
+        work = asyncio.ensure_future(make_coro())
+    finally:
+        current_call_scope.reset(token)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+
+    try:
+        done, _ = await asyncio.wait({work, watcher}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not work.done():
+            scope.cancel()
+            work.cancel()
+
+    if work in done:
+        return work.result()
+    if watcher in done:
+        print(f"[AI] Client disconnected, cancelled {request.method} {request.url.path}")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+    print(f"[AI] Deadline of {timeout:g}s exceeded, cancelled {request.method} {request.url.path}")
+    raise HTTPException(status_code=504, detail=f"AI call exceeded its {timeout:g}s deadline")
+
+
+async def run_ai_task(
+    request: Request,
+    make_coro: Callable[[], Awaitable[T]],
+    timeout: Optional[float] = None,
+) -> T:
+    """
+    Await make_coro() under the AI concurrency limit, bounded by `timeout`
+    seconds (default AI_CALL_TIMEOUT; time spent queued counts too) and
+    cancelled if the client disconnects first.
+    """
+
+    async def limited() -> T:
+        async with _ai_semaphore():
+            return await make_coro()
+
+    return await _run_scoped(request, limited, settings.AI_CALL_TIMEOUT if timeout is None else timeout)
+
+
+async def run_ai_sync(
+    request: Request,
+    func: Callable[..., T],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    run_ai_task for a blocking function, executed on the AI thread pool.
+    Its concurrency slot is held until the thread is done, even if the
+    request gave up on it earlier, so a slot always means a free thread.
+    """
+
+    async def call() -> T:
+        semaphore = _ai_semaphore()
+        await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        future = _executor.submit(ctx.run, func, *args, **kwargs)
+        future.add_done_callback(lambda _: _release_from_thread(loop, semaphore))
+        return await asyncio.wrap_future(future)
+
+    return await _run_scoped(request, call, settings.AI_CALL_TIMEOUT if timeout is None else timeout)
+
+
+def _release_from_thread(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:  # loop already closed; its semaphore went with it
+        pass
+
+
+def app_session_factory(request: Request) -> Callable[[], Session]:
+    """
+    Session factory of the app serving the request: its own for in-process
+    apps (app.state.session_factory), SessionLocal otherwise.
+    """
+    return getattr(request.app.state, "session_factory", SessionLocal)
+
+
+async def run_ai_db_sync(
+    request: Request,
+    func: Callable[..., T],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    run_ai_sync for a blocking function taking a DB session first:
+    func(db, *args, **kwargs). The session is opened and closed inside the
+    worker thread, from the app's session_factory (in-process apps) or
+    SessionLocal.
+    """
+    session_factory = app_session_factory(request)
+
+    def with_session() -> T:
+        with session_factory() as db:
+            return func(db, *args, **kwargs)
+
+    return await run_ai_sync(request, with_session, timeout=timeout)
@@ -1,6 +1,6 @@
 from typing import Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -9,6 +9,7 @@ from backend.db.session import SessionLocal
 from backend.core.config import get_settings
 from backend.schemas.auth import TokenData
 from backend.crud.user import get_user
+from ai_tools.gemini_client import AICallCancelled, GeminiRateLimitError
 
 settings = get_settings()
 
@@ -60,3 +61,34 @@ def get_current_active_user(
             detail="Inactive user",
         )
     return current_user
+
+
+def get_browser_pool(request: Request):
+    """
+    Shared Playwright BrowserPool created in the app lifespan.
+    """
+    pool = getattr(request.app.state, "browser_pool", None)
+    if pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Browser pool is not running (app started without lifespan)",
+        )
+    return pool
+
+
+def ai_http_error(e: Exception) -> HTTPException:
+    """
+    HTTPException for a failed AI route: 429 with Retry-After when Gemini
+    stayed rate limited, 504 when the call ran out of time, 500 otherwise.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, AICallCancelled):
+        return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    if isinstance(e, GeminiRateLimitError):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) or 1)},
+        )
+    return HTTPException(status_code=500, detail=str(e))
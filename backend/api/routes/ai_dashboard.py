@@ -1,59 +1,205 @@
+import gzip
+import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from backend.api.ai_runtime import app_session_factory, run_ai_db_sync, run_ai_task
+from backend.api.deps import ai_http_error
+from backend.core.config import get_settings
 from backend.db.session import get_db
 from backend.schemas.test_run import TestRun as TestRunSchema
+from backend.schemas.test_corpus import CorpusEntry, CorpusPruneResult
+from backend.schemas.test_result import TestResult as TestResultSchema, TestRunDiff
+from backend.schemas.test_duration import DurationRegression, TestDurationHistory
+from backend.schemas.test_flakiness import TestFlakiness as TestFlakinessSchema
+from backend.schemas.test_run_archive import CompactionResult, TestRunArchive as TestRunArchiveSchema
 from backend.crud.test_run import (
     create_test_run,
     finish_test_run,
+    get_test_run,
     list_test_runs,
 )
-from ai_tools.test_generator import generate_test_cases_from_openapi
-from ai_tools.ai_test_executor import execute_ai_tests
-from ai_tools.failure_analyzer import analyze_failures_api
+from backend.crud.test_result import has_test_results, list_test_results
+from backend.crud.test_corpus import delete_corpus_entries, list_corpus
+from backend.crud.test_duration import get_baseline, list_duration_history
+from backend.crud.test_flakiness import list_flaky_tests
+from backend.crud.test_run_archive import get_archive
+from ai_tools.openapi_utils import iter_operations, operation_schema_hash
+from ai_tools.test_corpus import load_or_generate_test_cases
+from ai_tools.ai_test_executor import (
+    execute_ai_tests_async,
+    execute_load_test_async,
+    record_executor_run_results,
+)
+from ai_tools.failure_analyzer import analyze_failures_api, analyze_test_run_failures
+from ai_tools.junit_ingest import RUN_TYPES, ingest_junit_reports
+from ai_tools.duration_history import (
+    DEFAULT_MIN_DELTA,
+    DEFAULT_THRESHOLD,
+    duration_regressions,
+    record_executor_run_durations,
+)
+from ai_tools.flaky_tests import FLAKY_MIN_RUNS, record_executor_run_outcomes
+from ai_tools.run_diff import DEFAULT_DIFF_LIMIT, DEFAULT_MIN_LATENCY_DELTA, diff_test_runs
+from ai_tools.run_retention import compact_test_runs, rehydrate_test_run
 
 router = APIRouter(prefix="/ai/dashboard", tags=["ai-dashboard"])
 
+settings = get_settings()
+
+
+def timeout_query(default_setting: str):
+    return Query(
+        None,
+        gt=0,
+        le=3600,
+        description=f"Deadline in seconds (default {default_setting})",
+    )
+
+
 @router.get("/generated-tests")
-def get_generated_tests(
+async def get_generated_tests(
+    request: Request,
     max_endpoints: int = Query(10, ge=1, le=50),
+    refresh: bool = Query(False),
+    timeout: Optional[float] = timeout_query("AI_CALL_TIMEOUT"),
 ) -> Any:
+    """
+    Test cases from the stored corpus; Gemini is only called for endpoints
+    whose schema changed since they were generated (or all, with refresh=true).
+    """
     try:
-        cases = generate_test_cases_from_openapi(
-            base_url="http://127.0.0.1:8000",
+        data = await run_ai_db_sync(
+            request,
+            load_or_generate_test_cases,
+            request.app.openapi(),
             max_endpoints=max_endpoints,
+            refresh=refresh,
+            timeout=timeout,
         )
-        return {"count": len(cases), "items": cases}
+        cases = data["cases"]
+        return {
+            "count": len(cases),
+            "items": cases,
+            "reused": data["reused"],
+            "regenerated": data["regenerated"],
+        }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise ai_http_error(e)
+
+
+@router.get("/corpus", response_model=List[CorpusEntry])
+def get_corpus(
+    endpoint_prefix: Optional[str] = Query(None, description='e.g. "GET /projects"'),
+    include_cases: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    """
+    List stored AI-generated test cases, one entry per endpoint.
+    """
+    return [
+        CorpusEntry(
+            id=row.id,
+            endpoint=row.endpoint,
+            schema_hash=row.schema_hash,
+            case_count=len(row.cases or []),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            last_used_at=row.last_used_at,
+            cases=row.cases if include_cases else None,
+        )
+        for row in list_corpus(db, endpoint_prefix=endpoint_prefix)
+    ]
+
+
+@router.delete("/corpus", response_model=CorpusPruneResult)
+def prune_corpus(
+    request: Request,
+    endpoint: Optional[str] = Query(None, description='Exact key, e.g. "POST /projects/"'),
+    stale: bool = Query(False, description="Entries whose endpoint is gone or whose schema changed"),
+    unused_days: Optional[int] = Query(None, ge=0, description="Entries not used for this many days"),
+    db: Session = Depends(get_db),
+):
+    """
+    Delete corpus entries matching any of the given criteria.
+    At least one criterion is required.
+    """
+    if endpoint is None and not stale and unused_days is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Specify endpoint, stale=true and/or unused_days",
+        )
+
+    current_hashes: Dict[str, str] = {}
+    if stale:
+        schema = request.app.openapi()
+        current_hashes = {
+            op["key"]: operation_schema_hash(schema, op["path"], op["method"], op["operation"])
+            for op in iter_operations(schema.get("paths", {}))
+        }
+    cutoff = datetime.utcnow() - timedelta(days=unused_days) if unused_days is not None else None
+
+    doomed = []
+    for row in list_corpus(db):
+        if endpoint is not None and row.endpoint == endpoint:
+            doomed.append(row)
+        elif stale and current_hashes.get(row.endpoint) != row.schema_hash:
+            doomed.append(row)
+        elif cutoff is not None and (row.last_used_at or row.updated_at) < cutoff:
+            doomed.append(row)
+
+    deleted = delete_corpus_entries(db, [row.id for row in doomed])
+    return CorpusPruneResult(deleted=deleted, endpoints=[row.endpoint for row in doomed])
 
 
 @router.post("/execute-tests")
-def execute_tests(
+async def execute_tests(
+    request: Request,
     max_endpoints: int = Query(10, ge=1, le=50),
+    inprocess: bool = Query(False),
+    refresh_corpus: bool = Query(False),
+    timeout: Optional[float] = timeout_query("AI_RUN_TIMEOUT"),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     """
     Run AI-executed tests, persist the run in DB, and return summary + results.
+    With inprocess=true the tests hit a separate in-process app instance with a
+    throwaway database, so they never touch this server's data.
+    The run is cancelled (and stored as "error") on timeout or client disconnect.
     """
     # create DB record (status = running)
-    test_run = create_test_run(db, run_type="ai_executor", status="running")
+    test_run = await run_in_threadpool(create_test_run, db, run_type="ai_executor", status="running")
 
     try:
-        data = execute_ai_tests(
-            base_url="http://127.0.0.1:8000",
-            max_endpoints=max_endpoints,
-            use_auth=True,
-            config_path="tests/api/config/config.yaml",
+        data = await run_ai_task(
+            request,
+            lambda: execute_ai_tests_async(
+                base_url="http://127.0.0.1:8000",
+                max_endpoints=max_endpoints,
+                use_auth=True,
+                config_path="tests/api/config/config.yaml",
+                inprocess=inprocess,
+                refresh_corpus=refresh_corpus,
+                corpus_session_factory=app_session_factory(request),
+            ),
+            timeout=timeout or settings.AI_RUN_TIMEOUT,
         )
 
         summary = data.get("summary", {})
         results = data.get("results", [])
 
         status = "passed" if summary.get("failed", 0) == 0 else "failed"
-        test_run = finish_test_run(db, test_run, status=status, summary=summary, results=results)
+        # Per-test data is stored once, as test_results rows (listed, diffed
+        # and archived from there); TestRun.results is left empty.
+        await run_in_threadpool(record_executor_run_results, db, test_run.id, results)
+        test_run = await run_in_threadpool(finish_test_run, db, test_run, status=status, summary=summary)
+        await run_in_threadpool(record_executor_run_durations, db, test_run.id, results)
+        await run_in_threadpool(record_executor_run_outcomes, db, test_run.id, results)
 
         return {
             "test_run_id": test_run.id,
@@ -63,14 +209,79 @@ def execute_tests(
 
     except Exception as e:
         # mark run as error
-        finish_test_run(
+        await run_in_threadpool(
+            finish_test_run,
             db,
             test_run,
             status="error",
-            summary={"error": str(e)},
+            summary={"error": getattr(e, "detail", None) or str(e)},
             results=[],
         )
-        raise HTTPException(status_code=500, detail=str(e))
+        raise ai_http_error(e)
+
+
+@router.post("/load-test")
+async def run_load_test(
+    request: Request,
+    rps: float = Query(20.0, gt=0, le=1000),
+    duration: float = Query(10.0, gt=0, le=600),
+    max_endpoints: int = Query(10, ge=1, le=50),
+    workers: int = Query(64, ge=1, le=512),
+    max_error_rate: float = Query(0.01, ge=0, le=1),
+    inprocess: bool = Query(False),
+    timeout: Optional[float] = timeout_query("AI_RUN_TIMEOUT"),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Replay AI-generated test cases at a fixed arrival rate (open-loop) and
+    persist the throughput / error-rate / latency histogram as a "load" run.
+    """
+    test_run = await run_in_threadpool(create_test_run, db, run_type="load", status="running")
+
+    try:
+        data = await run_ai_task(
+            request,
+            lambda: execute_load_test_async(
+                base_url="http://127.0.0.1:8000",
+                rps=rps,
+                duration=duration,
+                max_endpoints=max_endpoints,
+                use_auth=True,
+                config_path="tests/api/config/config.yaml",
+                workers=workers,
+                max_error_rate=max_error_rate,
+                inprocess=inprocess,
+                corpus_session_factory=app_session_factory(request),
+            ),
+            timeout=timeout or settings.AI_RUN_TIMEOUT,
+        )
+
+        test_run = await run_in_threadpool(
+            finish_test_run,
+            db,
+            test_run,
+            status=data["status"],
+            summary=data["summary"],
+            results=data["results"],
+        )
+
+        return {
+            "test_run_id": test_run.id,
+            "status": data["status"],
+            "summary": data["summary"],
+            "results": data["results"],
+        }
+
+    except Exception as e:
+        await run_in_threadpool(
+            finish_test_run,
+            db,
+            test_run,
+            status="error",
+            summary={"error": getattr(e, "detail", None) or str(e)},
+            results=[],
+        )
+        raise ai_http_error(e)
 
 
 @router.get("/test-runs", response_model=List[TestRunSchema])
@@ -86,15 +297,234 @@ def get_test_runs(
     return runs
 
 
+@router.post("/test-runs/upload", response_model=TestRunSchema, status_code=201)
+async def upload_junit_reports(
+    request: Request,
+    files: List[UploadFile] = File(..., description="JUnit XML reports, plain or .gz (one per shard)"),
+    run_type: str = Form("api"),
+    timeout: Optional[float] = timeout_query("AI_RUN_TIMEOUT"),
+):
+    """
+    Ingest one or more JUnit reports into a single TestRun. Reports are
+    stream-parsed and per-test outcomes/durations stored in test_results.
+    """
+    if run_type not in RUN_TYPES:
+        raise HTTPException(status_code=400, detail=f"run_type must be one of {list(RUN_TYPES)}")
+
+    try:
+        return await run_ai_db_sync(
+            request,
+            ingest_junit_reports,
+            [(f.filename or f"report-{i}.xml", f.file) for i, f in enumerate(files)],
+            run_type=run_type,
+            timeout=timeout or settings.AI_RUN_TIMEOUT,
+        )
+    except (ET.ParseError, ValueError, gzip.BadGzipFile, EOFError) as e:
+        # Malformed, truncated or mis-compressed reports. Deadlines and DB
+        # errors are not the client's fault and go through ai_http_error.
+        raise HTTPException(status_code=400, detail=f"Could not ingest JUnit reports: {e}")
+    except Exception as e:
+        raise ai_http_error(e)
+
+
+def _get_test_run_or_404(db: Session, test_run_id: int):
+    test_run = get_test_run(db, test_run_id)
+    if test_run is None:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    return test_run
+
+
+def _get_raw_test_run_or_409(db: Session, test_run_id: int):
+    """
+    Like _get_test_run_or_404, for endpoints that read per-test results:
+    a compacted run has to be rehydrated first (409), and one whose
+    archive expired has none left (410).
+    """
+    test_run = _get_test_run_or_404(db, test_run_id)
+    archive = get_archive(db, test_run_id)
+    if archive is not None and archive.status == "expired":
+        raise HTTPException(
+            status_code=410,
+            detail=f"Archive of test run #{test_run_id} has expired; only the run summary is kept",
+        )
+    if archive is not None and archive.status != "rehydrated":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Test run #{test_run_id} is {archive.status}; "
+            f"POST /ai/dashboard/test-runs/{test_run_id}/rehydrate to restore its results",
+        )
+    return test_run
+
+
+@router.get("/test-runs/{test_run_id}/results", response_model=List[TestResultSchema])
+def get_test_run_results(
+    test_run_id: int,
+    outcome: Optional[List[str]] = Query(None, description="e.g. failed, error"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    Per-test results of an ingested run.
+    """
+    _get_raw_test_run_or_409(db, test_run_id)
+    return list_test_results(db, test_run_id, outcome=outcome, skip=skip, limit=limit)
+
+
+@router.get("/test-runs/{base_run_id}/diff/{head_run_id}", response_model=TestRunDiff)
+def get_test_run_diff(
+    base_run_id: int,
+    head_run_id: int,
+    limit: int = Query(DEFAULT_DIFF_LIMIT, ge=1, le=10000, description="Max entries per list; counts are exact"),
+    min_latency_delta: float = Query(DEFAULT_MIN_LATENCY_DELTA, ge=0, description="Seconds"),
+    db: Session = Depends(get_db),
+):
+    """
+    What changed from run {base_run_id} to run {head_run_id}: newly failing
+    and newly passing tests, added and removed tests, and the largest
+    latency changes of tests that passed in both.
+    """
+    for test_run_id in (base_run_id, head_run_id):
+        _get_raw_test_run_or_409(db, test_run_id)
+        if not has_test_results(db, test_run_id):
+            raise HTTPException(
+                status_code=422,
+                detail=f"Test run #{test_run_id} has no per-test results to compare "
+                "(load runs and runs stored before per-test rows were recorded)",
+            )
+    return diff_test_runs(db, base_run_id, head_run_id, limit=limit, min_latency_delta=min_latency_delta)
+
+
+@router.get("/test-runs/{test_run_id}/analyze-failures")
+async def analyze_test_run(
+    request: Request,
+    test_run_id: int,
+    refresh: bool = Query(False, description="Ignore cached per-cluster analyses"),
+    timeout: Optional[float] = timeout_query("AI_CALL_TIMEOUT"),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Cluster and analyze the failures of an ingested run (all shards merged).
+    """
+    test_run = await run_in_threadpool(_get_raw_test_run_or_409, db, test_run_id)
+    try:
+        data = await run_ai_db_sync(
+            request, analyze_test_run_failures, test_run_id, refresh=refresh, timeout=timeout
+        )
+        data["stats"] = test_run.summary
+        return data
+    except Exception as e:
+        raise ai_http_error(e)
+
+
+@router.get("/test-runs/{test_run_id}/archive", response_model=TestRunArchiveSchema)
+def get_test_run_archive(test_run_id: int, db: Session = Depends(get_db)):
+    """
+    Retention state of a run: archived, rehydrated or expired, with its
+    outcome counts and compressed size.
+    """
+    _get_test_run_or_404(db, test_run_id)
+    archive = get_archive(db, test_run_id)
+    if archive is None:
+        raise HTTPException(status_code=404, detail="Test run is not archived")
+    return archive
+
+
+@router.post("/test-runs/{test_run_id}/rehydrate", response_model=TestRunSchema)
+def rehydrate_test_run_endpoint(test_run_id: int, db: Session = Depends(get_db)):
+    """
+    Restore the per-test results of a compacted run from its archive. The
+    run is compacted again once it has stayed raw for RETENTION_RAW_DAYS.
+    """
+    test_run = _get_test_run_or_404(db, test_run_id)
+    archive = get_archive(db, test_run_id)
+    if archive is None:
+        raise HTTPException(status_code=409, detail="Test run is not archived")
+    if archive.status == "expired":
+        raise HTTPException(status_code=410, detail="Archive has expired; only the run summary is kept")
+    rehydrate_test_run(db, test_run, archive)
+    db.refresh(test_run)
+    return test_run
+
+
+@router.post("/retention/compact", response_model=CompactionResult)
+def compact_test_runs_now(db: Session = Depends(get_db)):
+    """
+    Run a compaction pass now with the RETENTION_* settings (it also runs
+    on a schedule).
+    """
+    return compact_test_runs(
+        db,
+        raw_days=settings.RETENTION_RAW_DAYS,
+        archive_days=settings.RETENTION_ARCHIVE_DAYS,
+        batch_size=settings.RETENTION_BATCH_SIZE,
+        vacuum=settings.RETENTION_VACUUM,
+    )
+
+
+@router.get("/test-runs/{test_run_id}/duration-regressions", response_model=List[DurationRegression])
+def get_duration_regressions(
+    test_run_id: int,
+    threshold: float = Query(DEFAULT_THRESHOLD, gt=0, description="Robust z-score above which a test is flagged"),
+    min_delta: float = Query(DEFAULT_MIN_DELTA, ge=0, description="Minimum slowdown in seconds"),
+    db: Session = Depends(get_db),
+):
+    """
+    Tests of the run that were slower than their rolling duration baseline
+    (median/MAD of previous runs), worst first.
+    """
+    _get_raw_test_run_or_409(db, test_run_id)
+    return duration_regressions(db, test_run_id, threshold=threshold, min_delta=min_delta)
+
+
+@router.get("/test-durations", response_model=TestDurationHistory)
+def get_test_duration_history(
+    test: str = Query(..., description='Test id, e.g. "tests.api.test_auth::test_login_with_wrong_password"'),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    Recorded durations of one test (newest first) and its current baseline.
+    """
+    history = list_duration_history(db, test, limit=limit)
+    baseline = get_baseline(db, test)
+    if not history and baseline is None:
+        raise HTTPException(status_code=404, detail="No duration history for this test")
+    return {"test": test, "baseline": baseline, "history": history}
+
+
+@router.get("/flaky", response_model=List[TestFlakinessSchema])
+def get_flaky_tests(
+    min_runs: int = Query(FLAKY_MIN_RUNS, ge=2, description="Ignore tests with fewer recorded runs"),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Tests ranked by flakiness: how often their outcome flipped between
+    consecutive runs, over the last runs first and all history second.
+    """
+    return list_flaky_tests(db, min_runs=min_runs, limit=limit)
+
+
 @router.get("/analyze-failures")
-def analyze_failures(
+async def analyze_failures(
+    request: Request,
     xml_path: str = Query("reports/api-results.xml"),
+    refresh: bool = Query(False, description="Ignore cached per-cluster analyses"),
+    timeout: Optional[float] = timeout_query("AI_CALL_TIMEOUT"),
 ) -> Dict[str, Any]:
     """
     Analyze failures from a pytest JUnit XML and return AI-written analysis.
+
+    Analyses are cached per failure-cluster signature: only clusters never
+    seen before are sent to Gemini, and each cluster carries a "cached" flag.
     """
     try:
-        data = analyze_failures_api(xml_path)
+        data = await run_ai_db_sync(
+            request,
+            lambda db: analyze_failures_api(xml_path, db=db, refresh=refresh),
+            timeout=timeout,
+        )
         return data
     except FileNotFoundError:
         raise HTTPException(
@@ -102,4 +532,4 @@ def analyze_failures(
             detail=f"JUnit XML not found at {xml_path}. Run pytest with --junitxml first.",
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise ai_http_error(e)
@@ -1,25 +1,32 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
+from backend.api.ai_runtime import run_ai_sync
+from backend.api.deps import ai_http_error
 from ai_tools.test_generator import generate_test_cases_from_openapi
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 
 @router.get("/generate-tests", response_model=List[Dict[str, Any]])
-def generate_tests(
+async def generate_tests(
+    request: Request,
     max_endpoints: int = Query(10, ge=1, le=50),
+    timeout: Optional[float] = Query(None, gt=0, le=3600, description="Deadline in seconds (default AI_CALL_TIMEOUT)"),
 ):
     """
     Use Gemini + OpenAPI schema to generate suggested API test cases.
     NOTE: Requires GEMINI_API_KEY env var and outbound internet access.
     """
     try:
-        cases = generate_test_cases_from_openapi(
+        cases = await run_ai_sync(
+            request,
+            generate_test_cases_from_openapi,
             base_url="http://127.0.0.1:8000",
             max_endpoints=max_endpoints,
+            timeout=timeout,
         )
         return cases
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise ai_http_error(e)
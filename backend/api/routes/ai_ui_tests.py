@@ -1,14 +1,25 @@
-from typing import Any, Dict
+import os
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 
-from ai_tools.ui_test_generator import generate_and_optionally_save_ui_tests
+from backend.api.ai_runtime import run_ai_task
+from backend.api.deps import ai_http_error, get_browser_pool
+from backend.core.config import get_settings
+from backend.db.session import get_db
+from backend.schemas.test_run import TestRun as TestRunSchema
+from ai_tools.browser_pool import BrowserPool
+from ai_tools.ui_crawler import crawl_and_generate_ui_tests
+from ai_tools.ui_test_generator import generate_and_optionally_save_ui_tests_async
+from ai_tools.ui_test_runner import DEFAULT_MAX_WORKERS, DEFAULT_SHARD_TIMEOUT, run_generated_ui_tests_async
 
 
 class UiTestGenRequest(BaseModel):
     url: str
     save: bool = True
+    force: bool = False  # regenerate even if the page fingerprint is unchanged
 
 
 class UiTestGenResponse(BaseModel):
@@ -16,28 +27,153 @@ class UiTestGenResponse(BaseModel):
     saved: bool
     saved_path: str | None
     code: str
+    regenerated: bool
+    changed_pages: List[str]
+
+
+class UiCrawlRequest(BaseModel):
+    url: str
+    save: bool = True
+    max_depth: int = Field(2, ge=0, le=5)
+    max_pages: int = Field(20, ge=1, le=200)
+    force: bool = False
+
+
+class UiTestModule(BaseModel):
+    area: str
+    pages: List[str]
+    saved_path: str | None
+    code: str
+    regenerated: bool
+    changed_pages: List[str]
+    removed_pages: List[str]
+
+
+class UiCrawlResponse(BaseModel):
+    url: str
+    pages: List[str]
+    duplicates: Dict[str, str]
+    errors: Dict[str, str]
+    changed_pages: List[str]
+    modules: List[UiTestModule]
+    failed_areas: Dict[str, str]
+    crawl_ms: float
+    generation_ms: float
+
+
+class UiTestRunRequest(BaseModel):
+    # File names inside tests/ui/generated/; default: every module there.
+    modules: Optional[List[str]] = None
+    max_workers: int = Field(DEFAULT_MAX_WORKERS, ge=1, le=32)
+    shard_timeout: float = Field(DEFAULT_SHARD_TIMEOUT, gt=0, le=3600)
 
 
 router = APIRouter(prefix="/ai/ui", tags=["ai-ui"])
 
+settings = get_settings()
+
 
 @router.post("/generate-tests", response_model=UiTestGenResponse)
-def generate_ui_tests(req: UiTestGenRequest) -> Dict[str, Any]:
+async def generate_ui_tests(
+    req: UiTestGenRequest,
+    request: Request,
+    timeout: Optional[float] = Query(None, gt=0, le=3600, description="Deadline in seconds (default AI_CALL_TIMEOUT)"),
+    pool: BrowserPool = Depends(get_browser_pool),
+) -> Dict[str, Any]:
     """
     Generate Python Playwright pytest UI tests for a given URL using Gemini,
-    optionally saving them under tests/ui/generated/.
+    optionally saving them under tests/ui/generated/. The page is inspected
+    in a fresh context of the shared browser pool. If the saved module was
+    generated from an identical page fingerprint, it is returned as is.
     """
     try:
-        result = generate_and_optionally_save_ui_tests(
-            url=req.url,
-            save=req.save,
-            output_dir="tests/ui/generated",
+        result = await run_ai_task(
+            request,
+            lambda: generate_and_optionally_save_ui_tests_async(
+                url=req.url,
+                pool=pool,
+                save=req.save,
+                output_dir="tests/ui/generated",
+                force=req.force,
+            ),
+            timeout=timeout,
         )
         return {
             "url": result["url"],
             "saved": result["saved"],
             "saved_path": result["saved_path"],
             "code": result["code"],
+            "regenerated": result["regenerated"],
+            "changed_pages": result["changed_pages"],
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise ai_http_error(e)
+
+
+@router.post("/crawl-generate-tests", response_model=UiCrawlResponse)
+async def crawl_generate_ui_tests(
+    req: UiCrawlRequest,
+    request: Request,
+    timeout: Optional[float] = Query(None, gt=0, le=3600, description="Deadline in seconds (default AI_RUN_TIMEOUT)"),
+    pool: BrowserPool = Depends(get_browser_pool),
+) -> Dict[str, Any]:
+    """
+    Crawl same-origin pages from the given URL (concurrently, up to
+    max_depth/max_pages), drop structurally duplicate pages, and generate
+    one test module per area (first path segment).
+    """
+    try:
+        return await run_ai_task(
+            request,
+            lambda: crawl_and_generate_ui_tests(
+                req.url,
+                pool,
+                output_dir="tests/ui/generated",
+                save=req.save,
+                max_depth=req.max_depth,
+                max_pages=req.max_pages,
+                force=req.force,
+            ),
+            timeout=timeout or settings.AI_RUN_TIMEOUT,
+        )
+    except Exception as e:
+        raise ai_http_error(e)
+
+
+@router.post("/run-generated-tests", response_model=TestRunSchema, status_code=201)
+async def run_generated_ui_tests(
+    req: UiTestRunRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Run the generated UI test modules as parallel shards (one pytest process
+    each, killed after shard_timeout seconds) and store the per-test
+    results as a TestRun with run_type "ui".
+    """
+    generated_dir = "tests/ui/generated"
+    modules = None
+    if req.modules is not None:
+        # Only ever run modules from the generated directory.
+        modules = [os.path.join(generated_dir, os.path.basename(name)) for name in req.modules]
+        missing = [m for m in modules if not os.path.isfile(m)]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Generated UI test modules not found: {missing}")
+
+    try:
+        return await run_generated_ui_tests_async(
+            db,
+            modules=modules,
+            generated_dir=generated_dir,
+            max_workers=req.max_workers,
+            shard_timeout=req.shard_timeout,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/browser-pool")
+async def browser_pool_health(pool: BrowserPool = Depends(get_browser_pool)) -> Dict[str, Any]:
+    """
+    Health/usage of the shared browser pool (does not launch a browser).
+    """
+    return await pool.health()
@@ -23,6 +23,30 @@ class Settings(BaseSettings):
 
     # IMPORTANT: this must exist
     GEMINI_API_KEY: str | None = None
+    GEMINI_BACKEND: str = "google"  # "fake" = offline canned responses (ai_tools/gemini_fake.py)
+    GEMINI_RPM: int = 10            # requests per minute allowed by the limiter
+    GEMINI_TPM: int = 250_000       # prompt+response tokens per minute
+    GEMINI_MAX_RETRIES: int = 5     # retries on 429, with jittered exponential backoff
+    GEMINI_BACKOFF_BASE: float = 1.0
+    GEMINI_BACKOFF_MAX: float = 30.0
+
+    # AI routes: own concurrency limit and deadlines (see backend/api/ai_runtime.py)
+    AI_MAX_CONCURRENCY: int = 4
+    AI_CALL_TIMEOUT: float = 120.0  # seconds, single generation/analysis calls
+    AI_RUN_TIMEOUT: float = 900.0   # seconds, test executions, load tests, crawls, uploads
+
+    # Shared Playwright browser for /ai/ui/* (see ai_tools/browser_pool.py)
+    BROWSER_POOL_MAX_CONTEXTS: int = 4
+    BROWSER_POOL_RECYCLE_AFTER: int = 50  # relaunch the browser after this many contexts
+    BROWSER_POOL_HEADLESS: bool = True
+    BROWSER_POOL_WARM_START: bool = False  # launch at startup instead of on first use
+
+    # Test-run retention (see ai_tools/run_retention.py)
+    RETENTION_RAW_DAYS: int = 30        # keep per-test results raw this long
+    RETENTION_ARCHIVE_DAYS: int = 365   # then keep compressed archives this long; 0 = forever
+    RETENTION_COMPACTION_INTERVAL: float = 6 * 3600.0  # seconds between passes; 0 disables the schedule
+    RETENTION_BATCH_SIZE: int = 50      # runs compacted per transaction
+    RETENTION_VACUUM: bool = True       # VACUUM SQLite after a pass that removed data
 
 
 @lru_cache
@@ -0,0 +1,36 @@
+"""
+Chunked lookups and batched upserts shared by the per-test history tables.
+"""
+from typing import Any, Dict, Iterable, List, Type, TypeVar
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+M = TypeVar("M")
+
+# Keeps "IN (...)" lists well below SQLite's bound-parameter limit.
+LOOKUP_CHUNK_SIZE = 500
+
+
+def get_rows_by_test(db: Session, model: Type[M], tests: Iterable[str]) -> Dict[str, M]:
+    """
+    Rows of `model` for the given test ids, keyed by test.
+    """
+    tests = list(tests)
+    rows: Dict[str, M] = {}
+    for i in range(0, len(tests), LOOKUP_CHUNK_SIZE):
+        chunk = tests[i : i + LOOKUP_CHUNK_SIZE]
+        for row in db.query(model).filter(model.test.in_(chunk)):
+            rows[row.test] = row
+    return rows
+
+
+def bulk_upsert(db: Session, model: Type[Any], new_rows: List[Dict[str, Any]], changed_rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert new rows and update existing ones (dicts carrying "id") with one
+    executemany each. Caller commits.
+    """
+    if new_rows:
+        db.execute(insert(model), new_rows)
+    if changed_rows:
+        db.execute(update(model), changed_rows)
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.failure_analysis import FailureAnalysis
+
+
+def get_analyses_by_signatures(
+    db: Session,
+    signatures: Iterable[str],
+) -> Dict[str, FailureAnalysis]:
+    signatures = list(signatures)
+    if not signatures:
+        return {}
+    rows = db.query(FailureAnalysis).filter(FailureAnalysis.signature.in_(signatures)).all()
+    return {row.signature: row for row in rows}
+
+
+def record_analysis_hits(db: Session, rows: Iterable[FailureAnalysis]) -> None:
+    now = datetime.utcnow()
+    for row in rows:
+        row.hit_count = (row.hit_count or 0) + 1
+        row.last_seen_at = now
+    db.commit()
+
+
+def save_analyses(
+    db: Session,
+    analyses: Dict[str, str],
+    clusters: List[dict],
+) -> None:
+    """
+    Store fresh analyses; `clusters` supplies the representative type/message.
+    """
+    try:
+        _upsert_analyses(db, analyses, clusters)
+    except IntegrityError:
+        # Another request stored one of these signatures since we read them.
+        db.rollback()
+        _upsert_analyses(db, analyses, clusters)
+
+
+def _upsert_analyses(db: Session, analyses: Dict[str, str], clusters: List[dict]) -> None:
+    by_sig = {c["signature"]: c for c in clusters}
+    existing = get_analyses_by_signatures(db, analyses.keys())
+    for sig, text in analyses.items():
+        row = existing.get(sig)
+        if row is None:
+            row = FailureAnalysis(signature=sig, hit_count=0)
+            db.add(row)
+        cluster = by_sig.get(sig, {})
+        row.failure_type = cluster.get("type")
+        row.message = cluster.get("message")
+        row.analysis = text
+        row.last_seen_at = datetime.utcnow()
+    db.commit()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models.test_corpus import GeneratedTestCorpus
+
+
+def get_corpus_by_endpoints(
+    db: Session,
+    endpoints: Iterable[str],
+) -> Dict[str, GeneratedTestCorpus]:
+    endpoints = list(endpoints)
+    if not endpoints:
+        return {}
+    rows = db.query(GeneratedTestCorpus).filter(GeneratedTestCorpus.endpoint.in_(endpoints)).all()
+    return {row.endpoint: row for row in rows}
+
+
+def upsert_corpus_entry(
+    db: Session,
+    endpoint: str,
+    schema_hash: str,
+    cases: list,
+    commit: bool = True,
+) -> GeneratedTestCorpus:
+    obj = db.query(GeneratedTestCorpus).filter(GeneratedTestCorpus.endpoint == endpoint).first()
+    if obj is None:
+        obj = GeneratedTestCorpus(endpoint=endpoint)
+        db.add(obj)
+    obj.schema_hash = schema_hash
+    obj.cases = cases
+    obj.updated_at = datetime.utcnow()
+    if commit:
+        db.commit()
+        db.refresh(obj)
+    return obj
+
+
+def mark_corpus_used(db: Session, entries: Iterable[GeneratedTestCorpus]) -> None:
+    now = datetime.utcnow()
+    for entry in entries:
+        entry.last_used_at = now
+    db.commit()
+
+
+def list_corpus(db: Session, endpoint_prefix: Optional[str] = None) -> List[GeneratedTestCorpus]:
+    q = db.query(GeneratedTestCorpus).order_by(GeneratedTestCorpus.endpoint)
+    if endpoint_prefix:
+        q = q.filter(GeneratedTestCorpus.endpoint.startswith(endpoint_prefix))
+    return q.all()
+
+
+def delete_corpus_entries(db: Session, ids: Iterable[int]) -> int:
+    ids = list(ids)
+    if not ids:
+        return 0
+    deleted = (
+        db.query(GeneratedTestCorpus)
+        .filter(GeneratedTestCorpus.id.in_(ids))
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -0,0 +1,54 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from backend.crud._bulk import bulk_upsert, get_rows_by_test
+from backend.models.test_duration import TestDuration, TestDurationBaseline
+
+
+def get_baselines_for_tests(db: Session, tests: Iterable[str]) -> Dict[str, TestDurationBaseline]:
+    return get_rows_by_test(db, TestDurationBaseline, tests)
+
+
+def bulk_insert_durations(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Caller commits.
+    """
+    if rows:
+        db.execute(insert(TestDuration), rows)
+
+
+def bulk_upsert_baselines(db: Session, new_rows: List[Dict[str, Any]], changed_rows: List[Dict[str, Any]]) -> None:
+    """
+    Caller commits.
+    """
+    bulk_upsert(db, TestDurationBaseline, new_rows, changed_rows)
+
+
+def get_baseline(db: Session, test: str) -> Optional[TestDurationBaseline]:
+    return db.query(TestDurationBaseline).filter(TestDurationBaseline.test == test).first()
+
+
+def list_duration_history(db: Session, test: str, limit: int = 50) -> List[TestDuration]:
+    """
+    Most recent durations of one test, newest first.
+    """
+    return (
+        db.query(TestDuration)
+        .filter(TestDuration.test == test)
+        .order_by(TestDuration.test_run_id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def list_run_durations(db: Session, test_run_id: int) -> List[TestDuration]:
+    return db.query(TestDuration).filter(TestDuration.test_run_id == test_run_id).all()
+
+
+def delete_run_durations(db: Session, test_run_id: int) -> int:
+    """
+    Caller commits.
+    """
+    return db.execute(delete(TestDuration).where(TestDuration.test_run_id == test_run_id)).rowcount
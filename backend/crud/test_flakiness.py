@@ -0,0 +1,35 @@
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from backend.crud._bulk import bulk_upsert, get_rows_by_test
+from backend.models.test_flakiness import TestFlakiness
+
+
+def get_flakiness_for_tests(db: Session, tests: Iterable[str]) -> Dict[str, TestFlakiness]:
+    return get_rows_by_test(db, TestFlakiness, tests)
+
+
+def bulk_upsert_flakiness(db: Session, new_rows: List[Dict[str, Any]], changed_rows: List[Dict[str, Any]]) -> None:
+    """
+    Caller commits.
+    """
+    bulk_upsert(db, TestFlakiness, new_rows, changed_rows)
+
+
+def list_flaky_tests(
+    db: Session,
+    min_runs: int = 5,
+    limit: int = 20,
+) -> List[TestFlakiness]:
+    """
+    Tests that flipped at least once, most flaky (recent flip rate, then
+    overall flip rate) first.
+    """
+    return (
+        db.query(TestFlakiness)
+        .filter(TestFlakiness.runs >= min_runs, TestFlakiness.flips > 0)
+        .order_by(TestFlakiness.recent_flip_rate.desc(), TestFlakiness.flip_rate.desc(), TestFlakiness.runs.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,78 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.models.test_result import TestResult
+
+
+def bulk_insert_test_results(
+    db: Session,
+    test_run_id: int,
+    rows: Iterable[Dict[str, Any]],
+) -> int:
+    """
+    Insert a batch of result dicts (keys matching TestResult columns) with a
+    single executemany; the caller commits.
+    """
+    payload = [{**row, "test_run_id": test_run_id} for row in rows]
+    if payload:
+        db.execute(insert(TestResult), payload)
+    return len(payload)
+
+
+def list_test_results(
+    db: Session,
+    test_run_id: int,
+    outcome: Optional[Iterable[str]] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> List[TestResult]:
+    q = db.query(TestResult).filter(TestResult.test_run_id == test_run_id)
+    if outcome:
+        q = q.filter(TestResult.outcome.in_(list(outcome)))
+    q = q.order_by(TestResult.id).offset(skip)
+    if limit is not None:
+        q = q.limit(limit)
+    return q.all()
+
+
+def count_outcomes(db: Session, test_run_id: int) -> Dict[str, int]:
+    rows = (
+        db.query(TestResult.outcome, func.count(TestResult.id))
+        .filter(TestResult.test_run_id == test_run_id)
+        .group_by(TestResult.outcome)
+        .all()
+    )
+    return {outcome: count for outcome, count in rows}
+
+
+def has_test_results(db: Session, test_run_id: int) -> bool:
+    return db.query(exists().where(TestResult.test_run_id == test_run_id)).scalar()
+
+
+def iter_results_by_test(
+    db: Session,
+    test_run_id: int,
+    batch_size: int = 5000,
+) -> Iterator[Tuple[str, str, float]]:
+    """
+    Stream (test, outcome, duration) for one run, ordered by test. The
+    ordering is served by ix_test_results_run_test, so no sort step, and
+    rows are fetched batch_size at a time instead of loading ORM objects.
+    """
+    stmt = (
+        select(TestResult.test, TestResult.outcome, TestResult.duration)
+        .where(TestResult.test_run_id == test_run_id)
+        .order_by(TestResult.test)
+        .execution_options(yield_per=batch_size)
+    )
+    for test, outcome, duration in db.execute(stmt):
+        yield test, outcome, duration
+
+
+def delete_test_results(db: Session, test_run_id: int) -> int:
+    """
+    Caller commits.
+    """
+    return db.execute(delete(TestResult).where(TestResult.test_run_id == test_run_id)).rowcount
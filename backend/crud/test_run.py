@@ -47,3 +47,7 @@ def list_test_runs(
     if run_type:
         q = q.filter(TestRun.run_type == run_type)
     return q.limit(limit).all()
+
+
+def get_test_run(db: Session, test_run_id: int) -> Optional[TestRun]:
+    return db.query(TestRun).filter(TestRun.id == test_run_id).first()
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models.test_run import TestRun
+from backend.models.test_run_archive import TestRunArchive
+
+
+def get_archive(db: Session, test_run_id: int) -> Optional[TestRunArchive]:
+    return db.query(TestRunArchive).filter(TestRunArchive.test_run_id == test_run_id).first()
+
+
+def list_runs_to_archive(db: Session, started_before: datetime, limit: int) -> List[TestRun]:
+    """
+    Finished runs older than the cutoff that have no archive yet, oldest first.
+    """
+    return (
+        db.query(TestRun)
+        .outerjoin(TestRunArchive, TestRunArchive.test_run_id == TestRun.id)
+        .filter(TestRunArchive.id.is_(None))
+        .filter(TestRun.started_at < started_before)
+        .filter(TestRun.status != "running")
+        .order_by(TestRun.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def list_archives(
+    db: Session,
+    status: str,
+    started_before: Optional[datetime] = None,
+    rehydrated_before: Optional[datetime] = None,
+    limit: int = 100,
+) -> List[TestRunArchive]:
+    q = db.query(TestRunArchive).filter(TestRunArchive.status == status)
+    if started_before is not None:
+        q = q.join(TestRun, TestRun.id == TestRunArchive.test_run_id).filter(TestRun.started_at < started_before)
+    if rehydrated_before is not None:
+        q = q.filter(TestRunArchive.rehydrated_at < rehydrated_before)
+    return q.order_by(TestRunArchive.id).limit(limit).all()
@@ -0,0 +1,103 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.api import deps
+from backend.db import session as db_session
+from backend.db.session import Base
+from backend.main import create_app
+
+INPROCESS_BASE_URL = "http://testserver"
+
+
+def _throwaway_database_url(label: str = "") -> str:
+    """
+    Create a temp-file SQLite database that is removed at interpreter exit.
+    `label` (e.g. an xdist worker id) only goes into the directory name.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix=f"testhub-{label}-" if label else "testhub-")
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    return f"sqlite:///{os.path.join(tmp_dir, 'testhub.db')}"
+
+
+def create_inprocess_app(database_url: Optional[str] = None, label: str = "") -> FastAPI:
+    """
+    Build a standalone app instance bound to its own SQLite database, for
+    driving the API through an ASGI transport (no server, no ports).
+
+    - database_url=None: fresh temp-file database, deleted at exit
+      (`label` is added to its directory name)
+    - "sqlite://" / "sqlite:///:memory:": in-memory database shared by all
+      sessions of this app (single connection via StaticPool)
+    - anything else: used as-is
+    """
+    if database_url is None:
+        database_url = _throwaway_database_url(label)
+
+    engine_kwargs = {}
+    if database_url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if database_url in ("sqlite://", "sqlite:///:memory:"):
+            engine_kwargs["poolclass"] = StaticPool
+
+    engine = create_engine(database_url, **engine_kwargs)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    # Routes use both get_db helpers; point each at the throwaway database.
+    app.dependency_overrides[deps.get_db] = override_get_db
+    app.dependency_overrides[db_session.get_db] = override_get_db
+    app.state.engine = engine
+    app.state.session_factory = session_factory
+    return app
+
+
+class InProcessServer:
+    """
+    Serve an app (e.g. from create_inprocess_app) with uvicorn on a free
+    localhost port in a background thread, for tests that need a real HTTP
+    server (browsers, live-transport API tests) but their own database.
+    """
+
+    def __init__(self, app: FastAPI, host: str = "127.0.0.1", port: int = 0, startup_timeout: float = 30):
+        import uvicorn
+
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self._thread: Optional[threading.Thread] = None
+        self.base_url: Optional[str] = None
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.run, name="inprocess-server", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + self.startup_timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("In-process server failed to start")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://{self.host}:{port}"
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
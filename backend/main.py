@@ -1,15 +1,24 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
 from backend.core.config import get_settings
-from backend.db.session import Base, engine
+from backend.db.session import Base, SessionLocal, engine
 
 # Import models so they are registered
 from backend.models import user  # noqa: F401
 from backend.models import project  # noqa: F401
 from backend.models import bug  # noqa: F401
-from backend.models import user, project, bug, test_run
+from backend.models import test_run  # noqa: F401
+from backend.models import test_corpus  # noqa: F401
+from backend.models import failure_analysis  # noqa: F401
+from backend.models import test_result  # noqa: F401
+from backend.models import test_duration  # noqa: F401
+from backend.models import test_flakiness  # noqa: F401
+from backend.models import test_run_archive  # noqa: F401
 
 # Routers
 from backend.api.routes import auth as auth_routes
@@ -19,26 +28,14 @@ from backend.api.routes import bugs as bug_routes
 from backend.api.routes import ai_tests as ai_tests_routes 
 from backend.api.routes import ai_dashboard as ai_dashboard_routes  # NEW
 from backend.api.routes import ai_ui_tests as ai_ui_tests_routes
+from ai_tools.browser_pool import BrowserPool
+from ai_tools.run_retention import run_compaction_periodically
 
 settings = get_settings()
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-)
-
 Base.metadata.create_all(bind=engine)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 
-@app.get("/health", tags=["health"])
 def read_health():
     return {"status": "ok", "app": settings.APP_NAME, "version": settings.APP_VERSION}
 
@@ -240,9 +237,7 @@ APP_HTML = """
         const data = await res.json();
         token = data.access_token;
         setStatus("login-status", "Login successful", true);
-        const userDiv = document.getElementById("logged-in-user");
-        userDiv.textContent = "Logged in as: " + email;
-        userDiv.dataset.email = email;
+        showLoggedInUser(email);
       } catch (e) {
         token = null;
         setStatus("login-status", "Login error: " + e.message, false);
@@ -250,6 +245,12 @@ APP_HTML = """
       }
     }
 
+    function showLoggedInUser(email) {
+      const userDiv = document.getElementById("logged-in-user");
+      userDiv.textContent = "Logged in as: " + email;
+      userDiv.dataset.email = email;
+    }
+
     function getAuthHeaders() {
       if (!token) {
         throw new Error("Not logged in");
@@ -362,14 +363,79 @@ APP_HTML = """
 """
 
 
-@app.get("/app", response_class=HTMLResponse, tags=["ui"])
 def app_ui():
     return HTMLResponse(content=APP_HTML)
 
-app.include_router(auth_routes.router)
-app.include_router(user_routes.router)  
-app.include_router(project_routes.router) 
-app.include_router(bug_routes.router) 
-app.include_router(ai_tests_routes.router)
-app.include_router(ai_dashboard_routes.router)  # NEW
-app.include_router(ai_ui_tests_routes.router)  # NEW
\ No newline at end of file
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # One browser for the whole process; each UI request gets its own context.
+    pool = BrowserPool(
+        max_contexts=settings.BROWSER_POOL_MAX_CONTEXTS,
+        recycle_after=settings.BROWSER_POOL_RECYCLE_AFTER,
+        headless=settings.BROWSER_POOL_HEADLESS,
+    )
+    application.state.browser_pool = pool
+    if settings.BROWSER_POOL_WARM_START:
+        await pool.start()
+
+    # Scheduled test-run compaction, against the app's own DB when it has one.
+    compaction = None
+    if settings.RETENTION_COMPACTION_INTERVAL > 0:
+        compaction = asyncio.create_task(
+            run_compaction_periodically(
+                getattr(application.state, "session_factory", SessionLocal),
+                settings.RETENTION_COMPACTION_INTERVAL,
+                raw_days=settings.RETENTION_RAW_DAYS,
+                archive_days=settings.RETENTION_ARCHIVE_DAYS,
+                batch_size=settings.RETENTION_BATCH_SIZE,
+                vacuum=settings.RETENTION_VACUUM,
+            )
+        )
+    try:
+        yield
+    finally:
+        if compaction is not None:
+            compaction.cancel()
+            with suppress(asyncio.CancelledError):
+                await compaction
+        await pool.close()
+
+
+def create_app() -> FastAPI:
+    """
+    Build a FastAPI instance with middleware and all routers attached.
+    Each call returns an independent app, so callers (e.g. the in-process
+    test transport) can set their own dependency_overrides.
+    """
+    application = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        lifespan=lifespan,
+    )
+
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    application.add_api_route("/health", read_health, methods=["GET"], tags=["health"])
+    application.add_api_route(
+        "/app", app_ui, methods=["GET"], response_class=HTMLResponse, tags=["ui"]
+    )
+
+    application.include_router(auth_routes.router)
+    application.include_router(user_routes.router)
+    application.include_router(project_routes.router)
+    application.include_router(bug_routes.router)
+    application.include_router(ai_tests_routes.router)
+    application.include_router(ai_dashboard_routes.router)
+    application.include_router(ai_ui_tests_routes.router)
+
+    return application
+
+
+app = create_app()
\ No newline at end of file
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from backend.db.session import Base
+
+
+class FailureAnalysis(Base):
+    """
+    Cached AI analysis for one failure cluster, keyed by its normalized
+    stack-trace signature (see ai_tools.failure_clustering).
+    """
+
+    __tablename__ = "failure_analyses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    signature = Column(String, unique=True, index=True, nullable=False)
+
+    failure_type = Column(String, nullable=True)  # "failure" / "error"
+    message = Column(Text, nullable=True)         # representative message
+    analysis = Column(Text, nullable=False)
+
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
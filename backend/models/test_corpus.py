@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+
+from backend.db.session import Base
+
+
+class GeneratedTestCorpus(Base):
+    """
+    AI-generated test cases for one OpenAPI operation, reused until the
+    operation's schema hash changes.
+    """
+
+    __tablename__ = "generated_test_corpus"
+
+    id = Column(Integer, primary_key=True, index=True)
+    endpoint = Column(String, unique=True, index=True, nullable=False)  # e.g. "POST /projects/"
+    schema_hash = Column(String, index=True, nullable=False)
+
+    cases = Column(JSON, nullable=False)  # list of test case dicts
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=True)
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Index
+
+from backend.db.session import Base
+
+
+class TestDuration(Base):
+    """
+    Duration of one passing test in one run, together with the test's
+    baseline as it was just before that run (so regressions of any past
+    run can be queried without recomputing baselines).
+    """
+
+    __tablename__ = "test_durations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
+    test = Column(String, nullable=False)
+    duration = Column(Float, nullable=False)  # seconds
+
+    baseline_median = Column(Float, nullable=True)  # None until enough samples
+    baseline_mad = Column(Float, nullable=True)
+    baseline_samples = Column(Integer, nullable=False, default=0)
+
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_test_durations_test_run", "test", "test_run_id"),
+        Index("ix_test_durations_run", "test_run_id"),
+    )
+
+
+class TestDurationBaseline(Base):
+    """
+    Rolling duration baseline per test: median and MAD over the last
+    `window` durations, updated incrementally as runs are recorded.
+    """
+
+    __tablename__ = "test_duration_baselines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    test = Column(String, unique=True, index=True, nullable=False)
+
+    window = Column(JSON, nullable=False)  # most recent durations, oldest first
+    median = Column(Float, nullable=False)
+    mad = Column(Float, nullable=False)
+    samples = Column(Integer, nullable=False, default=0)  # all durations ever recorded
+
+    last_test_run_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
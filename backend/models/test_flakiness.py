@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, DateTime
+
+from backend.db.session import Base
+
+
+class TestFlakiness(Base):
+    """
+    Pass/fail flip statistics of one test across stored runs, updated
+    incrementally as each run is recorded (see ai_tools.flaky_tests).
+    """
+
+    __tablename__ = "test_flakiness"
+
+    id = Column(Integer, primary_key=True, index=True)
+    test = Column(String, unique=True, index=True, nullable=False)
+
+    runs = Column(Integer, nullable=False, default=0)      # runs with a pass or fail outcome
+    failures = Column(Integer, nullable=False, default=0)
+    flips = Column(Integer, nullable=False, default=0)     # outcome changes between consecutive runs
+    flip_rate = Column(Float, nullable=False, default=0.0)  # flips / (runs - 1)
+
+    recent = Column(String, nullable=False, default="")    # last outcomes, oldest first: "P"/"F"
+    recent_flip_rate = Column(Float, nullable=False, default=0.0, index=True)
+
+    last_outcome = Column(String, nullable=True)
+    last_test_run_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
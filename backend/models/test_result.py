@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Index
+
+from backend.db.session import Base
+
+
+class TestResult(Base):
+    """
+    One testcase outcome within a TestRun, ingested from (possibly sharded)
+    JUnit reports so runs can be queried without re-reading XML.
+    """
+
+    __tablename__ = "test_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
+
+    test = Column(String, nullable=False)       # "classname::name"
+    classname = Column(String, nullable=True)
+    name = Column(String, nullable=True)
+    outcome = Column(String, nullable=False)    # passed, failed, error, skipped
+    duration = Column(Float, nullable=False, default=0.0)  # seconds
+
+    message = Column(Text, nullable=True)
+    details = Column(Text, nullable=True)
+    shard = Column(String, nullable=True)       # source report file name
+
+    __table_args__ = (
+        Index("ix_test_results_run_test", "test_run_id", "test"),
+        Index("ix_test_results_run_outcome", "test_run_id", "outcome"),
+        Index("ix_test_results_test_run", "test", "test_run_id"),
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, ForeignKey
+
+from backend.db.session import Base
+
+
+class TestRunArchive(Base):
+    """
+    Compressed copy of a compacted TestRun's raw data (its `results` JSON
+    and test_results rows), see ai_tools.run_retention. The row itself is
+    kept forever as the run's rollup; only `payload` is dropped once the
+    archive expires.
+    """
+
+    __tablename__ = "test_run_archives"
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), unique=True, index=True, nullable=False)
+
+    status = Column(String, index=True, nullable=False)  # archived, rehydrated, expired
+    payload = Column(LargeBinary, nullable=True)          # zlib-compressed JSON; None once expired
+    result_count = Column(Integer, nullable=False, default=0)
+    outcome_counts = Column(JSON, nullable=True)          # {"passed": n, "failed": m, ...}
+    raw_bytes = Column(Integer, nullable=False, default=0)         # uncompressed JSON size
+    compressed_bytes = Column(Integer, nullable=False, default=0)
+
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    rehydrated_at = Column(DateTime, nullable=True)
+    expired_at = Column(DateTime, nullable=True)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class CorpusEntry(BaseModel):
+    id: int
+    endpoint: str
+    schema_hash: str
+    case_count: int
+    created_at: datetime
+    updated_at: datetime
+    last_used_at: Optional[datetime] = None
+    cases: Optional[List[Dict[str, Any]]] = None
+
+
+class CorpusPruneResult(BaseModel):
+    deleted: int
+    endpoints: List[str]
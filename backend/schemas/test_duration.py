@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TestDuration(BaseModel):
+    id: int
+    test_run_id: int
+    test: str
+    duration: float
+    baseline_median: Optional[float] = None
+    baseline_mad: Optional[float] = None
+    baseline_samples: int
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True  # pydantic v2
+
+
+class TestDurationBaseline(BaseModel):
+    test: str
+    median: float
+    mad: float
+    samples: int
+    last_test_run_id: Optional[int] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True  # pydantic v2
+
+
+class TestDurationHistory(BaseModel):
+    test: str
+    baseline: Optional[TestDurationBaseline] = None
+    history: List[TestDuration]  # newest first
+
+
+class DurationRegression(BaseModel):
+    test: str
+    duration: float
+    baseline_median: float
+    baseline_mad: float
+    baseline_samples: int
+    slowdown: float  # seconds over the baseline median
+    score: float     # robust z-score
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TestFlakiness(BaseModel):
+    test: str
+    runs: int
+    failures: int
+    flips: int
+    flip_rate: float
+    recent: str  # last outcomes, oldest first: "P"/"F"
+    recent_flip_rate: float
+    last_outcome: Optional[str] = None
+    last_test_run_id: Optional[int] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True  # pydantic v2
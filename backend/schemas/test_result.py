@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TestResult(BaseModel):
+    id: int
+    test_run_id: int
+    test: str
+    classname: Optional[str] = None
+    name: Optional[str] = None
+    outcome: str
+    duration: float
+    message: Optional[str] = None
+    details: Optional[str] = None
+    shard: Optional[str] = None
+
+    class Config:
+        from_attributes = True  # pydantic v2
+
+
+class OutcomeChange(BaseModel):
+    test: str
+    base_outcome: str
+    head_outcome: str
+
+
+class TestPresence(BaseModel):
+    test: str
+    outcome: str
+
+
+class LatencyDelta(BaseModel):
+    test: str
+    base_duration: float
+    head_duration: float
+    delta: float  # seconds, head minus base
+
+
+class TestRunDiffCounts(BaseModel):
+    common: int
+    newly_failing: int
+    newly_passing: int
+    added: int
+    removed: int
+    slower: int
+    faster: int
+
+
+class TestRunDiff(BaseModel):
+    base_run_id: int
+    head_run_id: int
+    counts: TestRunDiffCounts
+    newly_failing: List[OutcomeChange]
+    newly_passing: List[OutcomeChange]
+    added: List[TestPresence]
+    removed: List[TestPresence]
+    slower: List[LatencyDelta]  # largest slowdown first
+    faster: List[LatencyDelta]  # largest speedup first
+    total_duration_delta: float
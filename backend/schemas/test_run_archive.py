@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class TestRunArchive(BaseModel):
+    test_run_id: int
+    status: str
+    result_count: int
+    outcome_counts: Optional[Dict[str, int]] = None
+    raw_bytes: int
+    compressed_bytes: int
+    archived_at: datetime
+    rehydrated_at: Optional[datetime] = None
+    expired_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True  # pydantic v2
+
+
+class CompactionResult(BaseModel):
+    archived: int     # runs whose raw data was compressed and removed
+    rearchived: int   # rehydrated runs whose raw data was removed again
+    expired: int      # archives whose payload was dropped (rollup kept)
+    raw_bytes: int
+    compressed_bytes: int
+    vacuumed: bool
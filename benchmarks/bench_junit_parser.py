@@ -0,0 +1,135 @@
+"""
+Benchmark: streaming JUnit parsing (iterparse) vs. the previous ET.parse
+approach on a generated report.
+
+Usage:
+    python -m benchmarks.bench_junit_parser [--testcases 1000000] [--failure-every 100]
+
+Each parser runs in its own child process so peak RSS is measured
+independently. Linux/macOS only (uses the resource module).
+"""
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List
+
+from ai_tools.failure_analyzer import parse_junit_report
+
+FAILURE_TEXT = (
+    "def test_example():\n"
+    ">       assert resp.status_code == 200\n"
+    "E       assert 500 == 200\n"
+    "tests/api/test_generated.py:42: AssertionError"
+)
+
+
+def generate_report(path: str, testcases: int, failure_every: int, suites: int = 100) -> None:
+    per_suite = max(1, testcases // suites)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites name="bench">\n')
+        suite = 0
+        while written < testcases:
+            f.write(f'<testsuite name="shard{suite}" tests="{per_suite}">\n')
+            for _ in range(min(per_suite, testcases - written)):
+                i = written
+                f.write(
+                    f'<testcase classname="tests.api.test_mod{i % 500}" name="test_case_{i}" time="{(i % 97) / 100:.3f}"'
+                )
+                if failure_every and i % failure_every == 0:
+                    f.write(f'><failure message="assert 500 == 200">{FAILURE_TEXT}</failure></testcase>\n')
+                elif i % 250 == 1:
+                    f.write('><skipped message="not implemented" /></testcase>\n')
+                else:
+                    f.write(" />\n")
+                written += 1
+            f.write("</testsuite>\n")
+            suite += 1
+        f.write("</testsuites>\n")
+
+
+def legacy_parse(path: str) -> List[Dict[str, str]]:
+    """
+    The pre-streaming implementation: whole tree in memory, then walk it.
+    """
+    root = ET.parse(path).getroot()
+    failures = []
+    for testcase in root.iter("testcase"):
+        node = testcase.find("failure")
+        if node is None:
+            node = testcase.find("error")
+        if node is not None:
+            failures.append(
+                {
+                    "test": f"{testcase.attrib.get('classname', '')}::{testcase.attrib.get('name', '')}",
+                    "message": node.attrib.get("message", ""),
+                    "details": node.text or "",
+                }
+            )
+    return failures
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run(kind: str, path: str, queue) -> None:
+    start = time.perf_counter()
+    if kind == "baseline":
+        failures = 0  # interpreter + imports only
+    elif kind == "legacy":
+        failures = len(legacy_parse(path))
+    else:
+        failures = len(parse_junit_report(path)["failures"])
+    queue.put(
+        {
+            "parser": kind,
+            "seconds": round(time.perf_counter() - start, 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "failures": failures,
+        }
+    )
+
+
+def measure(kind: str, path: str) -> Dict:
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(kind, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--testcases", type=int, default=1_000_000)
+    parser.add_argument("--failure-every", type=int, default=100)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the streaming parser")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "junit.xml")
+        t0 = time.perf_counter()
+        generate_report(path, args.testcases, args.failure_every)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Generated {args.testcases} testcases ({size_mb:.1f} MB) in {time.perf_counter() - t0:.1f}s")
+
+        kinds = ["baseline", "streaming"] if args.skip_legacy else ["baseline", "streaming", "legacy"]
+        for kind in kinds:
+            r = measure(kind, path)
+            print(
+                f"{r['parser']:>10}: {r['seconds']:>6}s  peak RSS {r['peak_rss_mb']:>7} MB  "
+                f"failures={r['failures']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
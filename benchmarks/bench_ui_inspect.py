@@ -0,0 +1,154 @@
+"""
+Benchmark: single page.evaluate DOM extraction vs. the previous
+per-element Playwright loop, on a generated local page.
+
+Usage:
+    python -m benchmarks.bench_ui_inspect [--controls 1000] [--repeat 3]
+
+Needs a Playwright Chromium (`playwright install chromium`). Both
+extractors run against the same loaded page, and their outputs are
+compared so the speed-up is not bought with a different summary.
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from playwright.sync_api import Page, sync_playwright
+
+from ai_tools.ui_test_generator import MAX_LINKS, extract_page_summary
+
+
+def generate_fixture_page(path: str, controls: int) -> None:
+    """
+    Form-heavy page: ~half labelled inputs (for=, wrapping label, none),
+    ~40% buttons, the rest links.
+    """
+    rows = []
+    for i in range(controls):
+        kind = i % 10
+        if kind < 2:
+            rows.append(f'<label for="f{i}">Field {i}</label><input id="f{i}" name="f{i}" type="text" data-testid="input-{i}">')
+        elif kind < 4:
+            rows.append(f'<label>Email {i} <input name="e{i}" type="email" placeholder="you@example.com"></label>')
+        elif kind == 4:
+            rows.append(f'<select name="s{i}"><option>a</option><option>b</option></select>')
+        elif kind < 7:
+            rows.append(f'<button data-testid="btn-{i}">Save {i}</button>')
+        elif kind == 7:
+            rows.append(f'<div role="button">Toggle {i}</div>')
+        elif kind == 8:
+            rows.append(f'<input type="submit" value="Submit {i}">')
+        else:
+            rows.append(f'<a href="/item/{i}" data-testid="link-{i}">Item {i}</a>')
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!doctype html><html><head><title>Bench fixture</title></head><body><form>\n")
+        f.write("\n".join(f"<div>{row}</div>" for row in rows))
+        f.write("\n</form></body></html>\n")
+
+
+def legacy_extract(page: Page) -> Dict[str, Any]:
+    """
+    The previous implementation: several Playwright round trips per element.
+    """
+    summary: Dict[str, Any] = {"url": page.url, "title": page.title(), "inputs": [], "buttons": [], "links": []}
+
+    input_locators = page.locator("input, textarea, select")
+    for i in range(input_locators.count()):
+        el = input_locators.nth(i)
+        label = el.evaluate(
+            """(e) => {
+                const id = e.id;
+                if (id) {
+                    const lab = document.querySelector(`label[for="${id}"]`);
+                    if (lab) return lab.innerText.trim();
+                }
+                const parentLabel = e.closest('label');
+                if (parentLabel) return parentLabel.innerText.trim();
+                return "";
+            }"""
+        )
+        summary["inputs"].append(
+            {
+                "tag": el.evaluate("e => e.tagName.toLowerCase()"),
+                "type": el.get_attribute("type") or "",
+                "name": el.get_attribute("name") or "",
+                "placeholder": el.get_attribute("placeholder") or "",
+                "data_testid": el.get_attribute("data-testid") or "",
+                "label": label or "",
+            }
+        )
+
+    button_locators = page.locator("button, [role=button], input[type=submit]")
+    for i in range(button_locators.count()):
+        el = button_locators.nth(i)
+        summary["buttons"].append(
+            {
+                "tag": el.evaluate("e => e.tagName.toLowerCase()"),
+                "text": el.inner_text().strip(),
+                "data_testid": el.get_attribute("data-testid") or "",
+            }
+        )
+
+    link_locators = page.locator("a[href]")
+    for i in range(min(link_locators.count(), MAX_LINKS)):
+        el = link_locators.nth(i)
+        summary["links"].append(
+            {
+                "text": el.inner_text().strip(),
+                "href": el.get_attribute("href") or "",
+                "data_testid": el.get_attribute("data-testid") or "",
+            }
+        )
+
+    return summary
+
+
+def _timed(fn, page: Page, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--controls", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the batched extractor")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fixture.html")
+        generate_fixture_page(path, args.controls)
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            page.goto(Path(path).as_uri(), wait_until="load")
+
+            batched_s, batched = _timed(extract_page_summary, page, args.repeat)
+            print(
+                f"{'batched':>8}: {batched_s * 1000:>9.1f} ms  inputs={len(batched['inputs'])} "
+                f"buttons={len(batched['buttons'])} links={len(batched['links'])}"
+            )
+
+            if not args.skip_legacy:
+                legacy_s, legacy = _timed(legacy_extract, page, args.repeat)
+                print(f"{'legacy':>8}: {legacy_s * 1000:>9.1f} ms  ({legacy_s / batched_s:.0f}x slower)")
+                for key in ("title", "inputs", "buttons", "links"):
+                    if batched[key] != legacy[key]:
+                        print(f"WARNING: '{key}' differs between extractors")
+
+            browser.close()
+
+
+if __name__ == "__main__":
+    main()
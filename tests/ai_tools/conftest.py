@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Register every model up front: mappers reference each other by name
+# (e.g. User -> "Project"), so importing just one model module is not enough.
+from backend.models import user  # noqa: F401
+from backend.models import project  # noqa: F401
+from backend.models import bug  # noqa: F401
+from backend.models import test_run  # noqa: F401
+from backend.models import test_corpus  # noqa: F401
+from backend.models import failure_analysis  # noqa: F401
+from backend.models import test_result  # noqa: F401
+from backend.models import test_duration  # noqa: F401
+from backend.models import test_flakiness  # noqa: F401
+from backend.models import test_run_archive  # noqa: F401
+from backend.db.session import Base
+
+
+@pytest.fixture
+def session_factory():
+    """
+    Sessions on a fresh in-memory database with every table created. All
+    sessions share one connection (StaticPool), so they see each other's
+    commits, also from other threads.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from ai_tools.gemini_client import current_call_scope
+from backend.api import ai_runtime
+from backend.api.deps import ai_http_error
+
+
+def _app(observed):
+    app = FastAPI()
+
+    def slow_llm_call(seconds):
+        scope = current_call_scope.get()
+        observed["scope"] = scope
+        scope.sleep(seconds)  # returns early / raises once cancelled
+        return "done"
+
+    @app.get("/ai")
+    async def ai_route(request: Request, seconds: float = 5.0, timeout: float = 0.2):
+        try:
+            return await ai_runtime.run_ai_sync(request, slow_llm_call, seconds, timeout=timeout)
+        except Exception as e:
+            raise ai_http_error(e)
+
+    @app.get("/crud")
+    def crud_route():
+        return {"ok": True}
+
+    return app
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+
+def test_deadline_returns_504_and_cancels_the_worker():
+    observed = {}
+
+    async def scenario():
+        async with _client(_app(observed)) as client:
+            start = time.perf_counter()
+            r = await client.get("/ai", params={"seconds": 5, "timeout": 0.2})
+            return r, time.perf_counter() - start
+
+    r, elapsed = asyncio.run(scenario())
+    assert r.status_code == 504
+    assert elapsed < 2
+    assert observed["scope"].cancelled
+
+
+def test_crud_stays_responsive_while_ai_capacity_is_exhausted():
+    observed = {}
+
+    async def scenario():
+        async with _client(_app(observed)) as client:
+            slow = [
+                asyncio.ensure_future(client.get("/ai", params={"seconds": 1, "timeout": 5}))
+                for _ in range(ai_runtime.settings.AI_MAX_CONCURRENCY * 2)
+            ]
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            crud = await client.get("/crud")
+            crud_elapsed = time.perf_counter() - start
+            results = await asyncio.gather(*slow)
+            return crud, crud_elapsed, results
+
+    crud, crud_elapsed, results = asyncio.run(scenario())
+    assert crud.status_code == 200
+    assert crud_elapsed < 0.5
+    assert {r.status_code for r in results} == {200}
+
+
+def test_db_work_gets_its_own_session_in_the_worker_thread():
+    observed = {}
+
+    class FakeSession:
+        def __enter__(self):
+            observed["opened_in"] = threading.current_thread().name
+            return self
+
+        def __exit__(self, *exc):
+            observed["closed"] = True
+
+    def db_work(db, value):
+        observed["db"] = db
+        return value
+
+    app = FastAPI()
+    app.state.session_factory = FakeSession
+
+    @app.get("/ai-db")
+    async def ai_db_route(request: Request):
+        return await ai_runtime.run_ai_db_sync(request, db_work, 42, timeout=5)
+
+    async def scenario():
+        async with _client(app) as client:
+            return await client.get("/ai-db")
+
+    r = asyncio.run(scenario())
+    assert r.json() == 42
+    assert isinstance(observed["db"], FakeSession) and observed["closed"]
+    assert observed["opened_in"].startswith("ai-worker")
+
+
+def test_timed_out_blocking_work_keeps_its_slot_until_the_thread_is_done():
+    release = threading.Event()
+
+    def stuck_call():
+        release.wait(5)  # ignores the CallScope, like a blocking SDK request
+        return "late"
+
+    app = FastAPI()
+
+    @app.get("/stuck")
+    async def stuck_route(request: Request):
+        try:
+            return await ai_runtime.run_ai_sync(request, stuck_call, timeout=0.1)
+        except Exception as e:
+            raise ai_http_error(e)
+
+    async def scenario():
+        async with _client(app) as client:
+            results = await asyncio.gather(
+                *(client.get("/stuck") for _ in range(ai_runtime.settings.AI_MAX_CONCURRENCY))
+            )
+            semaphore = ai_runtime._ai_semaphore()
+            held_after_504 = semaphore.locked()
+            release.set()
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if not semaphore.locked():
+                    break
+            return results, held_after_504, semaphore.locked()
+
+    results, held_after_504, held_at_end = asyncio.run(scenario())
+    assert {r.status_code for r in results} == {504}
+    assert held_after_504  # every thread is still busy, so no slot is free
+    assert not held_at_end
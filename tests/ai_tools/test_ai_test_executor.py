@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_tools import ai_test_executor, test_corpus
+from ai_tools.gemini_client import AICallCancelled, current_call_scope
+from backend.crud.test_corpus import list_corpus
+from backend.crud.test_flakiness import get_flakiness_for_tests
+from backend.crud.test_result import list_test_results
+from backend.crud.test_run import get_test_run
+
+
+def test_cli_functional_run_is_stored_with_per_test_history(monkeypatch, session_factory):
+    monkeypatch.setattr(ai_test_executor, "engine", session_factory.kw["bind"])
+    monkeypatch.setattr(ai_test_executor, "SessionLocal", session_factory)
+
+    entry = {
+        "index": 1,
+        "name": "list projects",
+        "category": "positive",
+        "endpoint": "GET /projects/",
+        "method": "GET",
+        "path": "/projects/",
+        "status_code": 500,
+        "passed": False,
+        "error": None,
+        "elapsed_ms": 12.0,
+        "ttfb_ms": 10.0,
+        "response_bytes": 2,
+    }
+    summary = {
+        "total": 1,
+        "passed": 0,
+        "failed": 1,
+        "wall_time_ms": 12.0,
+        "latency": {"overall": {"p50": 12.0, "p90": 12.0, "p99": 12.0, "max": 12.0}, "per_endpoint": {}},
+    }
+    monkeypatch.setattr(ai_test_executor, "execute_ai_tests", lambda **kwargs: {"summary": summary, "results": [entry]})
+
+    assert ai_test_executor.run_ai_tests(base_url="http://example.invalid") == 1
+
+    with session_factory() as db:
+        run = get_test_run(db, 1)
+        assert (run.run_type, run.status) == ("ai_executor", "failed")
+        assert run.results is None  # stored once, as test_results rows
+        (row,) = list_test_results(db, run.id)
+        assert (row.test, row.outcome, row.message) == ("GET /projects/::list projects", "failed", "HTTP 500")
+        assert get_flakiness_for_tests(db, [row.test])[row.test].runs == 1
+
+
+def _execute(session_factory, deadline=None):
+    return ai_test_executor.execute_ai_tests(
+        "http://app.local", use_auth=False, deadline=deadline, corpus_session_factory=session_factory
+    )
+
+
+def test_corpus_is_kept_in_the_given_database(monkeypatch, session_factory):
+    schema = {"paths": {"/projects/": {"get": {"responses": {"200": {"description": "ok"}}}}}}
+    monkeypatch.setattr(test_corpus, "fetch_openapi_schema", lambda base_url: schema)
+    monkeypatch.setattr(
+        test_corpus,
+        "generate_test_cases_for_paths",
+        lambda paths, schema=None: [{"name": "list", "request": {"method": "GET", "path": "/projects/"}}],
+    )
+    monkeypatch.setattr(ai_test_executor, "_run_single_test", _pass)
+
+    assert _execute(session_factory)["summary"]["generation"]["llm_calls"] == 1
+    with session_factory() as db:
+        assert [row.endpoint for row in list_corpus(db)] == ["GET /projects/"]
+    assert _execute(session_factory)["summary"]["generation"]["llm_calls"] == 0
+
+
+async def _pass(client, semaphore, entry):
+    entry["passed"] = True
+
+
+def test_deadline_counts_generation_time(monkeypatch, session_factory):
+    def slow_generation(corpus_session_factory, **kwargs):
+        time.sleep(0.3)
+        return {"cases": [{"name": "list projects", "request": {"method": "GET", "path": "/projects/"}}], "llm_calls": 1}
+
+    async def slow_request(client, semaphore, entry):
+        await asyncio.sleep(0.3)
+        entry["passed"] = True
+
+    monkeypatch.setattr(ai_test_executor, "get_corpus_test_cases", slow_generation)
+    monkeypatch.setattr(ai_test_executor, "_run_single_test", slow_request)
+
+    # Either step alone fits in 0.5s; together they do not.
+    data = _execute(session_factory, deadline=0.5)
+    assert data["summary"]["generation"]["generation_ms"] >= 300
+    assert data["results"][0]["passed"] is False
+    assert data["results"][0]["error"] == "Cancelled: run deadline of 0.5s exceeded"
+
+
+def test_deadline_expiring_during_generation_stops_gemini_calls(monkeypatch, session_factory):
+    stopped = []
+
+    def stuck_generation(corpus_session_factory, **kwargs):
+        scope = current_call_scope.get()
+        try:
+            while True:
+                scope.sleep(0.05)  # what GeminiClient does between attempts
+        except AICallCancelled:
+            stopped.append(True)
+            raise
+
+    monkeypatch.setattr(ai_test_executor, "get_corpus_test_cases", stuck_generation)
+
+    with pytest.raises(TimeoutError, match="while generating test cases"):
+        _execute(session_factory, deadline=0.2)
+    assert stopped == [True]
@@ -0,0 +1,97 @@
+import asyncio
+
+from ai_tools.browser_pool import BrowserPool, _BrowserSlot
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def new_context(self, **options):
+        ctx = FakeContext(self)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.closed = True
+
+
+def _fake_pool(monkeypatch, **kwargs):
+    pool = BrowserPool(**kwargs)
+    launched = []
+
+    async def fake_launch():
+        browser = FakeBrowser()
+        launched.append(browser)
+        pool._generation += 1
+        return _BrowserSlot(browser, pool._generation)
+
+    monkeypatch.setattr(pool, "_launch", fake_launch)
+    return pool, launched
+
+
+def test_recycles_after_n_uses_without_killing_open_contexts(monkeypatch):
+    async def scenario():
+        pool, launched = _fake_pool(monkeypatch, max_contexts=4, recycle_after=2)
+
+        async with pool.context() as first:
+            async with pool.context():
+                pass
+            # third context triggers a recycle while `first` is still open
+            async with pool.context() as third:
+                assert third.browser is launched[1]
+            assert not launched[0].closed
+        assert first.closed
+        assert launched[0].closed
+
+        health = await pool.health()
+        assert (health["contexts_served"], health["relaunches"], health["active_contexts"]) == (3, 1, 0)
+        await pool.close()
+        assert launched[1].closed
+
+    asyncio.run(scenario())
+
+
+def test_relaunches_disconnected_browser(monkeypatch):
+    async def scenario():
+        pool, launched = _fake_pool(monkeypatch, recycle_after=0)
+        async with pool.context():
+            pass
+        launched[0].connected = False
+        async with pool.context() as ctx:
+            assert ctx.browser is launched[1]
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_limits_concurrent_contexts(monkeypatch):
+    async def scenario():
+        pool, _ = _fake_pool(monkeypatch, max_contexts=2)
+        peak = 0
+
+        async def worker():
+            nonlocal peak
+            async with pool.context():
+                peak = max(peak, (await pool.health())["active_contexts"])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(worker() for _ in range(6)))
+        await pool.close()
+        return peak
+
+    assert asyncio.run(scenario()) == 2
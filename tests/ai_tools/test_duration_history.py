@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from ai_tools.duration_history import WINDOW_SIZE, duration_regressions, record_run_durations, robust_baseline
+from ai_tools.junit_ingest import ingest_junit_reports
+from ai_tools.pytest_durations import junit_test_id
+from backend.crud.test_duration import get_baseline, list_duration_history
+from backend.crud.test_run import create_test_run
+
+
+def _record(db, durations):
+    run = create_test_run(db, run_type="api", status="passed")
+    record_run_durations(db, run.id, durations)
+    db.commit()
+    return run.id
+
+
+def test_robust_baseline():
+    assert robust_baseline([1.0, 2.0, 3.0, 4.0, 100.0]) == (3.0, 1.0)
+
+
+def test_slow_run_is_flagged_against_previous_baseline(db):
+    for i in range(6):
+        _record(db, {"s::test_stable": 1.0 + 0.01 * (i % 3), "s::test_new": 0.5})
+    slow_run = _record(db, {"s::test_stable": 2.0, "s::test_new": 0.51})
+
+    (flagged,) = duration_regressions(db, slow_run)
+    assert flagged["test"] == "s::test_stable"
+    assert flagged["baseline_median"] == pytest.approx(1.01)
+    assert flagged["slowdown"] == pytest.approx(0.99)
+    # A stricter threshold lets it pass; the stored baseline makes this a pure query.
+    assert duration_regressions(db, slow_run, threshold=1000) == []
+
+    baseline = get_baseline(db, "s::test_stable")
+    assert baseline.samples == 7
+    assert list_duration_history(db, "s::test_stable", limit=1)[0].duration == 2.0
+
+
+def test_baseline_window_is_bounded(db):
+    for i in range(WINDOW_SIZE + 5):
+        _record(db, {"s::t": float(i)})
+    baseline = get_baseline(db, "s::t")
+    assert baseline.samples == WINDOW_SIZE + 5
+    assert baseline.window == [float(i) for i in range(5, WINDOW_SIZE + 5)]
+
+
+def test_ingest_records_passing_durations(db):
+    report = (
+        b'<testsuite><testcase classname="s" name="test_ok" time="0.2" />'
+        b'<testcase classname="s" name="test_bad" time="0.3"><failure message="x" /></testcase></testsuite>'
+    )
+    run = ingest_junit_reports(db, [("r.xml", io.BytesIO(report))])
+    assert [h.test_run_id for h in list_duration_history(db, "s::test_ok")] == [run.id]
+    assert list_duration_history(db, "s::test_bad") == []
+
+
+def test_junit_test_id_matches_junitxml_naming():
+    assert junit_test_id("tests/api/test_auth.py::test_login") == "tests.api.test_auth::test_login"
+    assert junit_test_id("tests/ui/test_x.py::TestA::test_b[chromium]") == "tests.ui.test_x.TestA::test_b[chromium]"
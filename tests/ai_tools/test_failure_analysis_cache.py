@@ -0,0 +1,74 @@
+import pytest
+
+from ai_tools import failure_analyzer
+from ai_tools.failure_clustering import cluster_failures
+from backend.crud import failure_analysis as analysis_crud
+from backend.models import failure_analysis as analysis_models  # noqa: F401
+
+
+def _failure(test, message):
+    return {"test": test, "type": "failure", "message": message, "details": f"E   {message}"}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    calls = []
+
+    def fake_individually(clusters):
+        calls.append([c["signature"] for c in clusters])
+        return {c["signature"]: f"analysis of {c['message']}" for c in clusters}
+
+    monkeypatch.setattr(failure_analyzer, "analyze_clusters_individually", fake_individually)
+    return calls
+
+
+def test_only_unseen_signatures_are_analyzed(db, fake_llm):
+    first = cluster_failures([_failure("t::a", "assert 500 == 200"), _failure("t::b", "KeyError: 'id'")])
+    result = failure_analyzer.analyze_clusters_cached(db, first)
+    assert result["cache"] == {"hits": 0, "misses": 2}
+    assert not any(c["cached"] for c in first)
+
+    second = cluster_failures(
+        [_failure("t::c", "assert 500 == 200"), _failure("t::d", "TimeoutError")]
+    )
+    result = failure_analyzer.analyze_clusters_cached(db, second)
+    assert result["cache"] == {"hits": 1, "misses": 1}
+    assert len(fake_llm) == 2 and len(fake_llm[1]) == 1
+    by_msg = {c["message"]: c for c in second}
+    assert by_msg["assert 500 == 200"]["cached"] is True
+    assert by_msg["assert 500 == 200"]["analysis"] == "analysis of assert 500 == 200"
+    assert "(cached)" in result["analysis"]
+
+    repeat = cluster_failures([_failure("t::c", "assert 500 == 200"), _failure("t::d", "TimeoutError")])
+    result = failure_analyzer.analyze_clusters_cached(db, repeat)
+    assert result["cache"] == {"hits": 2, "misses": 0}
+    assert len(fake_llm) == 2
+
+
+def test_refresh_ignores_cache(db, fake_llm):
+    clusters = cluster_failures([_failure("t::a", "assert 500 == 200")])
+    failure_analyzer.analyze_clusters_cached(db, clusters)
+    result = failure_analyzer.analyze_clusters_cached(db, clusters, refresh=True)
+    assert result["cache"] == {"hits": 0, "misses": 1}
+    assert len(fake_llm) == 2
+
+
+def test_signature_saved_concurrently_is_updated_not_duplicated(session_factory, db, monkeypatch):
+    clusters = cluster_failures([_failure("t::a", "assert 500 == 200")])
+    sig = clusters[0]["signature"]
+    read = analysis_crud.get_analyses_by_signatures
+    raced = []
+
+    def read_then_lose_the_race(session, signatures):
+        seen = read(session, signatures)
+        if not raced:
+            raced.append(True)
+            with session_factory() as other:
+                analysis_crud.save_analyses(other, {sig: "other request's analysis"}, clusters)
+        return seen
+
+    monkeypatch.setattr(analysis_crud, "get_analyses_by_signatures", read_then_lose_the_race)
+    analysis_crud.save_analyses(db, {sig: "this request's analysis"}, clusters)
+
+    rows = db.query(analysis_models.FailureAnalysis).all()
+    assert [(r.signature, r.analysis) for r in rows] == [(sig, "this request's analysis")]
@@ -0,0 +1,47 @@
+import io
+
+from ai_tools.failure_analyzer import iter_junit_testcases, parse_junit_report
+
+REPORT = b"""<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="shard0">
+    <testcase classname="tests.api.test_auth" name="test_ok" time="0.5" />
+    <testcase classname="tests.api.test_auth" name="test_fail" time="1.25">
+      <failure message="assert 500 == 200">E   assert 500 == 200</failure>
+      <system-out>noise</system-out>
+    </testcase>
+  </testsuite>
+  <testsuite name="shard1">
+    <testcase classname="tests.api.test_bugs" name="test_error" time="0.1">
+      <error message="fixture failed">ConnectionError</error>
+    </testcase>
+    <testcase classname="tests.api.test_bugs" name="test_skip" time="0">
+      <skipped message="not ready" />
+    </testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+def test_iter_junit_testcases_outcomes():
+    records = list(iter_junit_testcases(io.BytesIO(REPORT)))
+    assert [r["outcome"] for r in records] == ["passed", "failed", "error", "skipped"]
+    assert records[1]["test"] == "tests.api.test_auth::test_fail"
+    assert records[1]["details"] == "E   assert 500 == 200"
+    assert records[1]["time"] == 1.25
+
+
+def test_parse_junit_report_counts_and_failures_in_one_pass():
+    report = parse_junit_report(io.BytesIO(REPORT), slowest=2)
+    stats = report["stats"]
+
+    assert (stats["total"], stats["passed"], stats["failed"], stats["errors"], stats["skipped"]) == (4, 1, 1, 1, 1)
+    assert stats["duration"] == 1.85
+    assert [s["test"] for s in stats["slowest"]] == [
+        "tests.api.test_auth::test_fail",
+        "tests.api.test_auth::test_ok",
+    ]
+    assert [(f["test"], f["type"]) for f in report["failures"]] == [
+        ("tests.api.test_auth::test_fail", "failure"),
+        ("tests.api.test_bugs::test_error", "error"),
+    ]
@@ -0,0 +1,48 @@
+from ai_tools.failure_clustering import cluster_failures, failure_signature, normalize_failure_text
+
+
+def _failure(test, details, message="assert 500 == 200", type_="failure"):
+    return {"test": test, "type": type_, "message": message, "details": details}
+
+
+def test_normalize_strips_run_specific_values():
+    text = (
+        "<Response at 0x7f3a2b1c> for /projects/42 user tester+1a2b3c4d@example.com "
+        "id=17 run 123e4567-e89b-12d3-a456-426614174000 tests/api/test_bugs.py:88"
+    )
+    normalized = normalize_failure_text(text)
+    assert "0x7f3a2b1c" not in normalized
+    assert "/projects/<ID>" in normalized
+    assert "+<HEX>@" in normalized
+    assert "id=<ID>" in normalized
+    assert "<UUID>" in normalized
+    assert "test_bugs.py:<L>" in normalized
+
+
+def test_same_assertion_at_different_ids_clusters_together():
+    failures = [
+        _failure(
+            f"tests.api.test_bugs::test_{i}",
+            f"r = client.get('/bugs/{i}')\nE   assert 500 == 200\ntests/api/test_bugs.py:{10 + i}: AssertionError",
+        )
+        for i in range(500)
+    ]
+    failures.append(
+        _failure(
+            "tests.api.test_auth::test_login",
+            "E   KeyError: 'access_token'\ntests/api/conftest.py:70: KeyError",
+            message="KeyError",
+        )
+    )
+
+    clusters = cluster_failures(failures)
+
+    assert [c["count"] for c in clusters] == [500, 1]
+    assert clusters[0]["representative"]["test"] == "tests.api.test_bugs::test_0"
+    assert len(clusters[0]["tests"]) == 50
+
+
+def test_different_status_codes_are_different_failure_modes():
+    a = _failure("t1", "E   assert 500 == 200\ntests/api/test_x.py:1: AssertionError")
+    b = _failure("t2", "E   assert 404 == 200\ntests/api/test_x.py:1: AssertionError")
+    assert failure_signature(a) != failure_signature(b)
@@ -0,0 +1,83 @@
+import inspect
+
+import pytest
+
+from ai_tools import failure_analyzer
+from ai_tools.failure_clustering import cluster_failures
+from ai_tools.flaky_tests import RECENT_WINDOW, flaky_tests_among, record_run_outcomes
+from backend.crud.test_flakiness import get_flakiness_for_tests, list_flaky_tests
+from backend.crud.test_run import create_test_run
+
+
+def _record(db, outcomes):
+    run = create_test_run(db, run_type="api", status="passed")
+    record_run_outcomes(db, run.id, outcomes)
+    db.commit()
+    return run.id
+
+
+def test_alternating_test_ranks_above_consistently_broken(db):
+    for i in range(10):
+        _record(
+            db,
+            {
+                "s::test_flaky": "passed" if i % 2 else "failed",
+                "s::test_broke_once": "passed" if i < 3 else "failed",
+                "s::test_stable": "passed",
+                "s::test_skipped": "skipped",
+            },
+        )
+
+    rows = get_flakiness_for_tests(db, ["s::test_flaky", "s::test_broke_once", "s::test_skipped"])
+    assert "s::test_skipped" not in rows
+    assert rows["s::test_flaky"].runs == 10
+    assert rows["s::test_flaky"].flips == 9
+    assert rows["s::test_flaky"].recent_flip_rate == pytest.approx(1.0)
+    assert rows["s::test_broke_once"].failures == 7
+    assert rows["s::test_broke_once"].flips == 1
+
+    ranked = [row.test for row in list_flaky_tests(db)]
+    assert ranked == ["s::test_flaky", "s::test_broke_once"]
+    assert set(flaky_tests_among(db, ["s::test_flaky", "s::test_broke_once", "s::test_stable"])) == {"s::test_flaky"}
+
+
+def test_recent_window_forgets_old_flakiness(db):
+    for i in range(10):
+        _record(db, {"s::t": "passed" if i % 2 else "failed"})
+    for _ in range(RECENT_WINDOW):
+        _record(db, {"s::t": "passed"})
+
+    row = get_flakiness_for_tests(db, ["s::t"])["s::t"]
+    assert row.recent == "P" * RECENT_WINDOW
+    assert row.flips == 9
+    assert flaky_tests_among(db, ["s::t"]) == {}
+
+
+def test_analyzer_marks_flaky_clusters_locally(db, monkeypatch):
+    for i in range(6):
+        _record(db, {"s::test_flaky": "passed" if i % 2 else "failed", "s::test_real": "passed"})
+    monkeypatch.setattr(
+        failure_analyzer,
+        "analyze_clusters_individually",
+        lambda clusters: {c["signature"]: "analysis" for c in clusters},
+    )
+
+    failures = [
+        {"test": "s::test_flaky", "type": "failure", "message": "TimeoutError", "details": "E   TimeoutError"},
+        {"test": "s::test_real", "type": "failure", "message": "assert 500 == 200", "details": "E   assert 500 == 200"},
+    ]
+    clusters = cluster_failures(failures)
+    flaky = failure_analyzer.annotate_flaky_failures(db, failures, clusters)
+    assert [f["test"] for f in flaky] == ["s::test_flaky"]
+
+    by_msg = {c["message"]: c for c in clusters}
+    assert by_msg["TimeoutError"]["all_flaky"] is True
+    assert by_msg["assert 500 == 200"]["flaky_tests"] == []
+    assert by_msg["assert 500 == 200"]["all_flaky"] is False
+
+    result = failure_analyzer.analyze_clusters_cached(db, clusters)
+    assert "Known flaky from run history (1 of 1 test(s)): s::test_flaky" in result["analysis"]
+
+
+def test_llm_prompt_no_longer_asks_about_flakiness():
+    assert "flaky" not in inspect.getsource(failure_analyzer.analyze_clusters_with_gemini)
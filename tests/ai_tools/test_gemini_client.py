@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+from ai_tools import gemini_client
+from ai_tools.failure_analyzer import analyze_clusters_individually
+from ai_tools.failure_clustering import cluster_failures
+from ai_tools.gemini_client import (
+    AICallCancelled,
+    CallScope,
+    GeminiClient,
+    GeminiRateLimitError,
+    RateLimiter,
+    current_call_scope,
+    get_gemini_model,
+)
+from ai_tools.gemini_fake import FakeGeminiModel
+from backend.api.deps import ai_http_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    gemini_client.reset_gemini_clients()
+    yield
+    gemini_client.reset_gemini_clients()
+
+
+def _client(model, clock=None, **kwargs):
+    clock = clock or FakeClock()
+    limiter = RateLimiter(rpm=kwargs.pop("rpm", 60), tpm=kwargs.pop("tpm", 100_000), clock=clock, sleep=clock.sleep)
+    return GeminiClient(model, limiter, sleep=clock.sleep, **kwargs)
+
+
+def test_rate_limiter_enforces_requests_and_tokens_per_minute():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=2, tpm=1000, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire(10) == 0
+    assert limiter.acquire(10) == 0
+    assert limiter.acquire(10) == pytest.approx(30.0)  # one request refills every 30s
+
+    clock.now += 120
+    assert limiter.acquire(1000) == 0
+    assert limiter.acquire(500) == pytest.approx(30.0)  # 500 tokens refill in 30s
+
+
+def test_identical_concurrent_prompts_are_coalesced():
+    model = FakeGeminiModel(responder=lambda p: "ok", latency=0.2)
+    client = _client(model)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.generate_content("same prompt"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(model.prompts) == 1
+    assert client.stats["coalesced"] == 4
+    assert {r.text for r in results} == {"ok"}
+
+
+def _in_scope(scope, fn):
+    token = current_call_scope.set(scope)
+    try:
+        return fn()
+    finally:
+        current_call_scope.reset(token)
+
+
+def test_follower_takes_over_when_the_leaders_scope_is_cancelled():
+    model = FakeGeminiModel(responder=lambda p: "ok", latency=0.1, rate_limit_first=1)
+    client = _client(model)
+    client._backoff = lambda attempt: 5.0  # leader sits in backoff until cancelled
+    leader_scope = CallScope()
+    outcome = {}
+
+    def leader():
+        try:
+            _in_scope(leader_scope, lambda: client.generate_content("same prompt"))
+        except AICallCancelled as e:
+            outcome["leader"] = e
+
+    def follower():
+        outcome["follower"] = client.generate_content("same prompt")
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+    threads[0].start()
+    time.sleep(0.05)
+    threads[1].start()
+    time.sleep(0.2)
+    leader_scope.cancel()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert isinstance(outcome["leader"], AICallCancelled)
+    assert outcome["follower"].text == "ok"
+    assert len(model.prompts) == 2
+
+
+def test_follower_stops_waiting_at_its_own_deadline():
+    client = _client(FakeGeminiModel(responder=lambda p: "ok", latency=1.0))
+    leader = threading.Thread(target=lambda: client.generate_content("same prompt"))
+    leader.start()
+    time.sleep(0.05)
+
+    start = time.monotonic()
+    with pytest.raises(AICallCancelled):
+        _in_scope(CallScope(deadline=time.monotonic() + 0.2), lambda: client.generate_content("same prompt"))
+    assert time.monotonic() - start < 0.6
+    leader.join()
+
+
+def test_rate_limit_errors_are_retried_then_reported_as_429():
+    clock = FakeClock()
+    client = _client(FakeGeminiModel(responder=lambda p: "ok", rate_limit_first=2), clock, max_retries=3)
+    assert client.generate_content("p").text == "ok"
+    assert client.stats["retries"] == 2
+    assert clock.now > 0
+
+    failing = _client(FakeGeminiModel(rate_limit_first=10), max_retries=2)
+    with pytest.raises(GeminiRateLimitError) as excinfo:
+        failing.generate_content("p")
+    http_error = ai_http_error(excinfo.value)
+    assert http_error.status_code == 429
+    assert "Retry-After" in http_error.headers
+
+
+def test_analysis_runs_offline_against_fake_backend():
+    fake = FakeGeminiModel()
+    get_gemini_model(model=fake)
+    clusters = cluster_failures(
+        [
+            {"test": "t::a", "type": "failure", "message": "assert 500 == 200", "details": "E   assert 500 == 200"},
+            {"test": "t::b", "type": "error", "message": "KeyError", "details": "E   KeyError: 'id'"},
+        ]
+    )
+
+    analyses = analyze_clusters_individually(clusters)
+    assert set(analyses) == {c["signature"] for c in clusters}
+    assert len(fake.prompts) == 1
@@ -0,0 +1,65 @@
+import gzip
+import io
+
+import pytest
+
+from ai_tools.junit_ingest import ingest_junit_reports, open_report_stream
+from backend.crud.test_result import count_outcomes, list_test_results
+from backend.crud.test_run import list_test_runs
+from backend.models import test_result as result_models  # noqa: F401
+
+
+def _report(suite, n_pass, n_fail):
+    cases = [f'<testcase classname="{suite}" name="test_p{i}" time="0.01" />' for i in range(n_pass)]
+    cases += [
+        f'<testcase classname="{suite}" name="test_f{i}" time="0.5"><failure message="boom">E boom</failure></testcase>'
+        for i in range(n_fail)
+    ]
+    return f'<testsuite name="{suite}">{"".join(cases)}</testsuite>'.encode()
+
+
+def test_open_report_stream_detects_gzip_by_content():
+    raw = _report("s", 1, 0)
+    assert open_report_stream(io.BytesIO(gzip.compress(raw))).read() == raw
+    assert open_report_stream(io.BytesIO(raw)).read() == raw
+
+
+def test_ingest_merges_shards_in_batches(db):
+    reports = [
+        ("shard0.xml", io.BytesIO(_report("a", 25, 2))),
+        ("shard1.xml.gz", io.BytesIO(gzip.compress(_report("b", 10, 1)))),
+    ]
+    run = ingest_junit_reports(db, reports, run_type="ui", batch_size=7)
+
+    assert run.run_type == "ui"
+    assert run.status == "failed"
+    assert run.results is None
+    assert run.summary["total"] == 38
+    assert run.summary["shards"] == [{"name": "shard0.xml", "total": 27}, {"name": "shard1.xml.gz", "total": 11}]
+    assert count_outcomes(db, run.id) == {"passed": 35, "failed": 3}
+    assert {r.shard for r in list_test_results(db, run.id, outcome=["failed"])} == {"shard0.xml", "shard1.xml.gz"}
+
+
+def test_ingest_marks_run_error_on_bad_xml(db):
+    with pytest.raises(Exception):
+        ingest_junit_reports(db, [("bad.xml", io.BytesIO(b"<testsuite><testcase"))])
+    (run,) = list_test_runs(db)
+    assert run.status == "error"
+    assert count_outcomes(db, run.id) == {}
+
+
+def test_ingest_keeps_xdist_worker_of_merged_report(db):
+    def case(name, worker):
+        return (
+            f'<testcase classname="s" name="{name}" time="0.1"><properties>'
+            f'<property name="xdist_worker" value="{worker}" /></properties></testcase>'
+        )
+
+    report = f'<testsuites><testsuite name="pytest">{case("test_a", "gw0")}{case("test_b", "gw1")}</testsuite></testsuites>'
+    run = ingest_junit_reports(db, [("junit.xml", io.BytesIO(report.encode()))])
+
+    assert run.summary["shards"] == [{"name": "junit.xml", "total": 2}]
+    assert {r.test: r.shard for r in list_test_results(db, run.id)} == {
+        "s::test_a": "junit.xml/gw0",
+        "s::test_b": "junit.xml/gw1",
+    }
@@ -0,0 +1,48 @@
+from ai_tools.latency import LatencyHistogram, latency_stats, percentile, summarize_latencies
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 90) == 90
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) is None
+
+
+def test_latency_stats_empty():
+    stats = latency_stats([])
+    assert stats["count"] == 0
+    assert stats["p99"] is None
+
+
+def test_summarize_latencies_groups_by_endpoint_and_skips_errors():
+    results = [
+        {"endpoint": "GET /projects/", "status_code": 200, "elapsed_ms": 10.0, "ttfb_ms": 8.0},
+        {"endpoint": "GET /projects/", "status_code": 200, "elapsed_ms": 30.0, "ttfb_ms": 9.0},
+        {"endpoint": "GET /projects/{project_id}", "status_code": 404, "elapsed_ms": 5.0, "ttfb_ms": 4.0},
+        # connection error: no response, must not skew latency
+        {"endpoint": "GET /projects/", "status_code": None, "elapsed_ms": 15000.0, "ttfb_ms": None},
+    ]
+    summary = summarize_latencies(results)
+
+    assert summary["overall"]["count"] == 3
+    assert summary["overall"]["max"] == 30.0
+    assert summary["per_endpoint"]["GET /projects/"]["p50"] == 10.0
+    assert summary["per_endpoint"]["GET /projects/{project_id}"]["count"] == 1
+    assert summary["ttfb"]["max"] == 9.0
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(float(ms))
+
+    assert hist.total_count == 1000
+    for pct, exact in ((50, 500.0), (90, 900.0), (99, 990.0)):
+        assert abs(hist.value_at_percentile(pct) - exact) / exact < 0.01
+    assert hist.value_at_percentile(100) == 1000.0
+
+    snapshot = hist.to_dict()
+    assert snapshot["min"] == 1.0
+    assert sum(count for _, count in snapshot["buckets"]) == 1000
@@ -0,0 +1,66 @@
+from ai_tools.openapi_compact import compact_openapi, render_type
+
+VALIDATION_422 = {
+    "description": "Validation Error",
+    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}},
+}
+
+SCHEMA = {
+    "paths": {
+        "/projects/{project_id}/bugs": {
+            "post": {
+                "summary": "Create Bug",
+                "security": [{"OAuth2PasswordBearer": []}],
+                "parameters": [
+                    {"name": "project_id", "in": "path", "required": True, "schema": {"type": "integer", "title": "Project Id"}}
+                ],
+                "requestBody": {
+                    "required": True,
+                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/BugCreate"}}},
+                },
+                "responses": {
+                    "201": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/BugOut"}}}},
+                    "422": VALIDATION_422,
+                },
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "BugCreate": {
+                "type": "object",
+                "required": ["title"],
+                "properties": {
+                    "title": {"type": "string", "title": "Title"},
+                    "description": {"anyOf": [{"type": "string"}, {"type": "null"}], "title": "Description"},
+                },
+            },
+            "BugOut": {"type": "object", "properties": {"id": {"type": "integer"}}},
+            "Unused": {"type": "object", "properties": {"x": {"type": "string"}}},
+            "HTTPValidationError": {"type": "object", "properties": {"detail": {"type": "array"}}},
+            "ValidationError": {"type": "object", "properties": {"msg": {"type": "string"}}},
+        }
+    },
+}
+
+
+def test_render_type_nullable_and_list():
+    assert render_type({"anyOf": [{"type": "string"}, {"type": "null"}]}) == "str?"
+    assert render_type({"type": "array", "items": {"$ref": "#/components/schemas/BugOut"}}) == "[BugOut]"
+
+
+def test_compact_resolves_only_referenced_components_and_drops_422():
+    result = compact_openapi(SCHEMA["paths"], SCHEMA)
+    text = result["text"]
+
+    assert (
+        "POST /projects/{project_id}/bugs [auth] path(project_id!:int) body!:BugCreate -> 201:BugOut  # Create Bug"
+        in text
+    )
+    assert "BugCreate {title!:str,description:str?}" in text
+    assert "BugOut {id:int}" in text
+    assert "Unused" not in text
+    assert "HTTPValidationError" not in text
+    assert "422" not in text.split("Operations:")[1]
+    assert result["stats"]["components"] == 2
+    assert result["stats"]["tokens_after"] < result["stats"]["tokens_before"]
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import text
+
+from ai_tools.run_diff import diff_test_runs, merge_join
+from backend.crud.test_result import bulk_insert_test_results
+from backend.crud.test_run import create_test_run
+
+
+def _run(db, results):
+    run = create_test_run(db, run_type="api", status="passed")
+    bulk_insert_test_results(
+        db, run.id, [{"test": test, "outcome": outcome, "duration": duration} for test, outcome, duration in results]
+    )
+    db.commit()
+    return run.id
+
+
+def test_merge_join_is_a_full_outer_join():
+    left = iter([("a", "passed", 1.0), ("c", "passed", 1.0), ("c", "failed", 1.0)])
+    right = iter([("b", "passed", 1.0), ("c", "passed", 2.0)])
+    joined = [(test, a and a[1], b and b[1]) for test, a, b in merge_join(left, right)]
+    # "c" ran in two shards of the left run; the failing copy wins.
+    assert joined == [("a", "passed", None), ("b", None, "passed"), ("c", "failed", "passed")]
+
+
+def test_diff_reports_outcome_changes_membership_and_latency(db):
+    base = _run(
+        db,
+        [
+            ("s::test_breaks", "passed", 1.0),
+            ("s::test_fixed", "failed", 1.0),
+            ("s::test_slower", "passed", 1.0),
+            ("s::test_faster", "passed", 2.0),
+            ("s::test_removed", "passed", 1.0),
+            ("s::test_noise", "passed", 1.0),
+        ],
+    )
+    head = _run(
+        db,
+        [
+            ("s::test_noise", "passed", 1.01),
+            ("s::test_faster", "passed", 0.5),
+            ("s::test_added", "skipped", 0.0),
+            ("s::test_slower", "passed", 3.0),
+            ("s::test_fixed", "passed", 1.0),
+            ("s::test_breaks", "error", 1.0),
+        ],
+    )
+
+    diff = diff_test_runs(db, base, head)
+    assert diff["counts"] == {
+        "common": 5,
+        "newly_failing": 1,
+        "newly_passing": 1,
+        "added": 1,
+        "removed": 1,
+        "slower": 1,
+        "faster": 1,
+    }
+    assert diff["newly_failing"] == [{"test": "s::test_breaks", "base_outcome": "passed", "head_outcome": "error"}]
+    assert [t["test"] for t in diff["newly_passing"]] == ["s::test_fixed"]
+    assert diff["added"] == [{"test": "s::test_added", "outcome": "skipped"}]
+    assert diff["removed"] == [{"test": "s::test_removed", "outcome": "passed"}]
+    assert diff["slower"][0]["test"] == "s::test_slower" and diff["slower"][0]["delta"] == pytest.approx(2.0)
+    assert diff["faster"][0]["delta"] == pytest.approx(-1.5)
+    assert diff["total_duration_delta"] == pytest.approx(0.51)
+
+
+def test_lists_are_capped_but_counts_exact(db):
+    base = _run(db, [(f"s::t{i:03d}", "passed", 1.0) for i in range(50)])
+    head = _run(db, [(f"s::t{i:03d}", "failed" if i % 2 else "passed", 1.0 + i) for i in range(50)])
+
+    diff = diff_test_runs(db, base, head, limit=3)
+    assert diff["counts"]["newly_failing"] == 25
+    assert [t["test"] for t in diff["newly_failing"]] == ["s::t001", "s::t003", "s::t005"]
+    # Only tests passing in both runs get latency deltas; the largest come first.
+    assert diff["counts"]["slower"] == 24
+    assert [t["test"] for t in diff["slower"]] == ["s::t048", "s::t046", "s::t044"]
+
+
+def test_results_are_read_in_index_order(db):
+    plan = db.execute(
+        text("EXPLAIN QUERY PLAN SELECT test, outcome, duration FROM test_results WHERE test_run_id = 1 ORDER BY test")
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_test_results_run_test" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_executor_runs_are_diffable(db):
+    from ai_tools.ai_test_executor import record_executor_run_results
+
+    def executor_run(passed):
+        run = create_test_run(db, run_type="ai_executor", status="passed")
+        entry = {
+            "endpoint": "GET /projects/",
+            "name": "list",
+            "passed": passed,
+            "status_code": 200 if passed else 500,
+            "error": None,
+            "elapsed_ms": 12.0,
+        }
+        record_executor_run_results(db, run.id, [entry])
+        return run.id
+
+    diff = diff_test_runs(db, executor_run(True), executor_run(False))
+    assert diff["newly_failing"] == [
+        {"test": "GET /projects/::list", "base_outcome": "passed", "head_outcome": "failed"}
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_tools.duration_history import record_run_durations
+from ai_tools.run_retention import compact_test_runs, rehydrate_test_run, run_compaction_periodically
+from backend.crud.test_duration import list_run_durations
+from backend.crud.test_result import bulk_insert_test_results, list_test_results
+from backend.crud.test_run import create_test_run, finish_test_run, get_test_run
+from backend.crud.test_run_archive import get_archive
+
+
+def _run(db, n=200, status="failed"):
+    run = create_test_run(db, run_type="api", status="running")
+    rows = [
+        {
+            "test": f"tests.api.test_mod::test_{i}",
+            "classname": "tests.api.test_mod",
+            "name": f"test_{i}",
+            "outcome": "failed" if i % 10 == 0 else "passed",
+            "duration": 0.01 * i,
+            "message": "assert 500 == 200" if i % 10 == 0 else None,
+            "details": "E   assert 500 == 200" if i % 10 == 0 else None,
+            "shard": "r.xml",
+        }
+        for i in range(n)
+    ]
+    bulk_insert_test_results(db, run.id, rows)
+    record_run_durations(db, run.id, {r["test"]: r["duration"] for r in rows if r["outcome"] == "passed"})
+    if status != "running":
+        finish_test_run(db, run, status=status, summary={"total": n}, results=[{"name": "x", "passed": False}])
+    db.commit()
+    return run.id
+
+
+def _result_tuples(db, run_id):
+    return [(r.test, r.outcome, r.duration, r.message, r.shard) for r in list_test_results(db, run_id)]
+
+
+def test_old_runs_are_archived_and_can_be_rehydrated(db):
+    old = _run(db)
+    running = _run(db, status="running")
+    before = _result_tuples(db, old)
+    durations_before = [(d.test, d.duration, d.baseline_samples, d.recorded_at) for d in list_run_durations(db, old)]
+    later = datetime.utcnow() + timedelta(days=31)
+
+    stats = compact_test_runs(db, raw_days=30, now=later)
+    assert stats["archived"] == 1
+    assert stats["compressed_bytes"] < stats["raw_bytes"]
+    assert list_test_results(db, old) == []
+    assert list_run_durations(db, old) == []
+    assert len(list_test_results(db, running)) == 200  # still in progress
+    run = get_test_run(db, old)
+    assert run.results is None and run.summary == {"total": 200}
+    archive = get_archive(db, old)
+    assert (archive.status, archive.result_count, archive.outcome_counts) == ("archived", 200, {"failed": 20, "passed": 180})
+
+    # Recent runs and a second pass leave everything as is.
+    assert compact_test_runs(db, raw_days=30)["archived"] == 0
+    assert compact_test_runs(db, raw_days=30, now=later)["archived"] == 0
+
+    rehydrate_test_run(db, run, archive)
+    assert _result_tuples(db, old) == before
+    durations_after = [(d.test, d.duration, d.baseline_samples, d.recorded_at) for d in list_run_durations(db, old)]
+    assert len(durations_after) == 180 and durations_after == durations_before
+    assert get_test_run(db, old).results == [{"name": "x", "passed": False}]
+
+    # Kept raw for another raw_days, then compacted again from the same archive.
+    soon = datetime.utcnow() + timedelta(days=29)
+    assert compact_test_runs(db, raw_days=30, now=soon)["rearchived"] == 0
+    assert compact_test_runs(db, raw_days=30, now=later)["rearchived"] == 1
+    assert list_test_results(db, old) == []
+    assert list_run_durations(db, old) == []
+    assert get_archive(db, old).status == "archived"
+
+
+def test_expired_archives_keep_only_the_rollup(db):
+    run_id = _run(db, n=20)
+    far = datetime.utcnow() + timedelta(days=400)
+
+    stats = compact_test_runs(db, raw_days=30, archive_days=365, vacuum=True, now=far)
+    assert (stats["archived"], stats["expired"], stats["vacuumed"]) == (1, 1, True)
+    archive = get_archive(db, run_id)
+    assert archive.status == "expired" and archive.payload is None
+    assert archive.outcome_counts == {"failed": 2, "passed": 18}
+    with pytest.raises(ValueError):
+        rehydrate_test_run(db, get_test_run(db, run_id), archive)
+
+
+def test_archive_days_zero_keeps_archives_forever(db):
+    run_id = _run(db, n=5)
+    stats = compact_test_runs(db, raw_days=30, archive_days=0, now=datetime.utcnow() + timedelta(days=10_000))
+    assert (stats["archived"], stats["expired"]) == (1, 0)
+    assert get_archive(db, run_id).payload is not None
+
+
+def test_scheduled_compaction_runs_until_cancelled(session_factory, db):
+    run_id = _run(db, n=5)
+
+    async def scenario():
+        task = asyncio.create_task(run_compaction_periodically(session_factory, 0.01, raw_days=-1))
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            with session_factory() as check:
+                if get_archive(check, run_id) is not None:
+                    break
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    with session_factory() as check:
+        assert get_archive(check, run_id).status == "archived"
@@ -0,0 +1,100 @@
+import copy
+
+import pytest
+
+from ai_tools import test_corpus
+from backend.models import test_corpus as corpus_models  # noqa: F401
+
+SCHEMA = {
+    "paths": {
+        "/projects/": {
+            "get": {"responses": {"200": {"description": "ok"}}},
+            "post": {
+                "requestBody": {
+                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/ProjectCreate"}}}
+                },
+                "responses": {"201": {"description": "created"}},
+            },
+        },
+        "/projects/{project_id}": {
+            "get": {"responses": {"200": {"description": "ok"}}},
+        },
+    },
+    "components": {
+        "schemas": {
+            "ProjectCreate": {"type": "object", "properties": {"name": {"type": "string"}}},
+        }
+    },
+}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    calls = []
+
+    def fake_generate(selected_paths, schema=None):
+        calls.append(selected_paths)
+        cases = []
+        for path, methods in selected_paths.items():
+            for method in methods:
+                concrete = path.replace("{project_id}", "1")
+                cases.append(
+                    {
+                        "name": f"{method} {path}",
+                        "category": "positive",
+                        # no "endpoint" field: must be matched by method + path template
+                        "request": {"method": method.upper(), "path": concrete},
+                    }
+                )
+        return cases
+
+    monkeypatch.setattr(test_corpus, "generate_test_cases_for_paths", fake_generate)
+    return calls
+
+
+def test_second_run_makes_no_llm_calls(db, fake_llm):
+    first = test_corpus.load_or_generate_test_cases(db, SCHEMA)
+    assert first["llm_calls"] == 1
+    assert len(first["cases"]) == 3
+    assert {tc["endpoint"] for tc in first["cases"]} == {
+        "GET /projects/",
+        "POST /projects/",
+        "GET /projects/{project_id}",
+    }
+
+    second = test_corpus.load_or_generate_test_cases(db, SCHEMA)
+    assert second["llm_calls"] == 0
+    assert second["regenerated"] == []
+    assert [tc["name"] for tc in second["cases"]] == [tc["name"] for tc in first["cases"]]
+    assert len(fake_llm) == 1
+
+
+def test_only_changed_endpoints_are_regenerated(db, fake_llm):
+    test_corpus.load_or_generate_test_cases(db, SCHEMA)
+
+    # Changing a referenced component invalidates only the operation using it.
+    changed = copy.deepcopy(SCHEMA)
+    changed["components"]["schemas"]["ProjectCreate"]["required"] = ["name"]
+    result = test_corpus.load_or_generate_test_cases(db, changed)
+
+    assert result["regenerated"] == ["POST /projects/"]
+    assert set(result["reused"]) == {"GET /projects/", "GET /projects/{project_id}"}
+    assert list(fake_llm[-1]) == ["/projects/"]
+    assert list(fake_llm[-1]["/projects/"]) == ["post"]
+
+
+def test_endpoints_without_cases_are_retried(db, fake_llm, monkeypatch):
+    generate = test_corpus.generate_test_cases_for_paths
+
+    def skip_item_endpoint(selected_paths, schema=None):
+        return [tc for tc in generate(selected_paths, schema) if "{project_id}" not in tc["name"]]
+
+    monkeypatch.setattr(test_corpus, "generate_test_cases_for_paths", skip_item_endpoint)
+    first = test_corpus.load_or_generate_test_cases(db, SCHEMA)
+    assert len(first["cases"]) == 2
+
+    monkeypatch.setattr(test_corpus, "generate_test_cases_for_paths", generate)
+    second = test_corpus.load_or_generate_test_cases(db, SCHEMA)
+    assert second["regenerated"] == ["GET /projects/{project_id}"]
+    assert second["llm_calls"] == 1
+    assert len(second["cases"]) == 3
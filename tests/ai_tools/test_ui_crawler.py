@@ -0,0 +1,84 @@
+import asyncio
+
+from ai_tools import ui_crawler
+
+SITE = {
+    "http://app.local/": ["/projects", "/bugs", "https://external.example/", "mailto:x@y.z", "#top"],
+    "http://app.local/projects": ["/projects/1", "/projects/2", "/"],
+    "http://app.local/bugs": ["/bugs/new"],
+    "http://app.local/projects/1": ["/projects"],
+    "http://app.local/projects/2": ["/projects"],
+    "http://app.local/bugs/new": [],
+}
+
+
+def _summary(url):
+    # /projects/1 and /projects/2 share a structure; every other page is unique
+    is_item_page = url.rsplit("/", 1)[-1].isdigit()
+    return {
+        "url": url,
+        "title": url,
+        "inputs": [{"tag": "input", "type": "text", "name": "item" if is_item_page else url, "data_testid": ""}],
+        "buttons": [],
+        "links": [{"text": href, "href": href, "data_testid": ""} for href in SITE[url]],
+    }
+
+
+def _fake_inspect(monkeypatch):
+    calls = []
+
+    async def fake_inspect(url, pool):
+        calls.append(url)
+        if url not in SITE:
+            raise RuntimeError("404")
+        return _summary(url)
+
+    monkeypatch.setattr(ui_crawler, "inspect_page_structure_async", fake_inspect)
+    return calls
+
+
+def test_normalize_link_keeps_same_origin_only():
+    page = "http://app.local/projects/"
+    assert ui_crawler.normalize_link(page, "1#details") == "http://app.local/projects/1"
+    assert ui_crawler.normalize_link(page, "/bugs") == "http://app.local/bugs"
+    assert ui_crawler.normalize_link(page, "https://other.local/") is None
+    assert ui_crawler.normalize_link(page, "javascript:void(0)") is None
+
+
+def test_crawl_dedupes_item_pages_and_respects_depth(monkeypatch):
+    calls = _fake_inspect(monkeypatch)
+    result = asyncio.run(ui_crawler.crawl_site("http://app.local/", pool=None, max_depth=2))
+
+    assert sorted(p["url"] for p in result["pages"]) == [
+        "http://app.local/",
+        "http://app.local/bugs",
+        "http://app.local/bugs/new",
+        "http://app.local/projects",
+        "http://app.local/projects/1",
+    ]
+    assert result["duplicates"] == {"http://app.local/projects/2": "http://app.local/projects/1"}
+    assert len(calls) == len(set(calls)) == 6
+
+    groups = ui_crawler.group_pages_by_area(result["pages"])
+    assert sorted(groups) == ["bugs", "home", "projects"]
+
+
+def test_crawl_page_budget(monkeypatch):
+    calls = _fake_inspect(monkeypatch)
+    result = asyncio.run(ui_crawler.crawl_site("http://app.local/", pool=None, max_depth=5, max_pages=2))
+    assert len(calls) == 2
+    assert len(result["pages"]) == 2
+
+
+def test_structure_hash_ignores_repeated_controls():
+    row = {"tag": "button", "text": "Delete", "data_testid": "delete-bug"}
+    one_row = {"inputs": [], "buttons": [row], "links": [{"text": "Bug 7", "href": "/bugs/7"}]}
+    three_rows = {
+        "inputs": [],
+        "buttons": [row, row, row],
+        "links": [{"text": f"Bug {i}", "href": f"/bugs/{i}"} for i in (7, 8, 9)],
+    }
+    assert ui_crawler.structure_hash(one_row) == ui_crawler.structure_hash(three_rows)
+
+    with_form = dict(three_rows, inputs=[{"tag": "input", "type": "text", "name": "title", "data_testid": ""}])
+    assert ui_crawler.structure_hash(with_form) != ui_crawler.structure_hash(one_row)
@@ -0,0 +1,113 @@
+import asyncio
+import copy
+import os
+
+from ai_tools import ui_crawler, ui_test_generator
+from ai_tools.ui_fingerprint import compare_fingerprints, fingerprint_path, page_fingerprint
+
+SUMMARY = {
+    "url": "http://app.local/bugs",
+    "title": "Bugs (12 open)",
+    "inputs": [{"tag": "input", "type": "text", "name": "title", "placeholder": "Title", "data_testid": "bug-title", "label": "Title"}],
+    "buttons": [{"tag": "button", "text": "Create  bug", "data_testid": "create-bug"}],
+    "links": [{"text": "Updated 2026-10-19 10:42", "href": "/bugs/7", "data_testid": ""}],
+}
+
+
+def test_fingerprint_ignores_volatile_text_only():
+    volatile = copy.deepcopy(SUMMARY)
+    volatile["title"] = "Bugs (3 open)"
+    volatile["buttons"][0]["text"] = "Create bug"
+    volatile["links"][0] = {"text": "Updated 2026-10-20 08:00", "href": "/bugs/9", "data_testid": ""}
+    assert page_fingerprint(volatile) == page_fingerprint(SUMMARY)
+
+    changed = copy.deepcopy(SUMMARY)
+    changed["inputs"][0]["data_testid"] = "bug-name"
+    assert page_fingerprint(changed) != page_fingerprint(SUMMARY)
+
+
+def test_crawl_regenerates_only_changed_areas(tmp_path, monkeypatch):
+    site = {
+        "http://app.local/": copy.deepcopy(SUMMARY) | {"url": "http://app.local/", "links": [{"text": "b", "href": "/bugs", "data_testid": ""}]},
+        "http://app.local/bugs": copy.deepcopy(SUMMARY),
+    }
+    calls = []
+
+    async def fake_inspect(url, pool):
+        return copy.deepcopy(site[url])
+
+    def fake_generate(area, summaries):
+        calls.append(area)
+        return f"# {area}\n"
+
+    monkeypatch.setattr(ui_crawler, "inspect_page_structure_async", fake_inspect)
+    monkeypatch.setattr(ui_crawler, "generate_ui_tests_code_for_pages", fake_generate)
+
+    def crawl():
+        return asyncio.run(ui_crawler.crawl_and_generate_ui_tests("http://app.local/", None, output_dir=str(tmp_path)))
+
+    first = crawl()
+    assert sorted(calls) == ["bugs", "home"]
+    assert all(m["regenerated"] for m in first["modules"])
+    assert all(os.path.exists(fingerprint_path(m["saved_path"])) for m in first["modules"])
+    # The "bugs" area module must not overwrite the single-page module for /bugs.
+    area_paths = {m["saved_path"] for m in first["modules"]}
+    assert ui_test_generator.ui_test_path("http://app.local/bugs", str(tmp_path)) not in area_paths
+
+    calls.clear()
+    second = crawl()
+    assert calls == []
+    assert second["changed_pages"] == []
+    assert {m["code"] for m in second["modules"]} == {"# bugs\n", "# home\n"}
+
+    site["http://app.local/bugs"]["buttons"].append({"tag": "button", "text": "Delete", "data_testid": "delete-bug"})
+    third = crawl()
+    assert calls == ["bugs"]
+    assert third["changed_pages"] == ["http://app.local/bugs"]
+
+
+def test_failed_area_does_not_discard_the_others(tmp_path, monkeypatch):
+    site = {
+        "http://app.local/": copy.deepcopy(SUMMARY) | {"url": "http://app.local/", "links": [{"text": "b", "href": "/bugs", "data_testid": ""}]},
+        "http://app.local/bugs": copy.deepcopy(SUMMARY),
+    }
+    failing = {"bugs"}
+
+    async def fake_inspect(url, pool):
+        return copy.deepcopy(site[url])
+
+    def fake_generate(area, summaries):
+        if area in failing:
+            raise RuntimeError("429 quota exhausted")
+        return f"# {area}\n"
+
+    monkeypatch.setattr(ui_crawler, "inspect_page_structure_async", fake_inspect)
+    monkeypatch.setattr(ui_crawler, "generate_ui_tests_code_for_pages", fake_generate)
+
+    def crawl():
+        return asyncio.run(ui_crawler.crawl_and_generate_ui_tests("http://app.local/", None, output_dir=str(tmp_path)))
+
+    first = crawl()
+    assert first["failed_areas"] == {"bugs": "429 quota exhausted"}
+    assert [(m["area"], m["code"]) for m in first["modules"]] == [("home", "# home\n")]
+    assert os.path.exists(fingerprint_path(first["modules"][0]["saved_path"]))
+
+    failing.clear()
+    second = crawl()
+    assert second["failed_areas"] == {}
+    assert {m["area"]: m["regenerated"] for m in second["modules"]} == {"home": False, "bugs": True}
+
+
+def test_single_page_reuses_module_when_unchanged(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ui_test_generator, "inspect_page_structure", lambda url: copy.deepcopy(SUMMARY))
+    monkeypatch.setattr(ui_test_generator, "generate_ui_tests_code", lambda summary: calls.append(1) or "# code\n")
+
+    first = ui_test_generator.generate_and_optionally_save_ui_tests(SUMMARY["url"], output_dir=str(tmp_path))
+    second = ui_test_generator.generate_and_optionally_save_ui_tests(SUMMARY["url"], output_dir=str(tmp_path))
+    forced = ui_test_generator.generate_and_optionally_save_ui_tests(SUMMARY["url"], output_dir=str(tmp_path), force=True)
+
+    assert (first["regenerated"], second["regenerated"], forced["regenerated"]) == (True, False, True)
+    assert second["code"] == "# code\n"
+    assert len(calls) == 2
+    assert compare_fingerprints(first["saved_path"], [SUMMARY])["unchanged"]
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_tools.ui_test_runner import run_generated_ui_tests_async
+from backend.crud.test_result import list_test_results
+
+
+@pytest.fixture
+def generated_dir(tmp_path):
+    (tmp_path / "test_gen_ok.py").write_text(
+        "import time\n\ndef test_a():\n    time.sleep(1)\n\ndef test_b():\n    pass\n"
+    )
+    (tmp_path / "test_gen_fail.py").write_text("import time\n\ndef test_c():\n    time.sleep(1)\n    assert False, 'nope'\n")
+    (tmp_path / "test_gen_hang.py").write_text("import time\n\ndef test_d():\n    time.sleep(60)\n")
+    (tmp_path / "helper.py").write_text("")  # not a test module
+    return tmp_path
+
+
+def test_shards_run_in_parallel_with_hard_timeout(db, generated_dir):
+    start = time.perf_counter()
+    run = asyncio.run(
+        run_generated_ui_tests_async(db, generated_dir=str(generated_dir), max_workers=3, shard_timeout=8)
+    )
+    elapsed = time.perf_counter() - start
+
+    # Bounded by the slowest (timed-out) shard, not the sum of all shards.
+    assert elapsed < 14
+    assert run.run_type == "ui"
+    assert run.status == "failed"
+    assert {s["module"].rsplit("/", 1)[-1]: s["status"] for s in run.summary["shard_runs"]} == {
+        "test_gen_fail.py": "failed",
+        "test_gen_hang.py": "timeout",
+        "test_gen_ok.py": "passed",
+    }
+
+    results = {r.name: r for r in list_test_results(db, run.id)}
+    assert {name: r.outcome for name, r in results.items()} == {
+        "test_a": "passed",
+        "test_b": "passed",
+        "test_c": "failed",
+        "shard": "error",
+    }
+    assert results["test_a"].duration >= 1
+    assert "timed out after 8s" in results["shard"].message
+    assert results["shard"].shard == "test_gen_hang.py"
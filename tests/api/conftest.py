@@ -5,7 +5,15 @@ import pytest
 
 from typing import Dict
 
-from .utils.api_client import APIClient
+from .utils.api_client import APIClient, AsyncAPIClient
+from .utils.user_pool import (
+    PooledUser,
+    UserPool,
+    login_via_api,
+    mint_token,
+    provision_in_database,
+    provision_via_api,
+)
 
 
 @pytest.fixture(scope="session")
@@ -19,30 +27,140 @@ def config() -> Dict:
 
 
 @pytest.fixture(scope="session")
-def base_url(config) -> str:
-    return config["base_url"]
+def worker_id() -> str:
+    """
+    pytest-xdist worker name ("gw0", "gw1", ...), or "master" when the
+    suite runs in a single process (also without xdist installed).
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.fixture(scope="session")
+def transport(config) -> str:
+    """
+    "http" (live server at base_url), "asgi" (in-process app) or "server"
+    (in-process app behind a real uvicorn on a free port); env var wins
+    over config. "asgi" and "server" give every xdist worker its own app
+    and SQLite database.
+    """
+    return os.environ.get("API_TEST_TRANSPORT") or config.get("transport", "http")
+
+
+@pytest.fixture(scope="session")
+def inprocess_app(transport: str, worker_id: str):
+    """
+    This worker's app instance for the "asgi"/"server" transports (None for "http").
+    """
+    if transport not in ("asgi", "server"):
+        return None
+    from backend.inprocess import create_inprocess_app
+
+    return create_inprocess_app(label=worker_id)
+
+
+@pytest.fixture(scope="session")
+def base_url(config, transport: str, inprocess_app):
+    if transport == "asgi":
+        from backend.inprocess import INPROCESS_BASE_URL
+
+        yield INPROCESS_BASE_URL
+    elif transport == "server":
+        from backend.inprocess import InProcessServer
+
+        server = InProcessServer(inprocess_app)
+        yield server.start()
+        server.stop()
+    else:
+        yield config["base_url"]
+
+
+@pytest.fixture(scope="session")
+def asgi_app(transport: str, inprocess_app):
+    """
+    App to dispatch to without a socket; only for the "asgi" transport.
+    """
+    return inprocess_app if transport == "asgi" else None
+
+
+@pytest.fixture(autouse=True)
+def _record_worker(record_property, worker_id: str):
+    # Tags each <testcase> in a merged --junitxml report with the worker
+    # that ran it (picked up as the shard by the JUnit upload endpoint).
+    if worker_id != "master":
+        record_property("xdist_worker", worker_id)
 
 
 @pytest.fixture(scope="session")
-def api_client(base_url: str) -> APIClient:
-    return APIClient(base_url=base_url)
+def http_options(config) -> Dict:
+    http = config.get("http", {})
+    return {
+        "timeout": (float(http.get("connect_timeout", 5)), float(http.get("read_timeout", 30))),
+        "retries": int(http.get("retries", 0)),
+        "pool_size": int(http.get("pool_size", 20)),
+    }
+
+
+def _log_slow_requests(threshold_ms: float):
+    def hook(method: str, url: str, status, elapsed_ms: float) -> None:
+        if elapsed_ms >= threshold_ms:
+            print(f"[API] Slow request: {method} {url} -> {status} in {elapsed_ms:.0f}ms")
+
+    return hook
+
+
+@pytest.fixture(scope="session")
+def api_client(base_url: str, asgi_app, http_options: Dict, config):
+    """
+    One pooled client (keep-alive session) per test session and worker.
+    """
+    client = APIClient(base_url=base_url, app=asgi_app, **http_options)
+    slow_ms = config.get("http", {}).get("slow_request_ms", 0)
+    if slow_ms:
+        client.add_timing_hook(_log_slow_requests(slow_ms))
+    with client:
+        yield client
+
+
+@pytest.fixture
+def isolated_api_client(worker_id: str, http_options: Dict):
+    """
+    Client for a fresh in-process app with its own throwaway database,
+    whatever the transport. For tests that prune, compact or otherwise
+    destroy data, so they never touch a shared server's database.
+    """
+    from backend.inprocess import INPROCESS_BASE_URL, create_inprocess_app
+
+    app = create_inprocess_app(label=f"{worker_id}-isolated")
+    with APIClient(base_url=INPROCESS_BASE_URL, app=app, **http_options) as client:
+        yield client
+    app.state.engine.dispose()
 
 
 @pytest.fixture
-def unique_email(config) -> str:
+def async_api_client(base_url: str, asgi_app, http_options: Dict) -> AsyncAPIClient:
     """
-    Generate a unique email per test to avoid clashes.
+    Async client for concurrency tests; use as `async with async_api_client:`
+    inside the test's event loop.
+    """
+    return AsyncAPIClient(base_url=base_url, app=asgi_app, **http_options)
+
+
+@pytest.fixture
+def unique_email(config, worker_id: str) -> str:
+    """
+    Generate a unique email per test (and worker) to avoid clashes.
     """
     default_email = config["default_user"]["email"]
     local, domain = default_email.split("@")
     unique_suffix = uuid.uuid4().hex[:8]
-    return f"{local}+{unique_suffix}@{domain}"
+    return f"{local}+{worker_id}-{unique_suffix}@{domain}"
 
 
 @pytest.fixture
 def registered_user(api_client: APIClient, unique_email: str, config):
     """
-    Register a user for the test and return its data.
+    Register a brand-new user for the test and return its data. Tests that
+    only need to be logged in should use auth_headers (pooled) instead.
     """
     payload = {
         "email": unique_email,
@@ -71,6 +189,46 @@ def access_token(api_client: APIClient, registered_user, config) -> str:
     return token
 
 
+@pytest.fixture(scope="session")
+def user_pool(api_client: APIClient, inprocess_app, config, worker_id: str) -> UserPool:
+    """
+    Users shared by all tests of this session/worker (see UserPool), all
+    created when the pool is. With an in-process app they are bulk-inserted
+    with tokens minted directly; against a live server they are registered
+    and logged in once each.
+    """
+    from backend.core.config import get_settings
+
+    user = config["default_user"]
+    token_ttl_s = get_settings().ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    args = (user["email"], user["full_name"], user["password"], worker_id, token_ttl_s)
+    size = int(config.get("user_pool", {}).get("size", 4))
+
+    if inprocess_app is not None:
+        return UserPool(
+            provision_in_database(inprocess_app.state.session_factory, *args),
+            mint_token(token_ttl_s),
+            api_client,
+            size=size,
+        )
+    return UserPool(
+        provision_via_api(api_client, *args),
+        login_via_api(api_client, token_ttl_s),
+        api_client,
+        size=size,
+    )
+
+
+@pytest.fixture
+def pooled_user(user_pool: UserPool) -> PooledUser:
+    """
+    A pooled user with a valid token and no projects, returned after the test.
+    """
+    user = user_pool.checkout()
+    yield user
+    user_pool.checkin(user)
+
+
 @pytest.fixture
-def auth_headers(access_token: str) -> Dict[str, str]:
-    return {"Authorization": f"Bearer {access_token}"}
+def auth_headers(pooled_user: PooledUser) -> Dict[str, str]:
+    return pooled_user.headers
@@ -0,0 +1,144 @@
+import pytest
+
+
+def test_corpus_list_and_prune_validation(isolated_api_client):
+    # Pruning deletes data, so this runs against a throwaway in-process app.
+    r = isolated_api_client.get("/ai/dashboard/corpus")
+    assert r.status_code == 200, r.text
+    assert isinstance(r.json(), list)
+
+    # Pruning without any criteria must not wipe the corpus
+    r_prune = isolated_api_client.delete("/ai/dashboard/corpus")
+    assert r_prune.status_code == 400
+
+    r_stale = isolated_api_client.delete("/ai/dashboard/corpus?stale=true")
+    assert r_stale.status_code == 200, r_stale.text
+    assert r_stale.json()["deleted"] >= 0
+
+
+SHARD = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="{name}">
+  <testcase classname="tests.api.{name}" name="test_ok" time="0.2" />
+  <testcase classname="tests.api.{name}" name="test_bad" time="0.4">
+    <failure message="assert 500 == 200">E   assert 500 == 200</failure>
+  </testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_upload_sharded_junit_reports(api_client):
+    import gzip
+
+    files = [
+        ("files", ("shard0.xml", SHARD.format(name="shard0").encode(), "application/xml")),
+        ("files", ("shard1.xml.gz", gzip.compress(SHARD.format(name="shard1").encode()), "application/gzip")),
+    ]
+    r = api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files)
+    assert r.status_code == 201, r.text
+    run = r.json()
+    assert run["run_type"] == "api"
+    assert run["status"] == "failed"
+    assert (run["summary"]["total"], run["summary"]["failed"]) == (4, 2)
+    assert [s["name"] for s in run["summary"]["shards"]] == ["shard0.xml", "shard1.xml.gz"]
+
+    r_failed = api_client.get(
+        f"/ai/dashboard/test-runs/{run['id']}/results", params={"outcome": "failed"}
+    )
+    assert r_failed.status_code == 200, r_failed.text
+    assert sorted(row["test"] for row in r_failed.json()) == [
+        "tests.api.shard0::test_bad",
+        "tests.api.shard1::test_bad",
+    ]
+
+
+def test_upload_rejects_unknown_run_type(api_client):
+    files = [("files", ("r.xml", SHARD.format(name="s").encode(), "application/xml"))]
+    r = api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "load"}, files=files)
+    assert r.status_code == 400
+
+
+FLAKY_RUN = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="flaky">
+  <testcase classname="tests.api.flaky" name="test_flip" time="0.1">{flip}</testcase>
+  <testcase classname="tests.api.flaky" name="test_broke" time="0.1">{broke}</testcase>
+  <testcase classname="tests.api.flaky" name="test_stable" time="0.1" />
+</testsuite></testsuites>
+"""
+FAILURE = '<failure message="assert 500 == 200">E   assert 500 == 200</failure>'
+
+
+def test_flaky_ranking(isolated_api_client):
+    # A fresh database, so the ranking holds exactly the tests uploaded here.
+    for i in range(4):
+        xml = FLAKY_RUN.format(flip="" if i % 2 else FAILURE, broke=FAILURE if i >= 2 else "")
+        files = [("files", (f"run{i}.xml", xml.encode(), "application/xml"))]
+        r = isolated_api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files)
+        assert r.status_code == 201, r.text
+
+    r = isolated_api_client.get("/ai/dashboard/flaky?min_runs=2&limit=5")
+    assert r.status_code == 200, r.text
+    rows = r.json()
+    assert [row["test"] for row in rows] == ["tests.api.flaky::test_flip", "tests.api.flaky::test_broke"]
+    assert (rows[0]["runs"], rows[0]["flips"], rows[0]["failures"], rows[0]["recent"]) == (4, 3, 2, "FPFP")
+    assert rows[0]["flip_rate"] == pytest.approx(1.0)
+    assert (rows[1]["flips"], rows[1]["flip_rate"]) == (1, pytest.approx(1 / 3))
+
+
+def test_diff_two_uploaded_runs(api_client):
+    def upload(xml):
+        files = [("files", ("r.xml", xml.encode(), "application/xml"))]
+        r = api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files)
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    base = upload(SHARD.format(name="diff"))
+    head = upload(SHARD.format(name="diff").replace('name="test_ok" time="0.2"', 'name="test_new" time="0.2"'))
+
+    r = api_client.get(f"/ai/dashboard/test-runs/{base}/diff/{head}")
+    assert r.status_code == 200, r.text
+    diff = r.json()
+    assert diff["counts"]["common"] == 1
+    assert diff["added"] == [{"test": "tests.api.diff::test_new", "outcome": "passed"}]
+    assert diff["removed"] == [{"test": "tests.api.diff::test_ok", "outcome": "passed"}]
+
+    assert api_client.get(f"/ai/dashboard/test-runs/{base}/diff/999999999").status_code == 404
+
+
+def test_recent_run_is_not_archived(isolated_api_client):
+    # Compaction deletes raw results, so this runs against a throwaway in-process app.
+    files = [("files", ("r.xml", SHARD.format(name="retention").encode(), "application/xml"))]
+    run_id = isolated_api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files).json()["id"]
+
+    r = isolated_api_client.post("/ai/dashboard/retention/compact")
+    assert r.status_code == 200, r.text
+    assert set(r.json()) >= {"archived", "rearchived", "expired"}
+
+    assert isolated_api_client.get(f"/ai/dashboard/test-runs/{run_id}/archive").status_code == 404
+    assert isolated_api_client.post(f"/ai/dashboard/test-runs/{run_id}/rehydrate").status_code == 409
+    assert isolated_api_client.get(f"/ai/dashboard/test-runs/{run_id}/results").status_code == 200
+
+
+def test_upload_rejects_malformed_reports(api_client):
+    files = [("files", ("r.xml", b"<testsuite><testcase", "application/xml"))]
+    r = api_client.post("/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files)
+    assert r.status_code == 400
+    assert "Could not ingest" in r.json()["detail"]
+
+
+def test_expired_run_answers_410(isolated_api_client):
+    from backend.models.test_run_archive import TestRunArchive
+
+    files = [("files", ("r.xml", SHARD.format(name="expired").encode(), "application/xml"))]
+    run_id = isolated_api_client.post(
+        "/ai/dashboard/test-runs/upload", data={"run_type": "api"}, files=files
+    ).json()["id"]
+    with isolated_api_client.app.state.session_factory() as db:
+        db.add(TestRunArchive(test_run_id=run_id, status="expired", result_count=2))
+        db.commit()
+
+    for r in (
+        isolated_api_client.get(f"/ai/dashboard/test-runs/{run_id}/results"),
+        isolated_api_client.post(f"/ai/dashboard/test-runs/{run_id}/rehydrate"),
+    ):
+        assert r.status_code == 410, r.text
+        assert "expired" in r.json()["detail"]
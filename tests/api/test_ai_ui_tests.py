@@ -0,0 +1,4 @@
+def test_run_generated_tests_rejects_unknown_modules(api_client):
+    r = api_client.post("/ai/ui/run-generated-tests", json={"modules": ["../../conftest.py", "test_missing.py"]})
+    assert r.status_code == 404, r.text
+    assert "test_missing.py" in r.json()["detail"]
@@ -1,3 +1,6 @@
+import asyncio
+
+
 def test_create_and_list_projects(api_client, auth_headers):
     # Create a project
     project_payload = {
@@ -46,3 +49,21 @@ def test_get_update_delete_project(api_client, auth_headers):
     # Verify 404 after delete
     r_get2 = api_client.get(f"/projects/{project_id}", headers=auth_headers)
     assert r_get2.status_code == 404
+
+
+def test_create_projects_concurrently(async_api_client, auth_headers):
+    names = [f"Concurrent Project {i}" for i in range(10)]
+
+    async def create_all():
+        async with async_api_client as client:
+            responses = await asyncio.gather(
+                *(client.post("/projects/", json={"name": name}, headers=auth_headers) for name in names)
+            )
+            listing = await client.get("/projects/", headers=auth_headers)
+            return responses, listing
+
+    responses, listing = asyncio.run(create_all())
+
+    assert [r.status_code for r in responses] == [201] * len(names)
+    assert len({r.json()["id"] for r in responses}) == len(names)
+    assert set(names) <= {p["name"] for p in listing.json()}
@@ -0,0 +1,66 @@
+import pytest
+
+from .utils.user_pool import PooledUser, UserPool
+
+
+class _Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.text = str(body)
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class _ProjectsAPI:
+    """
+    Stand-in for APIClient serving one project per user, whose delete fails
+    for the users in `undeletable`.
+    """
+
+    def __init__(self, undeletable=()):
+        self.undeletable = set(undeletable)
+
+    def get(self, path, headers):
+        return _Response(200, [{"id": 1}])
+
+    def delete(self, path, headers):
+        return _Response(500 if headers["Authorization"] in self.undeletable else 204, "boom")
+
+
+def _provisioner(created):
+    def provision(n):
+        users = []
+        for i in range(len(created), len(created) + n):
+            users.append(PooledUser(id=i, email=f"u{i}@example.com", password="pw", token=f"t{i}", token_expires_at=float("inf")))
+        created.extend(users)
+        return users
+
+    return provision
+
+
+def test_pool_is_provisioned_up_front():
+    created = []
+    pool = UserPool(_provisioner(created), refresh_token=lambda user: None, api_client=_ProjectsAPI(), size=3)
+    assert len(created) == pool.created == 3
+
+    for _ in range(5):
+        pool.checkin(pool.checkout())
+    assert len(created) == 3
+
+
+def test_user_whose_cleanup_failed_is_dropped():
+    created = []
+    api = _ProjectsAPI(undeletable={"Bearer t1"})
+    pool = UserPool(_provisioner(created), refresh_token=lambda user: None, api_client=api, size=2)
+
+    first = pool.checkout()
+    assert first.email == "u1@example.com"
+    with pytest.warns(UserWarning, match="Dropped pooled user u1@example.com"):
+        pool.checkin(first)
+    assert pool.dropped == ["u1@example.com"]
+
+    handed_out = {pool.checkout().email for _ in range(2)}
+    assert "u1@example.com" not in handed_out
+    assert pool.created == 3  # the dropped user was replaced, not recycled
@@ -1,27 +1,220 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Methods that are safe to resend; retries never apply to POST/PATCH.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = (502, 503, 504)
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 30.0)  # (connect, read) seconds
+DEFAULT_POOL_SIZE = 20
+
+# hook(method, url, status_code, elapsed_ms); status_code is None if the request raised.
+TimingHook = Callable[[str, str, Optional[int], float], None]
 
 
 class APIClient:
-    def __init__(self, base_url: str):
+    """
+    Thin wrapper for requests to the API under test.
+
+    Requests go through one pooled requests.Session, so connections are
+    kept alive across the whole test session instead of opening a TCP
+    connection per call. Every request has a (connect, read) timeout.
+    Retries (502/503/504 and connection errors, with exponential backoff)
+    are opt-in via `retries` and only apply to idempotent methods.
+
+    Timing hooks registered with add_timing_hook() are called after every
+    request with (method, url, status_code, elapsed_ms).
+
+    With `app` given, requests are dispatched in-process through an ASGI
+    transport (starlette TestClient) instead of over TCP to `base_url`;
+    timeouts and retries do not apply there.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        app=None,
+        timeout: Tuple[float, float] | float = DEFAULT_TIMEOUT,
+        retries: int = 0,
+        backoff_factor: float = 0.2,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
         self.base_url = base_url.rstrip("/")
+        self.app = app
+        self.timeout = timeout
+        self._hooks: List[TimingHook] = []
+
+        if app is not None:
+            from fastapi.testclient import TestClient
+
+            # Report server errors as 500 responses, like a live server would.
+            self._http = TestClient(app, base_url=self.base_url, raise_server_exceptions=False)
+            self._request_kwargs: Dict[str, Any] = {}
+            return
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                connect=retries,
+                read=retries,
+                status=retries,
+                allowed_methods=IDEMPOTENT_METHODS,
+                status_forcelist=RETRY_STATUSES,
+                backoff_factor=backoff_factor,
+                raise_on_status=False,
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self._http = session
+        self._request_kwargs = {"timeout": timeout}
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        self._hooks.append(hook)
+
+    def close(self) -> None:
+        self._http.close()
+
+    def __enter__(self) -> "APIClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def _url(self, path: str) -> str:
         if not path.startswith("/"):
             path = "/" + path
         return self.base_url + path
 
+    def request(self, method: str, path: str, **kwargs):
+        url = self._url(path)
+        status = None
+        start = time.perf_counter()
+        try:
+            response = self._http.request(method, url, **self._request_kwargs, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for hook in self._hooks:
+                hook(method, url, status, elapsed_ms)
+
     def get(self, path: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None):
-        return requests.get(self._url(path), headers=headers, params=params)
+        return self.request("GET", path, headers=headers, params=params)
 
-    def post(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, data=None):
-        return requests.post(self._url(path), json=json, headers=headers, data=data)
+    def post(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, data=None, files=None):
+        return self.request("POST", path, json=json, headers=headers, data=data, files=files)
 
     def put(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None):
-        return requests.put(self._url(path), json=json, headers=headers)
+        return self.request("PUT", path, json=json, headers=headers)
 
     def patch(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None):
-        return requests.patch(self._url(path), json=json, headers=headers)
+        return self.request("PATCH", path, json=json, headers=headers)
 
     def delete(self, path: str, headers: Dict[str, str] | None = None):
-        return requests.delete(self._url(path), headers=headers)
+        return self.request("DELETE", path, headers=headers)
+
+
+class AsyncAPIClient:
+    """
+    httpx-based async counterpart of APIClient for concurrency tests,
+    e.g. firing many requests at once with asyncio.gather.
+
+    Same options and timing hooks as APIClient. Retries are done here
+    (httpx only retries failed connects), again only for idempotent methods.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        app=None,
+        timeout: Tuple[float, float] | float = DEFAULT_TIMEOUT,
+        retries: int = 0,
+        backoff_factor: float = 0.2,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._hooks: List[TimingHook] = []
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        transport = httpx.ASGITransport(app=app) if app is not None else None
+        self._transient_errors = (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError)
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        self._hooks.append(hook)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def _url(self, path: str) -> str:
+        if not path.startswith("/"):
+            path = "/" + path
+        return self.base_url + path
+
+    async def _send(self, method: str, url: str, **kwargs):
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = await self._http.request(method, url, **kwargs)
+            except self._transient_errors:
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+
+    async def request(self, method: str, path: str, **kwargs):
+        url = self._url(path)
+        status = None
+        start = time.perf_counter()
+        try:
+            response = await self._send(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for hook in self._hooks:
+                hook(method, url, status, elapsed_ms)
+
+    async def get(self, path: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None):
+        return await self.request("GET", path, headers=headers, params=params)
+
+    async def post(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, data=None, files=None):
+        return await self.request("POST", path, json=json, headers=headers, data=data, files=files)
+
+    async def put(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None):
+        return await self.request("PUT", path, json=json, headers=headers)
+
+    async def patch(self, path: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None):
+        return await self.request("PATCH", path, json=json, headers=headers)
+
+    async def delete(self, path: str, headers: Dict[str, str] | None = None):
+        return await self.request("DELETE", path, headers=headers)
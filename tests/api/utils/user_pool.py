@@ -0,0 +1,177 @@
+import threading
+import time
+import uuid
+import warnings
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .api_client import APIClient
+
+# Re-login pooled users whose token is this close to expiring.
+TOKEN_REFRESH_MARGIN_S = 60
+
+
+@dataclass
+class PooledUser:
+    id: int
+    email: str
+    password: str
+    token: str
+    token_expires_at: float  # time.monotonic() value
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+class UserPool:
+    """
+    Session-wide pool of ready-to-use users with valid tokens.
+
+    All `size` users are provisioned up front (one batch per session or
+    xdist worker), so registration and password hashing happen once per
+    user instead of once per test. checkout() hands out a user with no
+    projects: checkin() deletes whatever the test created, and a user whose
+    cleanup fails is dropped rather than handed to the next test.
+    """
+
+    def __init__(
+        self,
+        provision: Callable[[int], List[PooledUser]],
+        refresh_token: Callable[[PooledUser], None],
+        api_client: APIClient,
+        size: int = 4,
+    ):
+        self._provision = provision
+        self._refresh_token = refresh_token
+        self._api = api_client
+        self._free: List[PooledUser] = provision(size)
+        self._lock = threading.Lock()
+        self.created = len(self._free)
+        self.dropped: List[str] = []
+
+    def checkout(self) -> PooledUser:
+        with self._lock:
+            if not self._free:
+                # Only when more users are checked out at once than `size`,
+                # or dropped ones have used the pool up.
+                self._free.extend(self._provision(1))
+                self.created += 1
+            user = self._free.pop()
+        if user.token_expires_at - time.monotonic() < TOKEN_REFRESH_MARGIN_S:
+            self._refresh_token(user)
+        return user
+
+    def checkin(self, user: PooledUser) -> None:
+        problem = self._delete_projects(user)
+        with self._lock:
+            if problem is None:
+                self._free.append(user)
+                return
+            self.dropped.append(user.email)
+        warnings.warn(f"Dropped pooled user {user.email} from the pool: {problem}")
+
+    def _delete_projects(self, user: PooledUser) -> Optional[str]:
+        """
+        Delete the user's projects; returns what went wrong, or None.
+        """
+        r = self._api.get("/projects/", headers=user.headers)
+        if r.status_code != 200:
+            return f"listing projects answered {r.status_code} {r.text}"
+        for project in r.json():
+            r = self._api.delete(f"/projects/{project['id']}", headers=user.headers)
+            if r.status_code not in (204, 404):
+                return f"deleting project {project['id']} answered {r.status_code} {r.text}"
+        return None
+
+
+def pool_emails(template_email: str, label: str, n: int) -> List[str]:
+    local, domain = template_email.split("@")
+    run = uuid.uuid4().hex[:8]
+    return [f"{local}+pool-{label}-{run}-{i}@{domain}" for i in range(n)]
+
+
+def provision_via_api(
+    api_client: APIClient,
+    template_email: str,
+    full_name: str,
+    password: str,
+    label: str,
+    token_ttl_s: float,
+) -> Callable[[int], List[PooledUser]]:
+    """
+    Provisioner for a live server: register and log in through the API.
+    """
+
+    def provision(n: int) -> List[PooledUser]:
+        users = []
+        for email in pool_emails(template_email, label, n):
+            r = api_client.post("/auth/register", json={"email": email, "full_name": full_name, "password": password})
+            assert r.status_code == 200, f"Register failed: {r.status_code}, {r.text}"
+            user = PooledUser(id=r.json()["id"], email=email, password=password, token="", token_expires_at=0.0)
+            login_via_api(api_client, token_ttl_s)(user)
+            users.append(user)
+        return users
+
+    return provision
+
+
+def login_via_api(api_client: APIClient, token_ttl_s: float) -> Callable[[PooledUser], None]:
+    def login(user: PooledUser) -> None:
+        r = api_client.post("/auth/login", data={"username": user.email, "password": user.password})
+        assert r.status_code == 200, f"Login failed: {r.status_code}, {r.text}"
+        user.token = r.json()["access_token"]
+        user.token_expires_at = time.monotonic() + token_ttl_s
+
+    return login
+
+
+def provision_in_database(
+    session_factory,
+    template_email: str,
+    full_name: str,
+    password: str,
+    label: str,
+    token_ttl_s: float,
+) -> Callable[[int], List[PooledUser]]:
+    """
+    Provisioner for an in-process app: one bulk INSERT for the whole pool,
+    with the password hashed once for all users and tokens minted directly.
+    """
+    from sqlalchemy import insert, select
+
+    from backend.core.security import get_password_hash
+    from backend.models.user import User
+
+    hashed_password = get_password_hash(password)
+
+    def provision(n: int) -> List[PooledUser]:
+        emails = pool_emails(template_email, label, n)
+        with session_factory() as db:
+            db.execute(
+                insert(User),
+                [
+                    {"email": email, "full_name": full_name, "hashed_password": hashed_password, "role": "tester", "is_active": True}
+                    for email in emails
+                ],
+            )
+            db.commit()
+            ids = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+        users = [PooledUser(id=ids[email], email=email, password=password, token="", token_expires_at=0.0) for email in emails]
+        for user in users:
+            mint_token(token_ttl_s)(user)
+        return users
+
+    return provision
+
+
+def mint_token(token_ttl_s: float) -> Callable[[PooledUser], None]:
+    from datetime import timedelta
+
+    from backend.core.security import create_access_token
+
+    def mint(user: PooledUser) -> None:
+        user.token = create_access_token(subject=user.id, expires_delta=timedelta(seconds=token_ttl_s))
+        user.token_expires_at = time.monotonic() + token_ttl_s
+
+    return mint
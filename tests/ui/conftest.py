@@ -1,7 +1,83 @@
+import json
+import os
+import uuid
+from typing import Dict
+
 import pytest
 
+# Runs before every page script; once /app's own script has run, hands it
+# the session user's token as if they had logged in through the form.
+# /app keeps its token in memory only, so this lives in the test context.
+AUTH_INIT_SCRIPT = """
+window.addEventListener("DOMContentLoaded", () => {
+  if (typeof showLoggedInUser !== "function") return;  // not the /app page
+  token = %(token)s;
+  showLoggedInUser(%(email)s);
+});
+"""
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    """
+    Same live server as the API tests by default. With UI_TEST_SERVER=inprocess
+    every pytest-xdist worker serves its own app and SQLite database on a
+    free port instead (see backend.inprocess.InProcessServer).
+    """
+    if os.environ.get("UI_TEST_SERVER") != "inprocess":
+        yield "http://127.0.0.1:8000"
+        return
+
+    from backend.inprocess import InProcessServer, create_inprocess_app
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    server = InProcessServer(create_inprocess_app(label=worker))
+    yield server.start()
+    server.stop()
+
 
 @pytest.fixture(scope="session")
-def base_url() -> str:
-    # Same as API
-    return "http://127.0.0.1:8000"
+def ui_user(base_url: str) -> Dict[str, str]:
+    """
+    One user for the whole session, registered and logged in through the API
+    (not the /app form). Holds email, full_name, password and token.
+    """
+    from tests.api.utils.api_client import APIClient
+
+    user = {
+        "email": f"ui_tester+{uuid.uuid4().hex[:8]}@example.com",
+        "full_name": "UI Test User",
+        "password": "ui-test-password",
+    }
+    with APIClient(base_url) as client:
+        r = client.post("/auth/register", json=user)
+        assert r.status_code == 200, f"Register failed: {r.status_code}, {r.text}"
+        r = client.post("/auth/login", data={"username": user["email"], "password": user["password"]})
+        assert r.status_code == 200, f"Login failed: {r.status_code}, {r.text}"
+    user["token"] = r.json()["access_token"]
+    return user
+
+
+@pytest.fixture(scope="session")
+def authenticated_context(browser, browser_context_args: Dict, ui_user: Dict[str, str]):
+    """
+    One logged-in browser context shared by all tests that use
+    authenticated_page. Tests needing a logged-out browser, or that log in
+    as someone else, must use the regular `page` fixture instead.
+    """
+    context = browser.new_context(**browser_context_args)
+    context.add_init_script(
+        AUTH_INIT_SCRIPT % {"token": json.dumps(ui_user["token"]), "email": json.dumps(ui_user["email"])}
+    )
+    yield context
+    context.close()
+
+
+@pytest.fixture
+def authenticated_page(authenticated_context):
+    """
+    Fresh page (tab) in the shared logged-in context, closed after the test.
+    """
+    page = authenticated_context.new_page()
+    yield page
+    page.close()
@@ -6,36 +6,42 @@ from .pages.projects_page import ProjectsPage
 from .pages.bugs_page import BugsPage
 
 
-def test_e2e_create_project_and_bug(page: Page, base_url: str):
+def test_e2e_register_and_login(page: Page, base_url: str):
     """
-    Full UI flow:
-    - open /app
-    - register unique user
-    - login
-    - create project
-    - select project
-    - create bug
-    - verify bug appears in list
+    Register and login through the /app forms (logged-out context).
     """
     login_page = LoginPage(page, base_url)
-    projects_page = ProjectsPage(page)
-    bugs_page = BugsPage(page)
 
     # Use unique email so tests can run repeatedly
     unique_suffix = uuid.uuid4().hex[:8]
     email = f"ui_tester+{unique_suffix}@example.com"
     password = "ui-test-password"
-    full_name = "UI Test User"
 
-    # Go to app & register
     login_page.goto()
-    login_page.register(email=email, full_name=full_name, password=password)
-
-    # Login
+    login_page.register(email=email, full_name="UI Test User", password=password)
     login_page.login(email=email, password=password)
     login_page.assert_logged_in_as(email)
 
+
+def test_e2e_create_project_and_bug(authenticated_page: Page, base_url: str, ui_user):
+    """
+    Full UI flow, starting already logged in (token injected by the context):
+    - open /app
+    - create project
+    - select project
+    - create bug
+    - verify bug appears in list
+    """
+    page = authenticated_page
+    login_page = LoginPage(page, base_url)
+    projects_page = ProjectsPage(page)
+    bugs_page = BugsPage(page)
+
+    login_page.goto()
+    login_page.assert_logged_in_as(ui_user["email"])
+
     # Create a project
+    unique_suffix = uuid.uuid4().hex[:8]
     project_name = f"UI Project {unique_suffix}"
     projects_page.create_project(name=project_name, description="Created via UI automation")
     projects_page.select_project_by_name(project_name)